@@ -0,0 +1,186 @@
+"""
+Prueba de carga del servidor de difusión del marcador
+Conecta muchos suscriptores por loopback y mide la latencia de reparto
+(desde que el servidor emite un tic hasta que cada cliente lo recibe).
+
+    python broadcast_load_test.py --clients 1000 --duration 10
+
+Sin --port arranca un BroadcastServer propio y publica un reloj y un
+partido simulados; con --port mide un servidor ya en marcha.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+
+# Añadir el directorio raíz al path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from controllers.broadcast_server import BroadcastServer
+
+
+def raise_file_limit(needed: int):
+    """Sube el límite de descriptores abiertos si el sistema lo permite"""
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < needed:
+        target = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+
+
+def publish_loop(server: BroadcastServer, stop: threading.Event, rate_hz: int):
+    """Simula el hilo de la GUI publicando reloj y marcador"""
+    seconds = 45 * 60
+    score = [0, 0]
+    ticks = 0
+    while not stop.is_set():
+        ticks += 1
+        if ticks % rate_hz == 0:
+            seconds = max(0, seconds - 1)
+        if ticks % (rate_hz * 7) == 0:
+            score[ticks % 2] += 1
+        server.publish("match_clock", {
+            'mode': "timer",
+            'display': f"{seconds // 60:02d}:{seconds % 60:02d}",
+            'running': True,
+            'paused': False,
+            'seconds': seconds,
+            'tick': ticks,
+        })
+        server.publish("match", {
+            'team1': "Local", 'team2': "Visitante",
+            'score1': score[0], 'score2': score[1], 'in_progress': True,
+        })
+        time.sleep(1.0 / rate_hz)
+
+
+async def subscriber(host: str, port: int, latencies: list, counters: dict, deadline: float,
+                     slow: bool):
+    """Cliente TCP: lee mensajes JSON por líneas y anota la latencia de cada uno"""
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        counters['failed'] += 1
+        return
+    counters['connected'] += 1
+    try:
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            if slow:
+                # Cliente que no lee: el servidor debe descartarle cambios
+                await asyncio.sleep(remaining)
+                break
+            try:
+                line = await asyncio.wait_for(reader.readline(), remaining)
+            except asyncio.TimeoutError:
+                break
+            if not line:
+                break
+            received = time.time()
+            message = json.loads(line)
+            counters[message['type']] += 1
+            if message['type'] == "delta":
+                latencies.append(received - message['ts'])
+    finally:
+        writer.close()
+
+
+def percentile(ordered, fraction: float):
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_subscribers(host: str, port: int, clients: int, slow: int, deadline: float):
+    latencies = []
+    counters = {'connected': 0, 'failed': 0, 'snapshot': 0, 'delta': 0}
+    tasks = []
+    for index in range(clients):
+        tasks.append(asyncio.ensure_future(
+            subscriber(host, port, latencies, counters, deadline, index < slow)
+        ))
+        if index % 100 == 99:
+            # Escalonar las conexiones para no desbordar la cola de accept
+            await asyncio.sleep(0.01)
+    await asyncio.gather(*tasks)
+    return latencies, counters
+
+
+def worker(host: str, port: int, clients: int, slow: int, deadline: float):
+    """Proceso de clientes (los clientes no compiten por el GIL con el servidor)"""
+    raise_file_limit(clients + 256)
+    return asyncio.run(run_subscribers(host, port, clients, slow, deadline))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, default=1000)
+    parser.add_argument('--duration', type=float, default=10.0, help="segundos")
+    parser.add_argument('--slow', type=int, default=0, help="clientes que no leen")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=None, help="servidor existente")
+    parser.add_argument('--tick-ms', type=int, default=100)
+    parser.add_argument('--rate', type=int, default=50, help="publicaciones por segundo")
+    parser.add_argument('--processes', type=int, default=4, help="procesos de clientes")
+    args = parser.parse_args()
+    
+    raise_file_limit(2 * args.clients + 256)
+    
+    server = None
+    stop = threading.Event()
+    if args.port is None:
+        server = BroadcastServer(args.host, port=0, ws_port=0, tick_ms=args.tick_ms)
+        server.start()
+        args.port = server.port
+        threading.Thread(target=publish_loop, args=(server, stop, args.rate), daemon=True).start()
+    
+    # Repartir los clientes (y los lentos) entre los procesos
+    processes = max(1, min(args.processes, args.clients))
+    deadline = time.time() + args.duration
+    jobs = []
+    for index in range(processes):
+        clients = args.clients // processes + (index < args.clients % processes)
+        slow = args.slow // processes + (index < args.slow % processes)
+        jobs.append((args.host, args.port, clients, slow, deadline))
+    
+    started = time.perf_counter()
+    with multiprocessing.Pool(processes) as pool:
+        results = pool.starmap(worker, jobs)
+    elapsed = time.perf_counter() - started
+    
+    latencies = []
+    counters = {'connected': 0, 'failed': 0, 'snapshot': 0, 'delta': 0}
+    for process_latencies, process_counters in results:
+        latencies += process_latencies
+        for key, value in process_counters.items():
+            counters[key] += value
+    
+    stop.set()
+    stats = server.get_stats() if server is not None else None
+    if server is not None:
+        server.stop()
+    
+    ordered = sorted(latencies)
+    print(f"Clientes: {counters['connected']} conectados, {counters['failed']} fallidos")
+    print(f"Mensajes: {counters['snapshot']} instantáneas, {counters['delta']} deltas "
+          f"en {elapsed:.1f} s")
+    print("Latencia de reparto (ms): " + ", ".join(
+        f"p{int(fraction * 100)}={percentile(ordered, fraction) * 1000:.2f}"
+        for fraction in (0.5, 0.9, 0.99)
+    ) + f", max={(ordered[-1] if ordered else 0) * 1000:.2f}")
+    if stats is not None:
+        print(f"Servidor: {stats['seq']} tics difundidos, {stats['dropped']} envíos descartados")
+
+
+if __name__ == "__main__":
+    main()
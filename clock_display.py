@@ -0,0 +1,140 @@
+"""
+Pantalla secundaria del reloj
+Lee el estado que publica la aplicación principal en memoria compartida y
+lo muestra con DigitalClockWidget a su propia frecuencia de refresco. Una
+pantalla lenta o bloqueada no afecta al reloj principal.
+
+    python main_futbol.py --shared-memory
+    python clock_display.py --channel match_clock --fps 30
+
+    python main.py --shared-memory
+    python clock_display.py --channel clock
+"""
+import argparse
+import sys
+import os
+import time
+
+# Añadir el directorio raíz al path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QTimer
+from views.digital_clock_widget import DigitalClockWidget
+from controllers.shared_clock_memory import SharedClockMemory, DEFAULT_NAME
+
+
+# Segundos sin escrituras a partir de los cuales un reloj en marcha se da por perdido
+STALE_SECONDS = 3.0
+
+
+class ClockDisplay:
+    """Refresca un DigitalClockWidget a partir de un canal de la memoria compartida"""
+    
+    def __init__(self, widget: DigitalClockWidget, name: str, channel: str, fps: int):
+        self.widget = widget
+        self.name = name
+        self.channel = channel
+        self.memory = None
+        self.slot = None
+        self.match_slot = None
+        self.last_seq = None
+        self.last_match_seq = None
+        self.clock_state = None
+        
+        # Pantalla de solo lectura
+        self.widget.set_controls_enabled(False, False, False)
+        self.widget.update_display("--:--")
+        self.widget.update_status("Waiting for clock...")
+        
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(max(1, 1000 // fps))
+    
+    def attach(self):
+        """Abre el bloque en cuanto la aplicación principal lo haya creado"""
+        try:
+            self.memory = SharedClockMemory.attach(self.name)
+        except (FileNotFoundError, ValueError):
+            self.memory = None
+    
+    def refresh(self):
+        """Se llama a la frecuencia de refresco; solo redibuja si hubo cambios"""
+        if self.memory is None:
+            self.attach()
+            if self.memory is None:
+                return
+        
+        if self.slot is None:
+            self.slot = self.memory.find(self.channel)
+            if self.slot is None:
+                return
+        
+        # Comprobar la secuencia es una lectura de 8 bytes: sin cambios no se hace nada más
+        seq = self.memory.sequence(self.slot)
+        if seq != self.last_seq:
+            state = self.memory.read(self.channel)
+            if state is None:
+                self.slot = None
+                return
+            self.last_seq = seq
+            self.widget.update_display(state['display'] or "--:--")
+            self.clock_state = state
+        
+        self.refresh_match()
+        
+        state = self.clock_state
+        if state is not None and (state['running'] or state['mode'] in ('clock', 'world')) \
+                and time.time() - state['updated'] > STALE_SECONDS:
+            self.widget.update_status("Signal lost")
+    
+    def refresh_match(self):
+        """Muestra equipos y marcador si la aplicación publica un partido"""
+        if self.match_slot is None:
+            self.match_slot = self.memory.find("match")
+            if self.match_slot is None:
+                return
+        seq = self.memory.sequence(self.match_slot)
+        if seq == self.last_match_seq:
+            return
+        self.last_match_seq = seq
+        match = self.memory.read("match")
+        if match is None:
+            self.match_slot = None
+        elif match['in_progress']:
+            status = f"{match['team1']} {match['score1']} - {match['score2']} {match['team2']}"
+            if match['on_break']:
+                status += " (HT)"
+            self.widget.update_status(status)
+        else:
+            self.widget.update_status("")
+    
+    def close(self):
+        self.timer.stop()
+        if self.memory is not None:
+            self.memory.close()
+            self.memory = None
+
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(description="Pantalla secundaria del reloj")
+    parser.add_argument('--name', default=DEFAULT_NAME, help="bloque de memoria compartida")
+    parser.add_argument('--channel', default="match_clock", help="reloj a mostrar")
+    parser.add_argument('--fps', type=int, default=30, help="refrescos por segundo")
+    args, qt_args = parser.parse_known_args()
+    
+    app = QApplication([sys.argv[0]] + qt_args)
+    
+    widget = DigitalClockWidget()
+    widget.setWindowTitle(f"{args.channel} - {args.name}")
+    display = ClockDisplay(widget, args.name, args.channel, args.fps)
+    widget.show()
+    
+    exit_code = app.exec()
+    display.close()
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
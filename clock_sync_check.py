@@ -0,0 +1,118 @@
+"""
+Comprobación de la sincronización de relojes por loopback
+Arranca un principal y un seguidor en este proceso. El reloj del seguidor
+lleva un desfase y una deriva artificiales, y la red un retardo simulado
+con picos ocasionales. Después mide cuánto se aleja la hora estimada del
+principal de la real y cuánto la deriva estimada de la inyectada.
+
+    python clock_sync_check.py --offset 2.5 --skew-ppm 80 --jitter-ms 15 --duration 40
+
+Devuelve 1 si el p99 del error llega a --max-p99-ms o la deriva se aleja
+de la real más de --skew-tolerance-ppm. Con el retardo por defecto la
+deriva solo se resuelve con unas decenas de segundos de ráfagas: en
+pruebas más cortas hay que abrir la tolerancia.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# Añadir el directorio raíz al path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from controllers.clock_sync_service import ClockSyncServer, ClockSyncClient
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comprobación de la sincronización de relojes")
+    parser.add_argument('--offset', type=float, default=2.5, help="desfase del seguidor (s)")
+    parser.add_argument('--skew-ppm', type=float, default=80.0, help="deriva del seguidor (ppm)")
+    parser.add_argument('--jitter-ms', type=float, default=15.0, help="retardo aleatorio por sentido")
+    parser.add_argument('--spike-ms', type=float, default=200.0, help="retardo de los picos")
+    parser.add_argument('--spike-rate', type=float, default=0.05, help="proporción de picos")
+    parser.add_argument('--duration', type=float, default=40.0, help="segundos")
+    parser.add_argument('--max-p99-ms', type=float, default=10.0,
+                        help="error p99 a partir del cual la prueba falla")
+    parser.add_argument('--skew-tolerance-ppm', type=float, default=40.0,
+                        help="diferencia máxima entre la deriva estimada y la real")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    
+    def network_delay():
+        delay = rng.uniform(0, args.jitter_ms / 1000)
+        if rng.random() < args.spike_rate:
+            delay += args.spike_ms / 1000
+        return delay
+    
+    started = time.time()
+    skew = args.skew_ppm * 1e-6
+    
+    def follower_clock():
+        now = time.time()
+        return now + args.offset + (now - started) * skew
+    
+    server = ClockSyncServer("127.0.0.1", 0, inbound_delay=network_delay,
+                             outbound_delay=network_delay)
+    server.start()
+    
+    client = ClockSyncClient("127.0.0.1", server.port, clock=follower_clock)
+    # Ráfagas más frecuentes para que la prueba sea corta; el historial
+    # cubre toda la prueba para estimar la deriva con todas ellas
+    client.FAST_INTERVAL = 0.5
+    client.INTERVAL = 0.5
+    client.estimator.MIN_SKEW_SPAN = min(client.estimator.MIN_SKEW_SPAN, args.duration / 2)
+    client.estimator.HISTORY = max(client.estimator.HISTORY, int(args.duration / client.INTERVAL) + 1)
+    client.start()
+    
+    errors = []
+    deadline = started + args.duration
+    while time.time() < deadline:
+        time.sleep(0.1)
+        if client.synchronized:
+            estimated = client.primary_time()
+            errors.append(abs(estimated - time.time()))
+    
+    client.stop()
+    server.stop()
+    
+    stats = client.get_stats()
+    print(f"Peticiones atendidas: {server.requests}")
+    # El desfase es hora del principal menos hora local: el opuesto del inyectado
+    real_skew_ppm = -skew / (1 + skew) * 1e6
+    skew_error = stats['skew_error_ppm']
+    print(f"Desfase estimado: {stats['offset_ms']:.2f} ms (real {-args.offset * 1000:.2f} ms "
+          f"en el arranque), deriva {stats['skew_ppm']:.1f}"
+          + (f" ± {skew_error:.1f}" if skew_error is not None else "")
+          + f" ppm (real {real_skew_ppm:.1f})")
+    print(f"Ráfagas: {stats['bursts']} aceptadas, {stats['rejected_bursts']} descartadas")
+    if not errors:
+        print("El seguidor no llegó a sincronizarse")
+        return 1
+    # Ignorar el primer segundo de convergencia
+    settled = sorted(errors[10:] or errors)
+    print("Error frente al principal (ms): " + ", ".join(
+        f"p{int(fraction * 100)}={settled[min(len(settled) - 1, int(fraction * len(settled)))] * 1000:.2f}"
+        for fraction in (0.5, 0.9, 0.99)
+    ) + f", max={settled[-1] * 1000:.2f}")
+    
+    failures = []
+    p99 = settled[min(len(settled) - 1, int(0.99 * len(settled)))] * 1000
+    if p99 >= args.max_p99_ms:
+        failures.append(f"p99 {p99:.2f} ms (máximo {args.max_p99_ms:.2f} ms)")
+    if skew_error is None:
+        failures.append("no hubo ráfagas suficientes para estimar la deriva")
+    elif abs(stats['skew_ppm'] - real_skew_ppm) > args.skew_tolerance_ppm:
+        failures.append(f"deriva desviada {abs(stats['skew_ppm'] - real_skew_ppm):.1f} ppm "
+                        f"(tolerancia {args.skew_tolerance_ppm:.1f} ppm)")
+    if failures:
+        print("Fallos: " + "; ".join(failures))
+        return 1
+    print("Sincronización correcta")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,5 +4,20 @@ Controllers module
 from .clock_controller import DigitalClockController
 from .main_controller import MainWindowController
 from .tournament_controller import TournamentController
+from .gui_watchdog import GuiWatchdog
+from .fixture_worker import FixtureWorker
+from .export_worker import ExportWorker
+from .import_worker import ImportWorker
+from .broadcast_server import BroadcastServer
+from .shared_clock_memory import SharedClockMemory
+from .clock_sync_service import ClockSyncServer, ClockSyncClient
+from .alarm_scheduler import AlarmScheduler
+from .tournament_pool import TournamentWindowPool
+from .virtual_timer import VirtualTimer
+from .log_service import LogService
 
-__all__ = ['DigitalClockController', 'MainWindowController', 'TournamentController']
+__all__ = ['DigitalClockController', 'MainWindowController', 'TournamentController', 'GuiWatchdog',
+           'FixtureWorker', 'ExportWorker', 'ImportWorker',
+           'BroadcastServer', 'SharedClockMemory',
+           'ClockSyncServer', 'ClockSyncClient', 'AlarmScheduler', 'TournamentWindowPool', 'VirtualTimer',
+           'LogService']
@@ -0,0 +1,161 @@
+"""
+Planificador de alarmas con repetición
+Guarda el siguiente disparo de cada regla en un montículo y arma un único
+QTimer de un disparo hasta el más próximo. Entre disparos no se evalúa
+ninguna regla, así que miles de alarmas no cuestan nada mientras esperan.
+"""
+import heapq
+import itertools
+from datetime import datetime
+
+from PySide6.QtCore import QObject, Signal, Qt
+
+from models.recurrence import compile_rule
+from models.time_source import as_time_source
+from controllers.virtual_timer import create_timer
+
+
+class AlarmScheduler(QObject):
+    """
+    Alarmas definidas por expresiones cron o RRULE.
+    Emite alarmFired(id, mensaje) en el instante de cada disparo.
+    """
+    
+    alarmFired = Signal(str, str)
+    
+    # Espera máxima del temporizador: acota el efecto de un salto de la hora
+    # de pared (cambio manual o corrección de la sincronización)
+    MAX_WAIT_MS = 60000
+    
+    def __init__(self, time_source=None, parent=None):
+        super().__init__(parent)
+        self.time_source = as_time_source(time_source)
+        # id -> (regla, mensaje, generador de disparos, versión); la versión
+        # cambia cada vez que se vuelve a programar la alarma
+        self._alarms = {}
+        # (instante epoch, desempate, id, versión); las entradas de versiones
+        # antiguas se descartan al salir del montículo
+        self._heap = []
+        self._order = itertools.count()
+        self._ids = itertools.count(1)
+        
+        self._timer = None
+        self._create_timer()
+    
+    def _create_timer(self):
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer.deleteLater()
+        self._timer = create_timer(self.time_source, self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._on_timeout)
+    
+    def set_time_source(self, time_source):
+        """
+        Cambia la fuente de la hora (TimeSource o función de hora de pared)
+        y recalcula todos los disparos
+        """
+        virtual = getattr(self.time_source, 'virtual', False)
+        self.time_source = as_time_source(time_source)
+        if self.time_source.virtual or virtual:
+            self._create_timer()
+        self.reschedule()
+    
+    def add(self, expression: str, message: str, alarm_id: str = None):
+        """
+        Compila y programa una regla. Devuelve su id.
+        Lanza RecurrenceError si la expresión no es válida.
+        """
+        rule = compile_rule(expression, self._now())
+        if alarm_id is None:
+            alarm_id = f"alarm-{next(self._ids)}"
+        occurrences = rule.occurrences(self._now())
+        self._alarms[alarm_id] = (rule, message, occurrences, next(self._order))
+        self._push_next(alarm_id)
+        self._arm()
+        return alarm_id
+    
+    def remove(self, alarm_id: str):
+        """Quita una alarma (su entrada del montículo se ignora al llegar)"""
+        if self._alarms.pop(alarm_id, None) is not None:
+            self._arm()
+    
+    def clear(self):
+        """Quita todas las alarmas"""
+        self._alarms.clear()
+        self._heap = []
+        self._timer.stop()
+    
+    def alarms(self):
+        """Lista de (id, expresión, mensaje)"""
+        return [(alarm_id, rule.expression, message)
+                for alarm_id, (rule, message, _, _) in self._alarms.items()]
+    
+    def next_fire(self, alarm_id: str = None):
+        """Próximo disparo (datetime) de una alarma o de cualquiera"""
+        for when, _, heap_id, version in sorted(self._heap):
+            entry = self._alarms.get(heap_id)
+            if entry is None or entry[3] != version:
+                continue
+            if alarm_id is None or heap_id == alarm_id:
+                return datetime.fromtimestamp(when)
+        return None
+    
+    def reschedule(self):
+        """Recalcula los disparos desde la hora actual (tras un salto de hora)"""
+        now = self._now()
+        self._heap = []
+        for alarm_id, (rule, message, _, _) in list(self._alarms.items()):
+            self._alarms[alarm_id] = (rule, message, rule.occurrences(now), next(self._order))
+            self._push_next(alarm_id)
+        self._arm()
+    
+    def _now(self):
+        return self.time_source.now()
+    
+    def _push_next(self, alarm_id: str, now: float = None):
+        rule, message, occurrences, version = self._alarms[alarm_id]
+        fire = next(occurrences, None)
+        if fire is not None and now is not None and fire.timestamp() <= now:
+            # La hora saltó hacia delante: no se recuperan los disparos perdidos
+            occurrences = rule.occurrences(datetime.fromtimestamp(now))
+            self._alarms[alarm_id] = (rule, message, occurrences, version)
+            fire = next(occurrences, None)
+        if fire is None:
+            # Regla agotada (UNTIL o COUNT)
+            del self._alarms[alarm_id]
+            return
+        heapq.heappush(self._heap, (fire.timestamp(), next(self._order), alarm_id, version))
+    
+    def _discard_stale(self):
+        heap = self._heap
+        while heap:
+            entry = self._alarms.get(heap[0][2])
+            if entry is not None and entry[3] == heap[0][3]:
+                return
+            heapq.heappop(heap)
+    
+    def _arm(self):
+        """Arma el temporizador hasta el disparo más próximo"""
+        self._discard_stale()
+        if not self._heap:
+            self._timer.stop()
+            return
+        wait = (self._heap[0][0] - self.time_source.time()) * 1000
+        self._timer.start(int(min(max(wait, 0), self.MAX_WAIT_MS)))
+    
+    def _on_timeout(self):
+        now = self.time_source.time()
+        heap = self._heap
+        due = []
+        while heap and heap[0][0] <= now:
+            _, _, alarm_id, version = heapq.heappop(heap)
+            entry = self._alarms.get(alarm_id)
+            if entry is None or entry[3] != version:
+                continue
+            due.append((alarm_id, entry[1]))
+            self._push_next(alarm_id, now)
+        self._arm()
+        for alarm_id, message in due:
+            self.alarmFired.emit(alarm_id, message)
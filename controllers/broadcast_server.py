@@ -0,0 +1,375 @@
+"""
+Servidor de difusión del marcador
+Publica el estado de los relojes y partidos a pantallas locales por TCP
+(JSON por líneas, en `port`) o WebSocket (en `port + 1`). Al conectar se envía
+una instantánea completa y después solo los cambios, agrupados una vez
+por tic. Un cliente lento no frena a los demás: se descartan sus cambios
+pendientes y recibe de nuevo la instantánea más reciente cuando se
+pone al día.
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import struct
+import threading
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_PORT = 8765
+TICK_MS = 100
+# Bytes pendientes de envío a partir de los cuales un cliente se considera lento
+HIGH_WATER = 64 * 1024
+
+WS_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+# Marca para distinguir una clave ausente de un valor None
+_MISSING = object()
+
+
+def broadcast_port_from_args(argv):
+    """
+    Puerto de difusión indicado con --broadcast o --broadcast=PUERTO
+    (None si no se ha pedido)
+    """
+    for arg in argv:
+        if arg == "--broadcast":
+            return DEFAULT_PORT
+        if arg.startswith("--broadcast="):
+            return int(arg.split("=", 1)[1])
+    return None
+
+
+def _ws_frame(payload: bytes, opcode: int = 0x1):
+    """Trama WebSocket del servidor (final, sin máscara)"""
+    length = len(payload)
+    if length < 126:
+        header = struct.pack('!BB', 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack('!BBH', 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack('!BBQ', 0x80 | opcode, 127, length)
+    return header + payload
+
+
+class _Client:
+    """Conexión de una pantalla"""
+    
+    __slots__ = ('writer', 'websocket', 'stale', 'dropped')
+    
+    def __init__(self, writer, websocket: bool):
+        self.writer = writer
+        self.websocket = websocket
+        # Se descartaron cambios: la próxima vez recibe una instantánea
+        self.stale = False
+        self.dropped = 0
+    
+    def congested(self):
+        return self.writer.transport.get_write_buffer_size() > HIGH_WATER
+
+
+class _Message:
+    """Mensaje codificado una sola vez por tic para todos los clientes"""
+    
+    __slots__ = ('data', '_tcp', '_ws')
+    
+    def __init__(self, data: dict):
+        self.data = json.dumps(data, separators=(',', ':')).encode('utf-8')
+        self._tcp = None
+        self._ws = None
+    
+    def encoded(self, websocket: bool):
+        if websocket:
+            if self._ws is None:
+                self._ws = _ws_frame(self.data)
+            return self._ws
+        if self._tcp is None:
+            self._tcp = self.data + b"\n"
+        return self._tcp
+
+
+class BroadcastServer:
+    """
+    Servidor asyncio en un hilo propio.
+    `publish` puede llamarse desde cualquier hilo: solo guarda el último
+    estado de cada canal; el hilo del servidor calcula y envía los cambios
+    en cada tic.
+    """
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                 ws_port: int = None, tick_ms: int = TICK_MS):
+        self.host = host
+        self.port = port
+        self.ws_port = port + 1 if ws_port is None and port else ws_port or 0
+        self.tick = tick_ms / 1000.0
+        
+        self._lock = threading.Lock()
+        self._latest = {}       # Canal -> último estado publicado
+        self._dirty = set()     # Canales publicados desde el último tic
+        self._removed = set()   # Canales eliminados desde el último tic
+        
+        # Estado del hilo del servidor
+        self._sent = {}         # Canal -> estado ya difundido
+        self._seq = 0
+        self._clients = set()
+        self._loop = None
+        self._servers = []
+        self._thread = None
+        self._ready = threading.Event()
+        self._error = None
+    
+    # API para la aplicación (cualquier hilo)
+    def start(self):
+        """Arranca el servidor; devuelve cuando ya acepta conexiones"""
+        if self._thread is not None:
+            return
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run, name="BroadcastServer", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            self._thread = None
+            raise OSError(f"No se pudo abrir el servidor de difusión: {self._error}")
+    
+    def stop(self):
+        """Cierra las conexiones y detiene el hilo"""
+        if self._thread is None:
+            return
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(2.0)
+        self._thread = None
+    
+    def publish(self, channel: str, state: dict):
+        """Publica el estado actual de un canal (diccionario plano serializable)"""
+        with self._lock:
+            self._latest[channel] = dict(state)
+            self._dirty.add(channel)
+            self._removed.discard(channel)
+    
+    def remove(self, channel: str):
+        """Elimina un canal (por ejemplo, al cerrar un partido)"""
+        with self._lock:
+            if self._latest.pop(channel, None) is not None:
+                self._dirty.discard(channel)
+                self._removed.add(channel)
+    
+    def client_count(self):
+        return len(self._clients)
+    
+    def get_stats(self):
+        """Clientes conectados, mensajes difundidos y envíos descartados"""
+        return {
+            'clients': len(self._clients),
+            'seq': self._seq,
+            'dropped': sum(client.dropped for client in list(self._clients)),
+        }
+    
+    # Hilo del servidor
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            for port, websocket in ((self.port, False), (self.ws_port, True)):
+                server = self._loop.run_until_complete(asyncio.start_server(
+                    lambda r, w, websocket=websocket: self._on_connect(r, w, websocket),
+                    self.host, port, backlog=1024
+                ))
+                self._servers.append(server)
+        except OSError as e:
+            self._error = e
+            for server in self._servers:
+                server.close()
+            self._servers = []
+            self._ready.set()
+            self._loop.close()
+            return
+        # Puertos reales si se pidió el 0
+        self.port = self._servers[0].sockets[0].getsockname()[1]
+        self.ws_port = self._servers[1].sockets[0].getsockname()[1]
+        ticker = self._loop.create_task(self._ticker())
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            ticker.cancel()
+            for server in self._servers:
+                server.close()
+            self._servers = []
+            for client in list(self._clients):
+                client.writer.close()
+            self._loop.run_until_complete(asyncio.sleep(0))
+            self._loop.close()
+    
+    async def _ticker(self):
+        """Difunde los cambios acumulados una vez por tic"""
+        next_tick = self._loop.time()
+        while True:
+            next_tick += self.tick
+            await asyncio.sleep(max(0.0, next_tick - self._loop.time()))
+            self._broadcast()
+    
+    def _take_changes(self):
+        """Recoge los canales modificados desde el último tic"""
+        with self._lock:
+            dirty = {channel: self._latest[channel] for channel in self._dirty}
+            removed = list(self._removed)
+            self._dirty.clear()
+            self._removed.clear()
+        
+        changes = {}
+        for channel, state in dirty.items():
+            previous = self._sent.get(channel, {})
+            delta = {key: value for key, value in state.items() if previous.get(key, _MISSING) != value}
+            gone = [key for key in previous if key not in state]
+            entry = {}
+            if delta:
+                entry['set'] = delta
+            if gone:
+                entry['unset'] = gone
+            if entry:
+                changes[channel] = entry
+            self._sent[channel] = state
+        for channel in removed:
+            self._sent.pop(channel, None)
+        return changes, removed
+    
+    def _snapshot(self):
+        return _Message({
+            'type': "snapshot",
+            'seq': self._seq,
+            'ts': time.time(),
+            'state': self._sent,
+        })
+    
+    def _broadcast(self):
+        changes, removed = self._take_changes()
+        if not changes and not removed:
+            return
+        self._seq += 1
+        message = {'type': "delta", 'seq': self._seq, 'ts': time.time(), 'changes': changes}
+        if removed:
+            message['removed'] = removed
+        delta = _Message(message)
+        snapshot = None
+        
+        for client in list(self._clients):
+            if client.writer.is_closing():
+                self._clients.discard(client)
+                continue
+            if client.congested():
+                # Descartar: cuando se vacíe el búfer recibirá el estado completo
+                client.stale = True
+                client.dropped += 1
+                continue
+            if client.stale:
+                if snapshot is None:
+                    snapshot = self._snapshot()
+                client.writer.write(snapshot.encoded(client.websocket))
+                client.stale = False
+            else:
+                client.writer.write(delta.encoded(client.websocket))
+    
+    async def _on_connect(self, reader, writer, websocket: bool):
+        if websocket:
+            try:
+                accepted = await self._handshake(reader, writer)
+            except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                accepted = False
+            if not accepted:
+                writer.close()
+                return
+        
+        client = _Client(writer, websocket)
+        writer.write(self._snapshot().encoded(websocket))
+        self._clients.add(client)
+        try:
+            if websocket:
+                await self._read_websocket(reader, writer)
+            else:
+                # Los clientes TCP no envían nada; se espera al cierre
+                while await reader.read(4096):
+                    pass
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._clients.discard(client)
+            writer.close()
+    
+    async def _handshake(self, reader, writer):
+        """Negociación HTTP de WebSocket (RFC 6455)"""
+        request = await reader.readuntil(b"\r\n\r\n")
+        headers = {}
+        for line in request.split(b"\r\n")[1:]:
+            if b":" in line:
+                name, value = line.split(b":", 1)
+                headers[name.strip().lower()] = value.strip()
+        key = headers.get(b"sec-websocket-key")
+        if key is None:
+            writer.write(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n")
+            return False
+        accept = base64.b64encode(hashlib.sha1(key + WS_GUID).digest())
+        writer.write(
+            b"HTTP/1.1 101 Switching Protocols\r\n"
+            b"Upgrade: websocket\r\nConnection: Upgrade\r\n"
+            b"Sec-WebSocket-Accept: " + accept + b"\r\n\r\n"
+        )
+        return True
+    
+    async def _read_websocket(self, reader, writer):
+        """Atiende las tramas del cliente: ping y cierre; el resto se ignora"""
+        while True:
+            head = await reader.readexactly(2)
+            opcode = head[0] & 0x0F
+            length = head[1] & 0x7F
+            if length == 126:
+                (length,) = struct.unpack('!H', await reader.readexactly(2))
+            elif length == 127:
+                (length,) = struct.unpack('!Q', await reader.readexactly(8))
+            mask = await reader.readexactly(4) if head[1] & 0x80 else None
+            payload = await reader.readexactly(length)
+            if mask is not None:
+                payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+            if opcode == 0x8:
+                writer.write(_ws_frame(payload[:2], 0x8))
+                return
+            if opcode == 0x9:
+                writer.write(_ws_frame(payload, 0xA))
+
+
+class PublisherGroup:
+    """Reparte cada publicación entre varios destinos (servidor, memoria compartida...)"""
+    
+    def __init__(self, publishers):
+        self.publishers = [publisher for publisher in publishers if publisher is not None]
+    
+    def publish(self, channel: str, state: dict):
+        for publisher in self.publishers:
+            publisher.publish(channel, state)
+    
+    def remove(self, channel: str):
+        for publisher in self.publishers:
+            publisher.remove(channel)
+
+
+def start_broadcast(argv):
+    """
+    Arranca la difusión pedida con --broadcast[=PUERTO].
+    Devuelve (servidor, error): ambos None si no se ha pedido; si el puerto
+    está ocupado el fallo se registra, el servidor es None y la aplicación
+    sigue sin difusión.
+    """
+    port = broadcast_port_from_args(argv)
+    if port is None:
+        return None, None
+    server = BroadcastServer(port=port)
+    try:
+        server.start()
+    except OSError as error:
+        logger.error("Difusión desactivada", extra={'port': port, 'error': str(error)})
+        return None, str(error)
+    return server, None
@@ -2,55 +2,252 @@
 Controlador del componente de Reloj Digital
 Gestiona la lógica entre el modelo y la vista
 """
+import logging
+import weakref
+
 from PySide6.QtCore import Signal, QObject
 from models.clock_model import ClockModel, ClockMode, TimerMode
+from models.recurrence import daily_rule
+from models.laps import LapRecorder
+from controllers.alarm_scheduler import AlarmScheduler
+from controllers.clock_subscriptions import ClockSubscriptions, CROSSING, MINUTE, FINISH
+from controllers.virtual_timer import create_timer
+
+
+logger = logging.getLogger(__name__)
 
 
 class DigitalClockController(QObject):
     """Controlador para el componente de reloj digital"""
     
     chronometerPaused = Signal(int)
+    lapRecorded = Signal(int, float, float)     # Número, duración y parcial
+    lapsReset = Signal()
+    pausedChanged = Signal(bool)                # Pausa o reanudación del temporizador
+    timerStateChanged = Signal()                # Inicio, pausa, reinicio o fin del temporizador
+    
+    # Id de la alarma configurada en la ventana dentro del planificador
+    ALARM_ID = "alarm"
     
     def __init__(self, model: ClockModel, view):
         super().__init__()
         self.model = model
-        self.view = view
+        # La vista es del widget que la contiene: el controlador no la mantiene viva
+        self._view = weakref.ref(view)
+        
+        # Difusión opcional del estado a pantallas externas
+        self.broadcast = None
+        self.broadcast_channel = "clock"
+        
+        # Alarmas: el planificador arma un solo temporizador hasta el próximo disparo
+        self.alarm_scheduler = AlarmScheduler(self.model.time_source, self)
+        self.alarm_scheduler.alarmFired.connect(self.on_alarm_fired)
+        
+        # Vueltas del cronómetro (marcas de tiempo monótonas)
+        self.laps = LapRecorder()
+        
+        # Suscripciones por umbral (cruce de un valor, cambio de minuto, final)
+        self.subscriptions = ClockSubscriptions()
         
         # Conectar el controlador con la vista
         self.view.set_controller(self)
+        if self.model.time_source.virtual:
+            # Ticks del tiempo virtual en vez del QTimer de la vista
+            self.view.set_tick_timer(create_timer(self.model.time_source, view))
         
         # Inicializar la vista
         self.update_display()
         self.update_controls()
     
+    @property
+    def view(self):
+        """Vista del reloj (None si ya se destruyó)"""
+        return self._view()
+    
+    def shutdown(self):
+        """
+        Desmonta el controlador antes de cerrar su ventana: detiene los
+        temporizadores, suelta las suscripciones y la difusión y se desconecta
+        de la vista para que ambos puedan liberarse
+        """
+        self.set_broadcast(None)
+        self.alarm_scheduler.alarmFired.disconnect(self.on_alarm_fired)
+        self.alarm_scheduler.clear()
+        self.subscriptions.clear()
+        view = self.view
+        if view is not None:
+            view.stop_internal_timer()
+            view.set_controller(None)
+        self.deleteLater()
+    
+    def set_broadcast(self, server, channel: str = "clock"):
+        """Publica el estado del reloj en un BroadcastServer (None para dejar de hacerlo)"""
+        if self.broadcast is not None and server is not self.broadcast:
+            self.broadcast.remove(self.broadcast_channel)
+        self.broadcast = server
+        self.broadcast_channel = channel
+        if server is not None:
+            self.publish_state(self.get_current_time_string())
+    
+    def publish_state(self, time_str: str):
+        """Envía el estado actual del reloj al servidor de difusión"""
+        self.broadcast.publish(self.broadcast_channel, {
+            'mode': self.model.mode.name.lower(),
+            'display': time_str,
+            'running': self.model.timer_running,
+            'paused': self.model.timer_paused,
+            'seconds': self.model.timer_current,
+        })
+    
+    def set_time_source(self, time_source):
+        """
+        Fuente del tiempo del reloj y referencia de sus ticks: una TimeSource
+        (VirtualTimeSource en simulaciones) o una función de hora de pared
+        (por ejemplo la hora del nodo principal en un seguidor sincronizado).
+        None vuelve al reloj del sistema sin alinear los ticks.
+        """
+        was_virtual = self.model.time_source.virtual
+        self.model.set_time_source(time_source)
+        source = self.model.time_source
+        if source.virtual or was_virtual:
+            self.view.set_tick_timer(create_timer(source, self.view))
+        self.view.set_tick_alignment(source.time if time_source is not None else None)
+        self.alarm_scheduler.set_time_source(source)
+        self.rearm_subscriptions()
+        self.update_display()
+        logger.info("Fuente de tiempo cambiada",
+                    extra={'source': type(source).__name__, 'virtual': source.virtual})
+    
+    # Suscripciones
+    def subscribe_crossing(self, seconds: int, callback):
+        """
+        Llama a `callback(seconds)` cuando el temporizador llega a ese valor
+        (subiendo en progresivo, bajando en regresivo). Se vuelve a armar en
+        cada reinicio. Devuelve el token para unsubscribe.
+        """
+        token = self.subscriptions.add(CROSSING, callback, int(seconds))
+        self.subscriptions.add_crossing(token, self._position(), self._crossing_target(int(seconds)))
+        return token
+    
+    def subscribe_minute(self, callback):
+        """Llama a `callback(texto mostrado)` cada vez que el reloj pasa por un minuto exacto (MM:00)"""
+        token = self.subscriptions.add(MINUTE, callback)
+        self.subscriptions.arm_minute(self._next_minute)
+        return token
+    
+    def subscribe_finish(self, callback):
+        """Llama a `callback()` al terminar el temporizador"""
+        return self.subscriptions.add(FINISH, callback)
+    
+    def unsubscribe(self, token: int):
+        self.subscriptions.remove(token)
+    
+    def rearm_subscriptions(self):
+        """Recalcula los plazos tras cambiar el modo, la duración o el valor del reloj"""
+        self.subscriptions.arm(self._position(), self._crossing_target, self._next_minute)
+    
+    def _position(self):
+        """Posición creciente con que se comparan los plazos"""
+        if self.model.is_wall_clock:
+            return int(self.model.time_source.time())
+        if self.model.timer_mode == TimerMode.PROGRESSIVE:
+            return self.model.timer_current
+        return self.model.timer_duration - self.model.timer_current
+    
+    def _crossing_target(self, seconds: int):
+        """Posición en que el temporizador muestra `seconds` (None en modo reloj)"""
+        if self.model.is_wall_clock:
+            return None
+        if self.model.timer_mode == TimerMode.PROGRESSIVE:
+            return seconds
+        if not 0 <= seconds < self.model.timer_duration:
+            return None
+        return self.model.timer_duration - seconds
+    
+    def _next_minute(self):
+        """Posición del próximo cambio de minuto"""
+        if self.model.is_wall_clock:
+            return (int(self.model.time_source.time()) // 60 + 1) * 60
+        current = self.model.timer_current
+        if self.model.timer_mode == TimerMode.PROGRESSIVE:
+            return (current // 60 + 1) * 60
+        if current <= 0:
+            return None
+        return self.model.timer_duration - (current - 1) // 60 * 60
+    
     def set_mode(self, mode: ClockMode):
         """Establece el modo de funcionamiento"""
+        logger.info("Modo del reloj", extra={'mode': mode.name.lower()})
         self.model.mode = mode
+        self.rearm_subscriptions()
         self.update_display()
         self.update_controls()
         
-        if mode == ClockMode.CLOCK:
+        if self.model.is_wall_clock:
             self.view.start_internal_timer()
         else:
             self.view.stop_internal_timer()
+        if mode != ClockMode.WORLD:
+            self.view.update_world_clocks([])
+    
+    def set_world_zones(self, zones):
+        """
+        Zonas IANA del modo reloj mundial (por ejemplo "America/New_York").
+        Lanza ValueError si alguna zona no existe.
+        """
+        self.model.world_clock.set_zones(zones)
+        if self.model.mode == ClockMode.WORLD:
+            self.update_display()
     
     def set_format_24h(self, format_24h: bool):
         """Establece el formato de hora"""
         self.model.format_24h = format_24h
-        if self.model.mode == ClockMode.CLOCK:
+        if self.model.is_wall_clock:
             self.update_display()
     
-    def set_alarm(self, enabled: bool, hour: int = 0, minute: int = 0, message: str = "Alarm!"):
-        """Configura la alarma"""
+    def set_alarm(self, enabled: bool, hour: int = 0, minute: int = 0, message: str = "Alarm!",
+                  rule: str = ""):
+        """
+        Configura la alarma: diaria a hour:minute o, si se indica `rule`,
+        según esa expresión cron o RRULE.
+        Lanza RecurrenceError si la regla no es válida.
+        """
         self.model.alarm_enabled = enabled
-        if enabled:
-            self.model.alarm_hour = hour
-            self.model.alarm_minute = minute
-            self.model.alarm_message = message
+        if not enabled:
+            self.alarm_scheduler.remove(self.ALARM_ID)
+            return
+        self.model.alarm_hour = hour
+        self.model.alarm_minute = minute
+        self.model.alarm_message = message
+        self.model.alarm_rule = rule
+        expression = self.model.alarm_rule or daily_rule(hour, minute).expression
+        self.alarm_scheduler.add(expression, message, self.ALARM_ID)
+    
+    def add_alarm_rule(self, expression: str, message: str):
+        """
+        Añade una alarma adicional con repetición (cron o RRULE).
+        Devuelve su id para poder quitarla.
+        """
+        return self.alarm_scheduler.add(expression, message)
+    
+    def remove_alarm_rule(self, alarm_id: str):
+        """Quita una alarma añadida con add_alarm_rule"""
+        self.alarm_scheduler.remove(alarm_id)
+    
+    def on_alarm_fired(self, alarm_id: str, message: str):
+        """Disparo de una alarma del planificador"""
+        if alarm_id == self.ALARM_ID:
+            # La alarma de la ventana solo suena en los modos de reloj
+            if not self.model.is_wall_clock:
+                logger.debug("Alarma ignorada fuera del modo reloj", extra={'alarm_id': alarm_id})
+                return
+        logger.info("Alarma disparada", extra={'alarm_id': alarm_id, 'alarm_message': message})
+        self.view.emit_alarm(message)
     
     def set_timer_duration(self, seconds: int):
         """Establece la duración del temporizador"""
         self.model.timer_duration = seconds
+        self.rearm_subscriptions()
         if self.model.mode == ClockMode.TIMER:
             self.update_display()
     
@@ -58,80 +255,140 @@ class DigitalClockController(QObject):
         """Establece el modo del temporizador (progresivo/regresivo)"""
         self.model.timer_mode = mode
         self.model.reset_timer()
+        self.rearm_subscriptions()
         if self.model.mode == ClockMode.TIMER:
             self.update_display()
     
     def on_start(self):
         """Maneja el inicio del temporizador"""
         if self.model.mode == ClockMode.TIMER:
-            if self.model.timer_paused:
+            resumed = self.model.timer_paused
+            if resumed:
                 self.model.resume_timer()
+                self.laps.resume(self.model.time_source.monotonic())
+                self.pausedChanged.emit(False)
             else:
                 self.model.start_timer()
+                self.laps.start(self.model.time_source.monotonic(), self.model.timer_current)
+            logger.info("Temporizador reanudado" if resumed else "Temporizador iniciado",
+                        extra=self._timer_state())
             self.view.start_internal_timer()
             self.update_controls()
             self.view.update_status(self.view.tr("Running..."))
+            self.timerStateChanged.emit()
     
     def on_pause(self):
         """Maneja la pausa del temporizador"""
         if self.model.mode == ClockMode.TIMER:
             if self.model.timer_paused:
                 self.model.resume_timer()
+                self.laps.resume(self.model.time_source.monotonic())
                 self.view.update_status(self.view.tr("Running..."))
             else:
                 self.model.pause_timer()
-                if self.model.timer_mode == TimerMode.PROGRESSIVE and self.model.timer_duration == 0:
+                self.laps.pause(self.model.time_source.monotonic())
+                if self.model.is_chronometer:
                     self.chronometerPaused.emit(self.model.timer_current)
+            logger.info("Temporizador en pausa" if self.model.timer_paused else "Temporizador reanudado",
+                        extra=self._timer_state())
             self.update_controls()
+            self.pausedChanged.emit(self.model.timer_paused)
+            self.timerStateChanged.emit()
     
     def on_reset(self):
         """Maneja el reinicio del temporizador"""
         if self.model.mode == ClockMode.TIMER:
+            logger.info("Temporizador reiniciado", extra=self._timer_state())
             self.model.reset_timer()
+            self.rearm_subscriptions()
             self.view.stop_internal_timer()
+            if self.laps.count or self.laps.running:
+                self.laps.reset()
+                self.lapsReset.emit()
             self.update_display()
             self.update_controls()
             self.view.update_status(self.view.tr("Ready"))
+            self.timerStateChanged.emit()
+    
+    def on_lap(self):
+        """Cierra una vuelta del cronómetro en marcha"""
+        if not self.model.is_chronometer or not self.model.timer_running or self.model.timer_paused:
+            return
+        now = self.model.time_source.monotonic()
+        if not self.laps.running:
+            # Cronómetro reanudado desde una instantánea
+            self.laps.start(now, self.model.timer_current)
+        number, lap, split = self.laps.mark(now)
+        logger.info("Vuelta", extra={'lap': number, 'lap_seconds': lap, 'split_seconds': split})
+        self.lapRecorded.emit(number, lap, split)
     
     def on_timer_tick(self):
         """Se llama cada segundo por el timer interno"""
-        if self.model.mode == ClockMode.CLOCK:
-            # Modo reloj: actualizar hora y verificar alarma
+        if self.model.is_wall_clock:
+            # Modo reloj: actualizar hora (las alarmas las dispara el planificador)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Tick", extra={'mode': self.model.mode.name.lower()})
             self.update_display()
-            if self.model.check_alarm():
-                self.model.mark_alarm_as_triggered()
-                self.view.emit_alarm(self.model.alarm_message)
+            self.check_subscriptions()
         
         elif self.model.mode == ClockMode.TIMER:
             # Modo temporizador: actualizar tiempo
             if self.model.timer_running and not self.model.timer_paused:
                 finished = self.model.update_timer()
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Tick", extra=self._timer_state())
                 self.update_display()
+                self.check_subscriptions()
                 
                 if finished:
                     self.on_timer_finished()
     
     def on_timer_finished(self):
         """Se llama cuando el temporizador termina"""
+        logger.info("Temporizador terminado", extra=self._timer_state())
         self.view.stop_internal_timer()
         self.model.stop_timer()
         self.update_controls()
         self.view.update_status(self.view.tr("Finished!"))
+        self.timerStateChanged.emit()
         self.view.emit_timer_finished()
+        self.subscriptions.on_finish()
+    
+    def _timer_state(self):
+        """Datos del temporizador para el registro"""
+        return {
+            'timer_mode': self.model.timer_mode.name.lower(),
+            'seconds': self.model.timer_current,
+            'duration': self.model.timer_duration,
+        }
+    
+    def check_subscriptions(self):
+        """Avisa a las suscripciones cuyo plazo ya llegó"""
+        if len(self.subscriptions):
+            self.subscriptions.on_tick(self._position(), self._next_minute,
+                                       self.get_current_time_string)
     
     def update_display(self):
         """Actualiza el display con el tiempo actual"""
-        if self.model.mode == ClockMode.CLOCK:
+        if self.model.is_wall_clock:
             time_str = self.model.get_current_time_string()
         else:
             time_str = self.model.get_timer_string()
         
         self.view.update_display(time_str)
+        if self.model.mode == ClockMode.WORLD:
+            self.view.update_world_clocks(self.model.get_world_time_lines())
         self.view.emit_time_updated(time_str)
+        if self.broadcast is not None:
+            self.publish_state(time_str)
     
     def update_controls(self):
         """Actualiza el estado de los controles"""
-        if self.model.mode == ClockMode.CLOCK:
+        self.view.set_lap_button(
+            self.model.is_chronometer,
+            self.model.is_chronometer and self.model.timer_running and not self.model.timer_paused
+        )
+        if self.model.is_wall_clock:
             # En modo reloj, deshabilitar todos los controles
             self.view.set_controls_enabled(False, False, False)
         else:
@@ -150,7 +407,7 @@ class DigitalClockController(QObject):
     
     def get_current_time_string(self):
         """Obtiene el string del tiempo actual"""
-        if self.model.mode == ClockMode.CLOCK:
+        if self.model.is_wall_clock:
             return self.model.get_current_time_string()
         else:
             return self.model.get_timer_string()
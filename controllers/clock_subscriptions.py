@@ -0,0 +1,120 @@
+"""
+Suscripciones a umbrales del reloj
+En lugar de avisar a cada oyente en cada tick, el reloj guarda los próximos
+plazos (cruce de un valor, cambio de minuto) en un montículo y en cada tick
+solo compara con el primero. Los oyentes se despiertan únicamente cuando
+ocurre su evento.
+"""
+import heapq
+import itertools
+
+
+CROSSING = "crossing"
+MINUTE = "minute"
+FINISH = "finish"
+
+
+class ClockSubscriptions:
+    """
+    Plazos armados de un DigitalClockController.
+    Los plazos se expresan como una posición que solo crece: en el
+    temporizador, los segundos de marcha desde el último reinicio; en los
+    modos de reloj, la hora de pared en segundos.
+    """
+    
+    def __init__(self):
+        self._ids = itertools.count(1)
+        self._order = itertools.count()
+        # token -> (tipo, callback, umbral)
+        self._subscriptions = {}
+        # (posición objetivo, desempate, token) de los cruces pendientes
+        self._crossings = []
+        self._minute_listeners = {}
+        self._finish_listeners = {}
+        self._next_minute = None
+        self.fired = 0
+    
+    def __len__(self):
+        return len(self._subscriptions)
+    
+    def add(self, kind: str, callback, threshold: int = None):
+        token = next(self._ids)
+        self._subscriptions[token] = (kind, callback, threshold)
+        if kind == MINUTE:
+            self._minute_listeners[token] = callback
+        elif kind == FINISH:
+            self._finish_listeners[token] = callback
+        return token
+    
+    def remove(self, token: int):
+        entry = self._subscriptions.pop(token, None)
+        if entry is None:
+            return
+        self._minute_listeners.pop(token, None)
+        self._finish_listeners.pop(token, None)
+        # Los cruces quitados se descartan al llegar a la cima del montículo
+    
+    def clear(self):
+        self._subscriptions.clear()
+        self._crossings = []
+        self._minute_listeners.clear()
+        self._finish_listeners.clear()
+        self._next_minute = None
+    
+    def arm(self, position: int, target_of, next_minute):
+        """
+        Recalcula los plazos tras un cambio de estado (modo, duración,
+        reinicio). `target_of(umbral)` da la posición en que se cruza el
+        umbral (None si no es alcanzable) y `next_minute()` la del próximo
+        cambio de minuto.
+        """
+        self._crossings = []
+        for token, (kind, _, threshold) in self._subscriptions.items():
+            if kind != CROSSING:
+                continue
+            target = target_of(threshold)
+            if target is not None and target > position:
+                self._crossings.append((target, next(self._order), token))
+        heapq.heapify(self._crossings)
+        self._next_minute = next_minute() if self._minute_listeners else None
+    
+    def add_crossing(self, token: int, position: int, target):
+        """Arma el cruce de una suscripción nueva"""
+        if target is not None and target > position:
+            heapq.heappush(self._crossings, (target, next(self._order), token))
+    
+    def arm_minute(self, next_minute):
+        """Arma el plazo de minuto al llegar el primer oyente"""
+        if self._minute_listeners and self._next_minute is None:
+            self._next_minute = next_minute()
+    
+    def on_tick(self, position: int, next_minute, display):
+        """
+        Comprueba los plazos en un tick: dos comparaciones si no hay nada
+        que avisar, sin importar cuántas suscripciones haya. `display()` da
+        el texto mostrado y solo se llama si hay que avisar del minuto.
+        """
+        crossings = self._crossings
+        while crossings and crossings[0][0] <= position:
+            _, _, token = heapq.heappop(crossings)
+            entry = self._subscriptions.get(token)
+            if entry is not None:
+                self.fired += 1
+                entry[1](entry[2])
+        if self._next_minute is None:
+            return
+        if position >= self._next_minute:
+            self._next_minute = next_minute()
+            text = display()
+            for callback in list(self._minute_listeners.values()):
+                self.fired += 1
+                callback(text)
+        elif position < self._next_minute - 60:
+            # La hora retrocedió (sincronización): el plazo queda por delante
+            self._next_minute = next_minute()
+    
+    def on_finish(self):
+        """Avisa del final del temporizador"""
+        for callback in list(self._finish_listeners.values()):
+            self.fired += 1
+            callback()
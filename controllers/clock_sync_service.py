@@ -0,0 +1,238 @@
+"""
+Sincronización de relojes entre nodos del marcador por UDP
+El nodo principal responde a las peticiones con sus marcas de tiempo; los
+seguidores hacen ráfagas cortas de intercambios periódicamente y estiman
+desfase y deriva con models.clock_sync.ClockSyncEstimator
+"""
+import socket
+import struct
+import threading
+import time
+
+from models.clock_sync import ClockSyncEstimator, SyncSample
+
+
+DEFAULT_PORT = 8770
+MAGIC = b"DCSY"
+VERSION = 1
+TYPE_REQUEST = 1
+TYPE_REPLY = 2
+
+# Petición: magia, versión, tipo, secuencia, t0
+REQUEST = struct.Struct('!4sBBxxId')
+# Respuesta: magia, versión, tipo, secuencia, t0, t1, t2
+REPLY = struct.Struct('!4sBBxxIddd')
+
+
+def _no_delay():
+    return 0.0
+
+
+def sync_options_from_args(argv):
+    """
+    Opciones de sincronización de la línea de órdenes:
+    --sync-primary[=PUERTO] y --sync-follow=HOST[:PUERTO]
+    Devuelve (puerto del principal o None, (host, puerto) a seguir o None)
+    """
+    primary = None
+    follow = None
+    for arg in argv:
+        if arg == "--sync-primary":
+            primary = DEFAULT_PORT
+        elif arg.startswith("--sync-primary="):
+            primary = int(arg.split("=", 1)[1])
+        elif arg.startswith("--sync-follow="):
+            host, _, port = arg.split("=", 1)[1].partition(":")
+            follow = (host, int(port) if port else DEFAULT_PORT)
+    return primary, follow
+
+
+class ClockSyncServer:
+    """
+    Nodo principal: responde a cada petición con su hora.
+    `clock` da la hora del principal; `inbound_delay` y `outbound_delay`
+    permiten simular retardo de red (se aplican fuera de t1..t2).
+    """
+    
+    def __init__(self, host: str = "0.0.0.0", port: int = DEFAULT_PORT, clock=time.time,
+                 inbound_delay=_no_delay, outbound_delay=_no_delay):
+        self.host = host
+        self.port = port
+        self.clock = clock
+        self.inbound_delay = inbound_delay
+        self.outbound_delay = outbound_delay
+        self.requests = 0
+        self._socket = None
+        self._thread = None
+        self._running = False
+    
+    def start(self):
+        """Abre el puerto y atiende peticiones en un hilo"""
+        if self._thread is not None:
+            return
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.bind((self.host, self.port))
+        self._socket.settimeout(0.5)
+        self.port = self._socket.getsockname()[1]
+        self._running = True
+        self._thread = threading.Thread(target=self._serve, name="ClockSyncServer", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Detiene el hilo y cierra el puerto"""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(1.0)
+            self._thread = None
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+    
+    def _serve(self):
+        while self._running:
+            try:
+                data, address = self._socket.recvfrom(64)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            if len(data) != REQUEST.size:
+                continue
+            magic, version, kind, seq, t0 = REQUEST.unpack(data)
+            if magic != MAGIC or version != VERSION or kind != TYPE_REQUEST:
+                continue
+            
+            delay = self.inbound_delay()
+            if delay > 0:
+                time.sleep(delay)
+            t1 = self.clock()
+            reply = REPLY.pack(MAGIC, VERSION, TYPE_REPLY, seq, t0, t1, self.clock())
+            delay = self.outbound_delay()
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                self._socket.sendto(reply, address)
+            except OSError:
+                continue
+            self.requests += 1
+
+
+class ClockSyncClient:
+    """
+    Nodo seguidor: mide periódicamente el desfase con el principal.
+    `primary_time()` es la hora del principal según el reloj local y puede
+    usarse como función de hora de ClockModel.
+    """
+    
+    BURST_SIZE = 8            # Intercambios por ráfaga
+    BURST_SPACING = 0.02      # Separación entre intercambios (s)
+    REPLY_TIMEOUT = 0.25      # Espera máxima de cada respuesta (s)
+    FAST_INTERVAL = 1.0       # Intervalo entre ráfagas al arrancar (s)
+    FAST_BURSTS = 4           # Ráfagas a intervalo rápido
+    INTERVAL = 10.0           # Intervalo entre ráfagas después (s)
+    
+    def __init__(self, host: str, port: int = DEFAULT_PORT, clock=time.time):
+        self.address = (host, port)
+        self.clock = clock
+        self.estimator = ClockSyncEstimator()
+        self._lock = threading.Lock()
+        self._socket = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._seq = 0
+    
+    def start(self):
+        """Empieza a sincronizar en segundo plano"""
+        if self._thread is not None:
+            return
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.settimeout(self.REPLY_TIMEOUT)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ClockSyncClient", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Detiene la sincronización"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(2.0)
+            self._thread = None
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+    
+    def _run(self):
+        bursts = 0
+        while not self._stop.is_set():
+            self.sync_once()
+            bursts += 1
+            interval = self.FAST_INTERVAL if bursts < self.FAST_BURSTS else self.INTERVAL
+            self._stop.wait(interval)
+    
+    def sync_once(self):
+        """Hace una ráfaga de intercambios y actualiza la estimación"""
+        samples = []
+        for index in range(self.BURST_SIZE):
+            if self._stop.is_set():
+                break
+            sample = self._exchange()
+            if sample is not None:
+                samples.append(sample)
+            if index < self.BURST_SIZE - 1:
+                time.sleep(self.BURST_SPACING)
+        with self._lock:
+            return self.estimator.add_burst(samples)
+    
+    def _exchange(self):
+        """Un intercambio petición/respuesta; None si se pierde o llega tarde"""
+        self._seq = (self._seq + 1) & 0xFFFFFFFF
+        seq = self._seq
+        t0 = self.clock()
+        try:
+            self._socket.sendto(REQUEST.pack(MAGIC, VERSION, TYPE_REQUEST, seq, t0), self.address)
+            while True:
+                data = self._socket.recv(64)
+                t3 = self.clock()
+                if len(data) != REPLY.size:
+                    continue
+                magic, version, kind, reply_seq, echoed, t1, t2 = REPLY.unpack(data)
+                # Respuestas de intercambios anteriores que llegaron tarde
+                if magic != MAGIC or kind != TYPE_REPLY or reply_seq != seq or echoed != t0:
+                    continue
+                return SyncSample(t0, t1, t2, t3)
+        except (socket.timeout, OSError):
+            return None
+    
+    @property
+    def synchronized(self):
+        return self.estimator.synchronized
+    
+    def primary_time(self):
+        """Hora actual del principal (segundos epoch)"""
+        local = self.clock()
+        with self._lock:
+            return self.estimator.primary_time(local)
+    
+    def get_stats(self):
+        with self._lock:
+            return self.estimator.get_stats()
+
+
+def start_clock_sync(argv, clock_controller):
+    """
+    Arranca la sincronización pedida en la línea de órdenes para un
+    DigitalClockController. Devuelve los servicios a detener al salir.
+    """
+    primary_port, follow = sync_options_from_args(argv)
+    services = []
+    if primary_port is not None:
+        server = ClockSyncServer(port=primary_port)
+        server.start()
+        services.append(server)
+        clock_controller.set_time_source(time.time)
+    if follow is not None:
+        client = ClockSyncClient(*follow)
+        client.start()
+        services.append(client)
+        clock_controller.set_time_source(client.primary_time)
+    return services
@@ -0,0 +1,61 @@
+"""
+Exportación del historial en un hilo aparte
+La escritura se hace por bloques en segundo plano y el progreso llega
+como señal al hilo de la GUI
+"""
+import logging
+import threading
+
+from PySide6.QtCore import QObject, Signal
+from models.exporter import export_history
+
+
+logger = logging.getLogger(__name__)
+
+
+class ExportWorker(QObject):
+    """Ejecuta models.exporter.export_history en un hilo de trabajo"""
+    
+    exportProgress = Signal(int)        # Filas escritas hasta ahora
+    exportFinished = Signal(str, int)   # Ruta y filas escritas
+    exportFailed = Signal(str)          # Mensaje de error
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._thread = None
+    
+    def is_busy(self):
+        """Indica si hay una exportación en curso"""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def submit(self, matches, path: str, format: str = "csv", table: str = "matches"):
+        """Lanza la exportación de los partidos dados"""
+        if self.is_busy():
+            raise ValueError("Ya hay una exportación en curso")
+        
+        # Solo se copia la lista de referencias; las filas se generan al escribir
+        matches = list(matches)
+        self._thread = threading.Thread(
+            target=self._run, args=(matches, path, format, table),
+            name="ExportWorker", daemon=True
+        )
+        self._thread.start()
+    
+    def _run(self, matches, path, format, table):
+        """Cuerpo del hilo; las señales llegan encoladas a la GUI"""
+        try:
+            count = export_history(matches, path, format, table, self.exportProgress.emit)
+        except (OSError, ValueError) as e:
+            self.exportFailed.emit(str(e))
+        except Exception as e:
+            # Cualquier otro fallo también se notifica: si no, el hilo muere en
+            # silencio y la interfaz espera un final que no llega
+            logger.exception("Exportación interrumpida", extra={'path': path})
+            self.exportFailed.emit(f"{type(e).__name__}: {e}")
+        else:
+            self.exportFinished.emit(path, count)
+    
+    def wait(self, timeout: float = None):
+        """Espera a que termine la exportación en curso"""
+        if self._thread is not None:
+            self._thread.join(timeout)
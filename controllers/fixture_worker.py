@@ -0,0 +1,52 @@
+"""
+Generación de calendarios en un proceso aparte
+La búsqueda pesada no bloquea la interfaz; el resultado llega como señal
+al hilo de la GUI
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+from PySide6.QtCore import QObject, Signal
+from models.fixtures import generate_fixtures
+
+
+class FixtureWorker(QObject):
+    """Ejecuta models.fixtures.generate_fixtures en un proceso de trabajo"""
+    
+    fixturesReady = Signal(object)   # Resultado de generate_fixtures
+    fixturesFailed = Signal(str)     # Mensaje de error
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._executor = None
+        self._future = None
+    
+    def is_busy(self):
+        """Indica si hay una generación en curso"""
+        return self._future is not None and not self._future.done()
+    
+    def submit(self, teams, format: str = "round_robin", **options):
+        """Lanza la generación del calendario"""
+        if self.is_busy():
+            raise ValueError("Ya se está generando un calendario")
+        
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=1)
+        self._future = self._executor.submit(generate_fixtures, list(teams), format, **options)
+        self._future.add_done_callback(self._on_done)
+    
+    def _on_done(self, future):
+        """Se llama en un hilo del ejecutor; las señales llegan encoladas a la GUI"""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            self.fixturesFailed.emit(str(error))
+        else:
+            self.fixturesReady.emit(future.result())
+    
+    def shutdown(self):
+        """Cancela lo pendiente y cierra el proceso de trabajo"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._future = None
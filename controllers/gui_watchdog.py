@@ -0,0 +1,141 @@
+"""
+Vigilante del hilo de la interfaz gráfica
+Detecta bloqueos del hilo principal (diálogos modales, trabajo síncrono...)
+que retrasan los ticks de los relojes
+"""
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+from PySide6.QtCore import QObject, Signal, Qt
+
+
+logger = logging.getLogger(__name__)
+
+
+class GuiWatchdog(QObject):
+    """
+    Envía latidos al hilo de la interfaz desde un hilo vigilante y mide
+    cuánto tarda en responder. Si la respuesta supera el umbral, captura
+    la pila de Python del hilo principal y registra la duración del bloqueo.
+    """
+    
+    # Señal emitida desde el hilo vigilante; se entrega en el hilo de la GUI
+    _heartbeat = Signal(int)
+    
+    def __init__(self, threshold_ms: int = 500, interval_ms: int = 100,
+                 history_size: int = 50, parent=None):
+        super().__init__(parent)
+        self.threshold = threshold_ms / 1000.0
+        self.interval = interval_ms / 1000.0
+        
+        # El vigilante debe crearse en el hilo de la GUI
+        self._gui_thread_id = threading.get_ident()
+        
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        
+        # Estado del latido en curso
+        self._seq = 0
+        self._pending_seq = None
+        self._pending_since = 0.0
+        self._stall_stack = None
+        
+        # Estadísticas de bloqueos
+        self._stall_count = 0
+        self._total_stall_time = 0.0
+        self._max_stall_time = 0.0
+        self._recent_stalls = deque(maxlen=history_size)
+        
+        self._heartbeat.connect(self._on_heartbeat, Qt.QueuedConnection)
+    
+    def start(self):
+        """Arranca el hilo vigilante"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="GuiWatchdog", daemon=True
+        )
+        self._thread.start()
+    
+    def stop(self):
+        """Detiene el hilo vigilante"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+    
+    def _run(self):
+        """Bucle del hilo vigilante"""
+        while not self._stop_event.wait(self.interval):
+            now = time.monotonic()
+            with self._lock:
+                if self._pending_seq is None:
+                    # Enviar un nuevo latido
+                    self._seq += 1
+                    self._pending_seq = self._seq
+                    self._pending_since = now
+                    seq = self._seq
+                else:
+                    seq = None
+                    blocked = now - self._pending_since
+                    if blocked >= self.threshold and self._stall_stack is None:
+                        self._stall_stack = self._capture_gui_stack()
+                        logger.warning(
+                            "Hilo de la GUI bloqueado desde hace %.0f ms:\n%s",
+                            blocked * 1000, self._stall_stack
+                        )
+            if seq is not None:
+                self._heartbeat.emit(seq)
+    
+    def _on_heartbeat(self, seq: int):
+        """Respuesta al latido (se ejecuta en el hilo de la GUI)"""
+        now = time.monotonic()
+        with self._lock:
+            if seq != self._pending_seq:
+                return
+            elapsed = now - self._pending_since
+            self._pending_seq = None
+            if self._stall_stack is None:
+                return
+            stack = self._stall_stack
+            self._stall_stack = None
+            self._record_stall(elapsed, stack)
+        logger.warning("Bloqueo de la GUI finalizado: %.0f ms", elapsed * 1000)
+    
+    def _record_stall(self, duration: float, stack: str):
+        """Registra un bloqueo en las estadísticas (con el lock tomado)"""
+        self._stall_count += 1
+        self._total_stall_time += duration
+        self._max_stall_time = max(self._max_stall_time, duration)
+        self._recent_stalls.append({
+            'duration_ms': round(duration * 1000, 1),
+            'ended_at': time.time(),
+            'stack': stack,
+        })
+    
+    def _capture_gui_stack(self) -> str:
+        """Obtiene la pila actual del hilo de la GUI"""
+        frame = sys._current_frames().get(self._gui_thread_id)
+        if frame is None:
+            return "<pila no disponible>"
+        return "".join(traceback.format_stack(frame))
+    
+    def get_stats(self) -> dict:
+        """Obtiene las estadísticas de bloqueos para diagnóstico"""
+        with self._lock:
+            ongoing = None
+            if self._stall_stack is not None:
+                ongoing = round((time.monotonic() - self._pending_since) * 1000, 1)
+            return {
+                'stall_count': self._stall_count,
+                'total_stall_ms': round(self._total_stall_time * 1000, 1),
+                'max_stall_ms': round(self._max_stall_time * 1000, 1),
+                'ongoing_stall_ms': ongoing,
+                'recent_stalls': list(self._recent_stalls),
+            }
@@ -0,0 +1,58 @@
+"""
+Importación masiva en un hilo aparte
+La lectura y validación del fichero no bloquean la interfaz; el resultado
+validado llega como señal al hilo de la GUI, que lo aplica al modelo
+"""
+import logging
+import threading
+
+from PySide6.QtCore import QObject, Signal
+from models.importer import import_file
+
+
+logger = logging.getLogger(__name__)
+
+
+class ImportWorker(QObject):
+    """Ejecuta models.importer.import_file en un hilo de trabajo"""
+    
+    importProgress = Signal(int)       # Filas leídas hasta ahora
+    importFinished = Signal(object)    # ImportResult
+    importFailed = Signal(str)         # Mensaje de error
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._thread = None
+    
+    def is_busy(self):
+        """Indica si hay una importación en curso"""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def submit(self, path: str, known_teams=()):
+        """Lanza la lectura y validación del fichero"""
+        if self.is_busy():
+            raise ValueError("Ya hay una importación en curso")
+        
+        self._thread = threading.Thread(
+            target=self._run, args=(path, list(known_teams)),
+            name="ImportWorker", daemon=True
+        )
+        self._thread.start()
+    
+    def _run(self, path, known_teams):
+        """Cuerpo del hilo; las señales llegan encoladas a la GUI"""
+        try:
+            result = import_file(path, known_teams, progress=self.importProgress.emit)
+        except (OSError, ValueError) as e:
+            self.importFailed.emit(str(e))
+        except Exception as e:
+            # Como en ExportWorker: todo fallo llega a la interfaz
+            logger.exception("Importación interrumpida", extra={'path': path})
+            self.importFailed.emit(f"{type(e).__name__}: {e}")
+        else:
+            self.importFinished.emit(result)
+    
+    def wait(self, timeout: float = None):
+        """Espera a que termine la importación en curso"""
+        if self._thread is not None:
+            self._thread.join(timeout)
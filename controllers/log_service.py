@@ -0,0 +1,226 @@
+"""
+Registro estructurado en segundo plano
+Los módulos registran con logging.getLogger(__name__) y pasan los datos de
+cada transición en `extra`. El hilo que registra (normalmente el de la GUI)
+solo filtra el registro y lo deja en una queue.SimpleQueue; un hilo escritor
+lo convierte en una línea JSON y lo escribe en un archivo que rota por
+tamaño. Así el hilo de la GUI nunca espera a disco, ni con el nivel debug
+registrando cada tick.
+
+    --log-level=debug              nivel mínimo (por defecto info)
+    --log-file=RUTA                archivo de registro
+    --log-sample=MÓDULO:TASA,...   fracción de registros debug/info que se
+                                   conservan por módulo (p. ej.
+                                   controllers.clock_controller:0.01)
+    --no-log                       sin registro
+"""
+import json
+import logging
+import os
+import queue
+import threading
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+
+LOG_FILE = "clock.log"
+DEFAULT_LEVEL = logging.INFO
+MAX_BYTES = 2 * 1024 * 1024
+BACKUP_COUNT = 3
+
+# Atributos propios de LogRecord; el resto son los datos pasados en `extra`
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    'message', 'asctime', 'taskName'
+}
+
+
+def log_options_from_args(argv):
+    """
+    Opciones de registro de la línea de órdenes: (nivel, archivo, tasas de
+    muestreo por módulo). Nivel None si se indica --no-log.
+    """
+    level = DEFAULT_LEVEL
+    path = None
+    sample_rates = {}
+    for arg in argv:
+        if arg == "--no-log":
+            return None, None, {}
+        if arg.startswith("--log-level="):
+            name = arg.split("=", 1)[1].upper()
+            level = logging.getLevelName(name)
+            if not isinstance(level, int):
+                raise ValueError(f"Nivel de registro desconocido: {name}")
+        elif arg.startswith("--log-file="):
+            path = arg.split("=", 1)[1]
+        elif arg.startswith("--log-sample="):
+            for item in arg.split("=", 1)[1].split(","):
+                module, rate = item.rsplit(":", 1)
+                sample_rates[module.strip()] = float(rate)
+    return level, path, sample_rates
+
+
+class JsonLineFormatter(logging.Formatter):
+    """Un objeto JSON por línea con los campos fijos y los datos de `extra`"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'thread': record.threadName,
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and key not in entry:
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry['stack'] = record.stack_info
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Conserva solo una fracción de los registros de cada módulo.
+    La tasa se busca por el nombre del logger y sus padres
+    (controllers.clock_controller, controllers, ...). Es determinista: con
+    tasa 0.01 pasa uno de cada cien. Los avisos y errores pasan siempre.
+    Se registra desde cualquier hilo: los contadores van bajo un cerrojo
+    para que la proporción sea exacta.
+    """
+    
+    def __init__(self, rates: dict):
+        super().__init__()
+        self.rates = dict(rates)
+        self._intervals = {}    # Logger -> cada cuántos registros se conserva uno
+        self._counters = {}
+        self._lock = threading.Lock()
+        self.dropped = 0
+    
+    def _interval(self, name: str) -> int:
+        interval = self._intervals.get(name)
+        if interval is None:
+            interval = 1
+            module = name
+            while module:
+                if module in self.rates:
+                    rate = self.rates[module]
+                    interval = 0 if rate <= 0 else max(1, round(1 / min(rate, 1.0)))
+                    break
+                module = module.rpartition(".")[0]
+            self._intervals[name] = interval
+        return interval
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        interval = self._interval(record.name)
+        if interval == 1:
+            return True
+        with self._lock:
+            count = self._counters.get(record.name, 0)
+            self._counters[record.name] = count + 1
+            if interval and count % interval == 0:
+                return True
+            self.dropped += 1
+        return False
+
+
+class _HandOffHandler(QueueHandler):
+    """
+    QueueHandler que no formatea en el hilo que registra: solo resuelve el
+    mensaje (los argumentos pueden cambiar después) y deja el JSON, las
+    trazas y la escritura para el hilo escritor
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+    
+    def enqueue(self, record: logging.LogRecord):
+        # SimpleQueue.put no bloquea nunca (cola sin límite implementada en C)
+        self.queue.put_nowait(record)
+
+
+class LogService:
+    """
+    Registro asíncrono: un manejador en el logger raíz que pasa los
+    registros a una SimpleQueue y un QueueListener que los escribe en un
+    RotatingFileHandler desde su propio hilo
+    """
+    
+    def __init__(self, path: str, level: int = DEFAULT_LEVEL, sample_rates: dict = None,
+                 max_bytes: int = MAX_BYTES, backup_count: int = BACKUP_COUNT):
+        self.path = path
+        self.level = level
+        self.queue = queue.SimpleQueue()
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # delay=True: el archivo se abre en el hilo escritor con el primer registro
+        self.file_handler = RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8', delay=True
+        )
+        self.file_handler.setFormatter(JsonLineFormatter())
+        
+        self.sampling = SamplingFilter(sample_rates or {})
+        self.handler = _HandOffHandler(self.queue)
+        self.handler.setLevel(level)
+        self.handler.addFilter(self.sampling)
+        
+        self.listener = QueueListener(self.queue, self.file_handler, respect_handler_level=False)
+        self._previous_level = None
+        self._lock = threading.Lock()
+        self._running = False
+    
+    def start(self):
+        """Instala el manejador en el logger raíz y arranca el hilo escritor"""
+        with self._lock:
+            if self._running:
+                return
+            root = logging.getLogger()
+            self._previous_level = root.level
+            root.setLevel(min(root.level, self.level) if root.level else self.level)
+            root.addHandler(self.handler)
+            self.listener.start()
+            self._running = True
+        logging.getLogger(__name__).info(
+            "Registro iniciado",
+            extra={'path': self.path, 'log_level': logging.getLevelName(self.level),
+                   'sampling': self.sampling.rates}
+        )
+    
+    def stop(self):
+        """Retira el manejador y espera a que se escriba lo pendiente"""
+        with self._lock:
+            if not self._running:
+                return
+            root = logging.getLogger()
+            root.removeHandler(self.handler)
+            root.setLevel(self._previous_level)
+            self.listener.stop()
+            self.file_handler.close()
+            self._running = False
+    
+    def get_stats(self) -> dict:
+        """Registros descartados por muestreo y pendientes de escribir"""
+        return {
+            'dropped_by_sampling': self.sampling.dropped,
+            'pending': self.queue.qsize(),
+        }
+
+
+def start_logging(argv, directory: str):
+    """
+    Arranca el registro según la línea de órdenes; el archivo por defecto es
+    LOG_FILE dentro de `directory`. Devuelve el LogService o None con --no-log.
+    """
+    level, path, sample_rates = log_options_from_args(argv)
+    if level is None:
+        return None
+    service = LogService(path or os.path.join(directory, LOG_FILE), level, sample_rates)
+    service.start()
+    return service
@@ -5,18 +5,35 @@ Gestiona la integración del reloj con la ventana de prueba
 from PySide6.QtCore import QCoreApplication, QTranslator, QLocale
 from models.clock_model import ClockMode, TimerMode
 from controllers.clock_controller import DigitalClockController
+from controllers.snapshot_service import SnapshotWriter, load_snapshot
+from controllers.virtual_timer import create_timer
+from models.recurrence import RecurrenceError
+from models.laps import format_lap
+from models.clock_config import ClockConfig, WindowMode, ALARM_FIELDS
+from models.profiles import Profile, ProfileError
+from views.lap_list_model import LapListModel
 from translations import translate
+import logging
 import os
 
 
+logger = logging.getLogger(__name__)
+
+
 class MainWindowController:
     """Controlador para la ventana principal de prueba"""
     
-    def __init__(self, view, clock_widget, app):
+    SNAPSHOT_KEY = "clock"
+    SNAPSHOT_INTERVAL_MS = 5000
+    
+    def __init__(self, view, clock_widget, app, profiles=None):
         self.view = view
         self.clock_widget = clock_widget
         self.app = app
         
+        # Perfiles de configuración (ProfileStore); la vista ya viene con el activo
+        self.profiles = profiles
+        
         # Conectar el controlador con la vista
         self.view.set_controller(self)
         
@@ -30,39 +47,134 @@ class MainWindowController:
         self.clock_widget.timerFinished.connect(self.on_timer_finished)
         self.clock_controller.chronometerPaused.connect(self.on_timer_paused)
         
+        # Lista de vueltas del cronómetro: la vista lee directamente del registro
+        self.lap_model = LapListModel(self.clock_controller.laps)
+        self.view.set_lap_model(self.lap_model)
+        self.lap_model.flushed.connect(self.update_lap_stats)
+        self.clock_controller.lapRecorded.connect(self.on_lap_recorded)
+        self.clock_controller.lapsReset.connect(self.lap_model.reset)
+        
         # Sistema de traducciones
         self.translator = QTranslator()
-        self.current_language = 'en'
+        self.current_language = getattr(self.view, 'language', 'en')
+        
+        # Ventana de torneos abierta y reserva opcional de ventanas preparadas
+        self.tournament_window = None
+        self.tournament_controller = None
+        self.tournament_pool = None
+        
+        # Destino de la difusión (set_broadcast), compartido con la ventana de torneos
+        self.broadcast = None
+        
+        # Instantáneas periódicas para reanudar tras un reinicio
+        self.snapshot_writer = SnapshotWriter(self.SNAPSHOT_KEY)
+        self.snapshot_timer = create_timer(self.clock_model.time_source)
+        self.snapshot_timer.timeout.connect(self.on_snapshot_timer)
+        self.snapshot_timer.start(self.SNAPSHOT_INTERVAL_MS)
+        if self.app is not None:
+            self.app.aboutToQuit.connect(self.snapshot_writer.stop)
+        # Cada cambio del temporizador (inicio, pausa, reinicio, fin) se guarda
+        # enseguida: si no, tras reiniciar se reanudaría un temporizador ya
+        # reiniciado o terminado desde la última instantánea periódica
+        self.clock_controller.timerStateChanged.connect(self.save_snapshot)
         
-        # Aplicar configuración inicial
+        # Aplicar configuración inicial (la última aplicada permite aplicar solo los cambios)
+        self.applied_config = None
         self.apply_configuration()
+        if self.profiles is not None:
+            self.view.set_profiles(self.profiles.names(), self.profiles.active)
+        self.restore_snapshot()
+    
+    def read_configuration(self) -> ClockConfig:
+        """Configuración que muestran ahora los controles de la ventana"""
+        form = self.view.get_configuration()
+        alarm_time = form['alarm_time']
+        return ClockConfig(
+            mode=form['mode'],
+            format_24h=form['format_24h'],
+            alarm_enabled=form['alarm_enabled'],
+            alarm_hour=alarm_time.hour(),
+            alarm_minute=alarm_time.minute(),
+            alarm_message=form['alarm_message'],
+            alarm_rule=form['alarm_rule'],
+            timer_duration=form['timer_duration'],
+            world_zones=tuple(form['world_zones']),
+        )
     
     def apply_configuration(self):
-        """Aplica la configuración desde los controles de la ventana"""
-        config = self.view.get_configuration()
+        """
+        Aplica la configuración de la ventana. Solo se ejecutan los
+        manejadores de los campos que cambiaron desde la última aplicación:
+        cambiar el formato no reinicia el cronómetro y aplicar la misma
+        configuración no hace nada.
+        """
+        config = self.read_configuration()
+        changed = config.diff(self.applied_config)
+        if not changed:
+            return
+        
+        applied = set()
+        if 'mode' in changed:
+            # El modo aplica también los campos que dependen de él
+            if not self.apply_mode(config):
+                return
+            # El modo puede tocar los controles (el cronómetro pone la duración
+            # a 0): lo aplicado es lo que muestran después
+            config = self.read_configuration()
+            if config.mode == WindowMode.FOOTBALL:
+                # El resto de campos no se aplica en este modo
+                self.applied_config = config.merge(self.applied_config, {'mode'})
+                logger.info("Configuración aplicada", extra={'fields': ['mode']})
+                return
+            applied |= {'mode', 'timer_duration', 'world_zones'}
         
-        # Modo
-        if config['mode'] == 0:
+        for names, handler in self.CONFIG_HANDLERS:
+            pending = changed & names - applied
+            if pending and getattr(self, handler)(config):
+                applied |= pending
+        
+        self.applied_config = config.merge(self.applied_config, applied)
+        if changed - applied:
+            logger.warning("Campos de configuración no aplicados",
+                           extra={'fields': sorted(changed - applied)})
+        if applied:
+            logger.info("Configuración aplicada", extra={'fields': sorted(applied)})
+            self.view.show_notification(self.view.tr("Configuration applied successfully"))
+            self.save_snapshot()
+    
+    # Manejadores por grupo de campos (devuelven False si no se pudo aplicar)
+    CONFIG_HANDLERS = (
+        (frozenset(('format_24h',)), 'apply_format'),
+        (ALARM_FIELDS, 'apply_alarm'),
+        (frozenset(('timer_duration',)), 'apply_timer_duration'),
+        (frozenset(('world_zones',)), 'apply_world_zones'),
+    )
+    
+    def apply_mode(self, config: ClockConfig):
+        """Cambia de modo y aplica los campos que ese modo usa"""
+        self.view.show_laps(config.mode == WindowMode.CHRONOMETER)
+        
+        if config.mode == WindowMode.CLOCK:
             self.clock_controller.set_mode(ClockMode.CLOCK)
             if hasattr(self.view, 'spinTimerDuration'):
                 self.view.spinTimerDuration.setEnabled(False)
             if hasattr(self.view, 'lblTimerDuration'):
                 self.view.lblTimerDuration.setText(translate("No aplica (reloj)", self.current_language))
-        elif config['mode'] == 1:
+        elif config.mode == WindowMode.TIMER:
             self.clock_controller.set_mode(ClockMode.TIMER)
             self.clock_controller.set_timer_mode(TimerMode.REGRESSIVE)
+            self.clock_controller.set_timer_duration(config.timer_duration)
             if hasattr(self.view, 'spinTimerDuration'):
                 self.view.spinTimerDuration.setEnabled(True)
             if hasattr(self.view, 'lblTimerDuration'):
                 self.view.lblTimerDuration.setText(translate("Timer Duration (sec):", self.current_language))
-        elif config['mode'] == 2:
+        elif config.mode == WindowMode.FOOTBALL:
             self.open_tournament()
             if hasattr(self.view, 'spinTimerDuration'):
                 self.view.spinTimerDuration.setEnabled(False)
             if hasattr(self.view, 'lblTimerDuration'):
                 self.view.lblTimerDuration.setText(translate("No aplica (fútbol)", self.current_language))
-            return  # No aplicar otras configuraciones para este modo
-        elif config['mode'] == 3:
+        elif config.mode == WindowMode.CHRONOMETER:
             self.clock_controller.set_mode(ClockMode.TIMER)
             self.clock_controller.set_timer_mode(TimerMode.PROGRESSIVE)
             self.clock_controller.set_timer_duration(0)  # Sin límite para cronómetro
@@ -74,23 +186,107 @@ class MainWindowController:
                 self.view.spinTimerDuration.setValue(0)  # Poner 0 para claridad
             if hasattr(self.view, 'lblTimerDuration'):
                 self.view.lblTimerDuration.setText(translate("No aplica (cronómetro)", self.current_language))
-        
-        # Formato
-        self.clock_controller.set_format_24h(config['format_24h'])
-        
-        # Alarma
-        alarm_time = config['alarm_time']
-        self.clock_controller.set_alarm(
-            config['alarm_enabled'],
-            alarm_time.hour(),
-            alarm_time.minute(),
-            config['alarm_message']
-        )
-        
-        # Duración del temporizador
-        self.clock_controller.set_timer_duration(config['timer_duration'])
-        
-        self.view.show_notification(self.view.tr("Configuration applied successfully"))
+        elif config.mode == WindowMode.WORLD:
+            if not self.apply_world_zones(config):
+                return False
+            self.clock_controller.set_mode(ClockMode.WORLD)
+            if hasattr(self.view, 'spinTimerDuration'):
+                self.view.spinTimerDuration.setEnabled(False)
+            if hasattr(self.view, 'lblTimerDuration'):
+                self.view.lblTimerDuration.setText(translate("No aplica (reloj)", self.current_language))
+        return True
+    
+    def apply_format(self, config: ClockConfig):
+        self.clock_controller.set_format_24h(config.format_24h)
+        return True
+    
+    def apply_alarm(self, config: ClockConfig):
+        try:
+            self.clock_controller.set_alarm(
+                config.alarm_enabled,
+                config.alarm_hour,
+                config.alarm_minute,
+                config.alarm_message,
+                config.alarm_rule
+            )
+        except RecurrenceError as error:
+            logger.warning("Regla de alarma no válida",
+                           extra={'rule': config.alarm_rule, 'error': str(error)})
+            self.view.show_notification(
+                f"{translate('Invalid repeat rule', self.current_language)}: {error}"
+            )
+            return False
+        return True
+    
+    def apply_timer_duration(self, config: ClockConfig):
+        """La duración solo se usa en el temporizador (el cronómetro va sin límite)"""
+        if config.mode == WindowMode.TIMER:
+            self.clock_controller.set_timer_duration(config.timer_duration)
+        return True
+    
+    def apply_world_zones(self, config: ClockConfig):
+        """Las zonas se comprueban y aplican al entrar en el reloj mundial"""
+        if config.mode != WindowMode.WORLD:
+            return True
+        try:
+            self.clock_controller.set_world_zones(config.world_zones)
+        except ValueError as error:
+            logger.warning("Zonas horarias no válidas",
+                           extra={'zones': config.world_zones, 'error': str(error)})
+            self.view.show_notification(str(error))
+            return False
+        return True
+    
+    # Perfiles
+    def load_profile(self, name: str):
+        """Pasa al perfil indicado aplicando solo lo que cambia"""
+        if self.profiles is None:
+            return
+        profile = self.profiles.activate(name)
+        logger.info("Perfil cargado", extra={'profile': name, 'language': profile.language})
+        if profile.config is not None:
+            self.view.set_configuration(profile.config)
+        self.change_language(profile.language)
+        self.apply_configuration()
+        self.view.set_profiles(self.profiles.names(), self.profiles.active)
+        self.write_profiles()
+    
+    def save_profile(self):
+        """Guarda la configuración del formulario y el idioma como perfil"""
+        if self.profiles is None:
+            return
+        name = self.view.ask_profile_name(self.profiles.active)
+        if name is None:
+            return
+        try:
+            self.profiles.put(Profile(name, self.read_configuration(), self.current_language))
+        except ProfileError as error:
+            logger.warning("Perfil no guardado", extra={'profile': name, 'error': str(error)})
+            self.view.show_notification(str(error))
+            return
+        self.profiles.activate(name)
+        logger.info("Perfil guardado", extra={'profile': name})
+        self.view.set_profiles(self.profiles.names(), self.profiles.active)
+        if self.write_profiles():
+            self.view.show_notification(translate('Profile saved', self.current_language))
+    
+    def delete_profile(self):
+        """Borra el perfil activo (la configuración actual se mantiene)"""
+        if self.profiles is None:
+            return
+        logger.info("Perfil borrado", extra={'profile': self.profiles.active})
+        self.profiles.remove(self.profiles.active)
+        self.view.set_profiles(self.profiles.names(), self.profiles.active)
+        self.write_profiles()
+    
+    def write_profiles(self):
+        try:
+            self.profiles.save()
+        except OSError as error:
+            logger.error("Perfiles no escritos", extra={'path': self.profiles.path, 'error': str(error)})
+            self.view.show_notification(str(error))
+            return False
+        return True
     
     def on_alarm_triggered(self, message: str):
         """Maneja el evento de alarma"""
@@ -105,6 +301,26 @@ class MainWindowController:
             self.view.tr("The timer has finished!")
         )
     
+    def on_lap_recorded(self, number: int, lap: float, split: float):
+        """Nueva vuelta: la lista se actualiza en bloque"""
+        self.lap_model.notify_added()
+    
+    def update_lap_stats(self):
+        """Resumen de las vueltas: mejor, peor, media y percentiles"""
+        stats = self.clock_controller.laps.stats
+        if not stats.count:
+            self.view.update_lap_stats("")
+            return
+        p50, p90 = stats.percentiles((0.5, 0.9))
+        language = self.current_language
+        self.view.update_lap_stats(
+            f"{translate('Laps', language)}: {stats.count}  "
+            f"{translate('Best', language)}: {format_lap(stats.best)} (#{stats.best_number})  "
+            f"{translate('Worst', language)}: {format_lap(stats.worst)} (#{stats.worst_number})  "
+            f"{translate('Mean', language)}: {format_lap(stats.mean)}  "
+            f"p50: {format_lap(p50)}  p90: {format_lap(p90)}"
+        )
+    
     def on_timer_paused(self):
         """Maneja cuando se pausa el temporizador"""
         if self.clock_controller.model.timer_mode == TimerMode.PROGRESSIVE:
@@ -155,6 +371,7 @@ class MainWindowController:
         if language == self.current_language:
             return
         
+        logger.info("Idioma cambiado", extra={'language': language, 'previous': self.current_language})
         self.current_language = language
         
         # Retranslate UI
@@ -165,18 +382,99 @@ class MainWindowController:
         self.view.retranslateUi(self.current_language)
         self.clock_widget.retranslateUi(self.current_language)
     
+    def set_tournament_pool(self, pool):
+        """Sirve las ventanas de torneo desde una TournamentWindowPool (None para construirlas al abrir)"""
+        if self.tournament_pool is not None and pool is not self.tournament_pool:
+            self.tournament_pool.clear()
+        self.tournament_pool = pool
+    
+    def set_broadcast(self, publisher):
+        """
+        Publica el reloj y, cuando se abra, la ventana de torneos en un
+        BroadcastServer, SharedClockMemory o PublisherGroup (None para dejar de hacerlo)
+        """
+        self.broadcast = publisher
+        self.clock_controller.set_broadcast(publisher)
+        if self.tournament_controller is not None:
+            self.tournament_controller.set_broadcast(publisher)
+    
     def open_tournament(self):
         """Abre la ventana de gestión de torneos"""
-        if hasattr(self, 'tournament_window') and self.tournament_window.isVisible():
-            self.tournament_window.raise_()
-            return
+        if self.tournament_window is not None:
+            if self.tournament_window.isVisible():
+                self.tournament_window.raise_()
+                return
+            self.close_tournament()
         
-        from views.tournament_window import TournamentWindow
-        from views.digital_clock_widget import DigitalClockWidget
         from controllers.tournament_controller import TournamentController
         
-        self.tournament_window = TournamentWindow()
-        clock_widget = DigitalClockWidget()
-        self.tournament_window.add_clock_widget(clock_widget)
+        if self.tournament_pool is not None:
+            # Ventana ya construida en un hueco libre
+            self.tournament_window, clock_widget = self.tournament_pool.acquire()
+        else:
+            from views.tournament_window import TournamentWindow
+            from views.digital_clock_widget import DigitalClockWidget
+            
+            self.tournament_window = TournamentWindow()
+            clock_widget = DigitalClockWidget()
+            self.tournament_window.add_clock_widget(clock_widget)
         self.tournament_controller = TournamentController(self.tournament_window, clock_widget, self.app)
+        if self.broadcast is not None:
+            self.tournament_controller.set_broadcast(self.broadcast)
+        logger.info("Ventana de torneo abierta", extra={'pooled': self.tournament_pool is not None})
+        self.tournament_window.closed.connect(self.close_tournament)
         self.tournament_window.show()
+    
+    def close_tournament(self):
+        """Desmonta la ventana de torneos cerrada y su controlador"""
+        if self.tournament_window is None:
+            return
+        self.tournament_window.closed.disconnect(self.close_tournament)
+        self.tournament_controller.shutdown()
+        self.tournament_window.deleteLater()
+        self.tournament_window = None
+        logger.info("Ventana de torneo cerrada")
+        self.tournament_controller = None
+    
+    def on_snapshot_timer(self):
+        """
+        Guarda periódicamente mientras el temporizador esté en marcha (los
+        cambios de estado se guardan al producirse, con timerStateChanged)
+        """
+        if self.clock_model.timer_running:
+            self.save_snapshot()
+    
+    def save_snapshot(self):
+        """Entrega el estado del reloj al escritor de instantáneas"""
+        self.snapshot_writer.submit({
+            'combo_mode': self.view.comboMode.currentIndex(),
+            'clock': self.clock_model.to_snapshot(self.clock_model.time_source.time()),
+        })
+    
+    def restore_snapshot(self):
+        """Reanuda el temporizador o cronómetro guardado"""
+        state = load_snapshot(self.SNAPSHOT_KEY)
+        if not state or not state['clock']['timer_running']:
+            return
+        if state['combo_mode'] not in (WindowMode.TIMER, WindowMode.CHRONOMETER):
+            return
+        
+        # Seleccionar el modo sin volver a disparar apply_configuration
+        self.view.comboMode.blockSignals(True)
+        self.view.comboMode.setCurrentIndex(state['combo_mode'])
+        self.view.comboMode.blockSignals(False)
+        self.apply_configuration()
+        
+        finished = self.clock_model.restore_snapshot(state['clock'], self.clock_model.time_source.time())
+        logger.info("Instantánea del reloj restaurada",
+                    extra={'seconds': self.clock_model.timer_current, 'finished': finished,
+                           'paused': self.clock_model.timer_paused})
+        self.clock_controller.rearm_subscriptions()
+        self.clock_controller.update_display()
+        self.clock_controller.update_controls()
+        if finished:
+            self.clock_controller.on_timer_finished()
+        elif not self.clock_model.timer_paused:
+            self.clock_widget.start_internal_timer()
+            self.clock_widget.update_status(self.clock_widget.tr("Running..."))
+        self.save_snapshot()
@@ -0,0 +1,323 @@
+"""
+Estado de los relojes en memoria compartida
+El proceso principal escribe el estado de cada reloj en un bloque de
+multiprocessing.shared_memory con un formato fijo y versionado; los
+procesos de pantalla lo leen directamente a su propio ritmo, sin sockets
+ni serialización. Cada ranura se protege con un seqlock: el escritor
+nunca espera y el lector reintenta si la ranura cambió mientras leía.
+"""
+import logging
+import os
+import struct
+import time
+from multiprocessing import shared_memory
+
+
+logger = logging.getLogger(__name__)
+
+
+MAGIC = b"DCSM"
+VERSION = 1
+DEFAULT_NAME = "digital_clock_state"
+DEFAULT_SLOTS = 16
+
+# Cabecera: magia, versión, nº de ranuras, tamaño de ranura
+HEADER = struct.Struct('<4sHHI')
+HEADER_SIZE = 64
+# PID del proceso escritor, tras la cabecera (0 en bloques sin propietario conocido)
+OWNER = struct.Struct('<I')
+OWNER_OFFSET = HEADER.size
+
+# Ranura: secuencia del seqlock (par = estable, impar = escribiendo)
+SEQ = struct.Struct('<Q')
+# Datos: canal, modo, indicadores, segundos, hora de escritura,
+# texto del display, equipos y marcador
+PAYLOAD = struct.Struct('<24sBBxxid16s32s32sHH')
+SLOT_SIZE = 192     # 8 + 124 bytes usados; el resto queda reservado
+PAYLOAD_OFFSET = 8
+
+MODES = ('', 'clock', 'timer', 'world')
+
+FLAG_RUNNING = 0x01
+FLAG_PAUSED = 0x02
+FLAG_IN_PROGRESS = 0x04
+FLAG_ON_BREAK = 0x08
+
+
+def _text(value: bytes):
+    return value.rstrip(b"\0").decode('utf-8', 'replace')
+
+
+def _encode(value, size: int):
+    """Texto UTF-8 truncado sin partir caracteres"""
+    data = str(value or "").encode('utf-8')
+    if len(data) > size:
+        data = data[:size].decode('utf-8', 'ignore').encode('utf-8')
+    return data
+
+
+def _attach(name: str):
+    """
+    Abre un bloque existente sin registrarlo en el resource_tracker de este
+    proceso: si no, al terminar un lector se eliminaría el bloque del escritor
+    """
+    try:
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        # Python < 3.13
+        shm = shared_memory.SharedMemory(name)
+        if os.name == 'posix':
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def _process_alive(pid: int):
+    """Indica si el proceso `pid` sigue vivo"""
+    if pid <= 0:
+        return False
+    if os.name != 'posix':
+        # En Windows el bloque desaparece con el último proceso que lo abre:
+        # si todavía existe es que su escritor sigue vivo
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Existe, aunque sea de otro usuario
+        return True
+    return True
+
+
+def _claim_stale(name: str):
+    """
+    Elimina el bloque `name` si es un bloque de relojes cuyo escritor ya
+    terminó. Lanza FileExistsError si su escritor sigue vivo o si el bloque
+    no contiene estado de relojes: eliminarlo dejaría sin datos a otro proceso.
+    """
+    existing = _attach(name)
+    try:
+        if existing.size < HEADER_SIZE or bytes(existing.buf[:len(MAGIC)]) != MAGIC:
+            raise FileExistsError(f"El bloque {name} ya existe y no contiene estado de relojes")
+        (pid,) = OWNER.unpack_from(existing.buf, OWNER_OFFSET)
+        if pid != os.getpid() and _process_alive(pid):
+            raise FileExistsError(f"El bloque {name} ya lo escribe el proceso {pid}")
+    finally:
+        existing.close()
+    # Bloque huérfano de una ejecución anterior
+    logger.warning("Bloque de memoria compartida huérfano eliminado", extra={'block': name, 'pid': pid})
+    stale = shared_memory.SharedMemory(name)
+    stale.close()
+    stale.unlink()
+
+
+def shared_memory_name_from_args(argv):
+    """
+    Nombre del bloque indicado con --shared-memory o --shared-memory=NOMBRE
+    (None si no se ha pedido)
+    """
+    for arg in argv:
+        if arg == "--shared-memory":
+            return DEFAULT_NAME
+        if arg.startswith("--shared-memory="):
+            return arg.split("=", 1)[1]
+    return None
+
+
+class SharedClockMemory:
+    """
+    Bloque de memoria compartida con una ranura por canal (reloj o partido).
+    El proceso que lo crea (create=True) es el único escritor y expone la
+    misma interfaz `publish`/`remove` que BroadcastServer, de modo que los
+    controladores pueden publicar en cualquiera de los dos.
+    Con create=True solo se reutiliza el nombre de un bloque cuyo escritor ya
+    terminó; si sigue vivo se lanza FileExistsError.
+    """
+    
+    def __init__(self, name: str = DEFAULT_NAME, slots: int = DEFAULT_SLOTS, create: bool = False):
+        self.name = name
+        self.owner = create
+        if create:
+            size = HEADER_SIZE + slots * SLOT_SIZE
+            try:
+                self._shm = shared_memory.SharedMemory(name, create=True, size=size)
+            except FileExistsError:
+                _claim_stale(name)
+                self._shm = shared_memory.SharedMemory(name, create=True, size=size)
+            self.buf = self._shm.buf
+            self.buf[:size] = bytes(size)
+            HEADER.pack_into(self.buf, 0, MAGIC, VERSION, slots, SLOT_SIZE)
+            OWNER.pack_into(self.buf, OWNER_OFFSET, os.getpid())
+            self.slots = slots
+        else:
+            self._shm = _attach(name)
+            self.buf = self._shm.buf
+            magic, version, slots, slot_size = HEADER.unpack_from(self.buf, 0)
+            if magic != MAGIC:
+                self.close()
+                raise ValueError(f"El bloque {name} no contiene estado de relojes")
+            if version != VERSION or slot_size != SLOT_SIZE:
+                self.close()
+                raise ValueError(f"Versión de formato no soportada: {version}")
+            self.slots = slots
+        # Canal -> ranura (el escritor asigna; el lector busca por nombre)
+        self._channels = {}
+    
+    @classmethod
+    def attach(cls, name: str = DEFAULT_NAME):
+        """Abre un bloque existente para leer"""
+        return cls(name)
+    
+    def _offset(self, slot: int):
+        return HEADER_SIZE + slot * SLOT_SIZE
+    
+    # Escritura (solo el proceso propietario)
+    def publish(self, channel: str, state: dict):
+        """Escribe el estado de un canal en su ranura"""
+        slot = self._channels.get(channel)
+        if slot is None:
+            slot = self._allocate(channel)
+        flags = 0
+        if state.get('running'):
+            flags |= FLAG_RUNNING
+        if state.get('paused'):
+            flags |= FLAG_PAUSED
+        if state.get('in_progress'):
+            flags |= FLAG_IN_PROGRESS
+        if state.get('on_break'):
+            flags |= FLAG_ON_BREAK
+        mode = state.get('mode')
+        self._write(slot, (
+            _encode(channel, 24),
+            MODES.index(mode) if mode in MODES else 0,
+            flags,
+            int(state.get('seconds') or 0),
+            time.time(),
+            _encode(state.get('display'), 16),
+            _encode(state.get('team1'), 32),
+            _encode(state.get('team2'), 32),
+            int(state.get('score1') or 0),
+            int(state.get('score2') or 0),
+        ))
+    
+    def remove(self, channel: str):
+        """Libera la ranura de un canal"""
+        slot = self._channels.pop(channel, None)
+        if slot is not None:
+            self._write(slot, (b"", 0, 0, 0, time.time(), b"", b"", b"", 0, 0))
+    
+    def _allocate(self, channel: str):
+        used = set(self._channels.values())
+        for slot in range(self.slots):
+            if slot not in used:
+                self._channels[channel] = slot
+                return slot
+        raise ValueError(f"No quedan ranuras libres para el canal {channel}")
+    
+    def _write(self, slot: int, values):
+        offset = self._offset(slot)
+        (seq,) = SEQ.unpack_from(self.buf, offset)
+        SEQ.pack_into(self.buf, offset, seq + 1)
+        PAYLOAD.pack_into(self.buf, offset + PAYLOAD_OFFSET, *values)
+        SEQ.pack_into(self.buf, offset, seq + 2)
+    
+    # Lectura (cualquier proceso)
+    def sequence(self, slot: int):
+        """Secuencia actual de la ranura (cambia con cada escritura)"""
+        return SEQ.unpack_from(self.buf, self._offset(slot))[0]
+    
+    def read_slot(self, slot: int, retries: int = 100):
+        """
+        Lee una ranura de forma consistente.
+        Devuelve (secuencia, valores) o None si el escritor no la dejó
+        estable tras `retries` intentos.
+        """
+        offset = self._offset(slot)
+        for _ in range(retries):
+            (before,) = SEQ.unpack_from(self.buf, offset)
+            if before & 1:
+                continue
+            values = PAYLOAD.unpack_from(self.buf, offset + PAYLOAD_OFFSET)
+            (after,) = SEQ.unpack_from(self.buf, offset)
+            if before == after:
+                return before, values
+        return None
+    
+    def find(self, channel: str):
+        """Ranura del canal dado (o None)"""
+        encoded = _encode(channel, 24)
+        for slot in range(self.slots):
+            read = self.read_slot(slot)
+            if read is not None and read[1][0].rstrip(b"\0") == encoded:
+                self._channels[channel] = slot
+                return slot
+        return None
+    
+    def read(self, channel: str):
+        """Estado de un canal como diccionario (o None si no existe)"""
+        slot = self._channels.get(channel)
+        if slot is None:
+            slot = self.find(channel)
+            if slot is None:
+                return None
+        read = self.read_slot(slot)
+        if read is None:
+            return None
+        seq, values = read
+        name, mode, flags, seconds, updated, display, team1, team2, score1, score2 = values
+        if _text(name) != channel:
+            # La ranura se reasignó a otro canal
+            self._channels.pop(channel, None)
+            return None
+        return {
+            'seq': seq,
+            'mode': MODES[mode] if mode < len(MODES) else '',
+            'running': bool(flags & FLAG_RUNNING),
+            'paused': bool(flags & FLAG_PAUSED),
+            'in_progress': bool(flags & FLAG_IN_PROGRESS),
+            'on_break': bool(flags & FLAG_ON_BREAK),
+            'seconds': seconds,
+            'updated': updated,
+            'display': _text(display),
+            'team1': _text(team1),
+            'team2': _text(team2),
+            'score1': score1,
+            'score2': score2,
+        }
+    
+    def channels(self):
+        """Canales con ranura ocupada"""
+        names = []
+        for slot in range(self.slots):
+            read = self.read_slot(slot)
+            if read is not None and read[1][0].rstrip(b"\0"):
+                names.append(_text(read[1][0]))
+        return names
+    
+    def close(self):
+        """Suelta la vista del bloque; el propietario además lo elimina"""
+        if self._shm is None:
+            return
+        self.buf = None
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+        self._shm = None
+
+
+def open_shared_memory(argv):
+    """
+    Crea el bloque pedido con --shared-memory[=NOMBRE].
+    Devuelve (bloque, error): ambos None si no se ha pedido; si otro
+    proceso vivo ya escribe en ese nombre el fallo se registra, el bloque
+    es None y la aplicación sigue sin memoria compartida.
+    """
+    name = shared_memory_name_from_args(argv)
+    if name is None:
+        return None, None
+    try:
+        return SharedClockMemory(name, create=True), None
+    except FileExistsError as error:
+        logger.error("Memoria compartida desactivada", extra={'block': name, 'error': str(error)})
+        return None, str(error)
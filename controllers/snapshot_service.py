@@ -0,0 +1,96 @@
+"""
+Servicio de instantáneas del estado de relojes y partidos
+Guarda el estado en QSettings desde un hilo propio, agrupando las
+escrituras para que el hilo de la GUI nunca espere a disco
+"""
+import json
+import threading
+import time
+
+from PySide6.QtCore import QSettings
+
+
+SNAPSHOT_GROUP = "snapshots"
+
+
+def load_snapshot(key: str):
+    """Carga la última instantánea guardada para la clave (o None)"""
+    settings = QSettings()
+    raw = settings.value(f"{SNAPSHOT_GROUP}/{key}")
+    if not raw:
+        return None
+    try:
+        return json.loads(raw)
+    except (TypeError, ValueError):
+        return None
+
+
+class SnapshotWriter:
+    """
+    Escritor de instantáneas con debounce en segundo plano.
+    `submit` solo guarda una referencia al último estado; el hilo escritor
+    serializa y escribe como mucho una vez por ventana de debounce.
+    """
+    
+    def __init__(self, key: str, debounce_ms: int = 1000):
+        self.key = key
+        self.debounce = debounce_ms / 1000.0
+        
+        self._condition = threading.Condition()
+        self._pending = None
+        self._pending_since = 0.0
+        self._running = True
+        self.writes = 0
+        
+        self._thread = threading.Thread(
+            target=self._run, name=f"SnapshotWriter-{key}", daemon=True
+        )
+        self._thread.start()
+    
+    def submit(self, state: dict):
+        """Entrega un nuevo estado para guardar (no bloquea)"""
+        with self._condition:
+            if self._pending is None:
+                self._pending_since = time.monotonic()
+            self._pending = state
+            self._condition.notify()
+    
+    def stop(self):
+        """Escribe el estado pendiente y detiene el hilo"""
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        self._thread.join(timeout=2.0)
+    
+    def _run(self):
+        """Bucle del hilo escritor"""
+        while True:
+            with self._condition:
+                while self._running and self._pending is None:
+                    self._condition.wait()
+                
+                # Esperar a que termine la ventana de debounce
+                while self._running:
+                    remaining = self._pending_since + self.debounce - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                
+                state = self._pending
+                self._pending = None
+                running = self._running
+            
+            if state is not None:
+                self._write(state)
+            if not running:
+                return
+    
+    def _write(self, state: dict):
+        """Escribe el estado como un único valor (QSettings guarda de forma atómica)"""
+        settings = QSettings()
+        settings.setValue(
+            f"{SNAPSHOT_GROUP}/{self.key}",
+            json.dumps(state, separators=(',', ':'))
+        )
+        settings.sync()
+        self.writes += 1
@@ -2,55 +2,121 @@
 Controlador de la ventana de gestión de torneos
 Gestiona la integración del reloj con los partidos
 """
-from PySide6.QtCore import QTranslator
+from PySide6.QtCore import QTranslator, Qt
 from models.clock_model import ClockMode, TimerMode
 from models.tournament_model import TournamentModel
+from models.match_events import MatchEventType
+from models.period_plan import PeriodPlan, PeriodStateMachine, PRESETS, PLAY, BREAK, PENALTIES
 from controllers.clock_controller import DigitalClockController
+from controllers.snapshot_service import SnapshotWriter, load_snapshot
+from controllers.fixture_worker import FixtureWorker
+from controllers.export_worker import ExportWorker
+from controllers.import_worker import ImportWorker
+from controllers.virtual_timer import create_timer
+from models.time_source import as_time_source
 from translations import translate
+import logging
+import math
 import os
 
 
+logger = logging.getLogger(__name__)
+
+
 class TournamentController:
     """Controlador para la gestión de torneos"""
     
-    def __init__(self, view, clock_widget, app):
+    SNAPSHOT_KEY = "tournament"
+    SNAPSHOT_INTERVAL_MS = 5000
+    BREAK_DURATION = 5  # Segundos de descanso del plan por defecto
+    
+    def __init__(self, view, clock_widget, app, time_source=None):
         self.view = view
         self.clock_widget = clock_widget
         self.app = app
         
+        # Fuente del tiempo del partido, del reloj y del registro del torneo
+        self.time_source = as_time_source(time_source)
+        
         # Conectar el controlador con la vista
         self.view.set_controller(self)
         
         # Modelo del torneo
-        self.tournament_model = TournamentModel()
+        self.tournament_model = TournamentModel(time_source=self.time_source)
         
         # Crear el controlador del reloj
         from models.clock_model import ClockModel
         self.clock_model = ClockModel()
+        self.clock_model.set_time_source(self.time_source)
         self.clock_controller = DigitalClockController(self.clock_model, clock_widget)
         
         # Configurar el reloj en modo reloj (mostrará la hora actual)
         self.clock_controller.set_mode(ClockMode.CLOCK)
         
-        # Conectar señales del reloj
-        self.clock_widget.timerFinished.connect(self.on_match_time_finished)
-        self.clock_widget.timeUpdated.connect(self.on_time_updated)
+        # Pausas manuales del reloj: detienen también el plan de periodos
+        self.clock_controller.pausedChanged.connect(self.on_clock_paused)
+        # Aviso del último minuto de cada periodo: el reloj lo arma como plazo
+        self.clock_controller.subscribe_crossing(60, self.on_last_minute)
         
         # Sistema de traducciones
         self.translator = QTranslator()
-        self.current_language = 'en'
+        # La ventana se construye en español (TournamentWindow.retranslateUi)
+        self.current_language = 'es'
+        
+        # Plan de periodos: None usa dos partes con la duración del formulario
+        self.period_plan = None
+        self.period_machine = None
+        # Un único temporizador hasta el final de la fase en curso
+        self.phase_timer = create_timer(self.time_source)
+        self.phase_timer.setSingleShot(True)
+        self.phase_timer.setTimerType(Qt.PreciseTimer)
+        self.phase_timer.timeout.connect(self.on_phase_timer)
+        
+        # Generación de calendarios en segundo plano
+        self.fixture_worker = FixtureWorker()
+        self.fixture_worker.fixturesReady.connect(self.on_fixtures_ready)
+        self.fixture_worker.fixturesFailed.connect(self.on_fixtures_failed)
+        if self.app is not None:
+            self.app.aboutToQuit.connect(self.fixture_worker.shutdown)
+        
+        # Difusión opcional del marcador (set_broadcast)
+        self.broadcast = None
+        
+        # Exportación del historial en segundo plano
+        self.export_worker = ExportWorker()
+        self.export_worker.exportProgress.connect(self.on_export_progress)
+        self.export_worker.exportFinished.connect(self.on_export_finished)
+        self.export_worker.exportFailed.connect(self.on_export_failed)
         
-        # Variables para el descanso
-        self.break_done = False
-        self.half_time = 0
-        self.match_duration = 0
+        # Importación masiva en segundo plano
+        self.import_worker = ImportWorker()
+        self.import_worker.importProgress.connect(self.on_import_progress)
+        self.import_worker.importFinished.connect(self.on_import_finished)
+        self.import_worker.importFailed.connect(self.on_import_failed)
+        
+        # Instantáneas periódicas para reanudar tras un reinicio
+        self.snapshot_writer = SnapshotWriter(self.SNAPSHOT_KEY)
+        self.snapshot_timer = create_timer(self.time_source)
+        self.snapshot_timer.timeout.connect(self.on_snapshot_timer)
+        self.snapshot_timer.start(self.SNAPSHOT_INTERVAL_MS)
+        if self.app is not None:
+            self.app.aboutToQuit.connect(self.snapshot_writer.stop)
+        
+        self.restore_snapshot()
     
     def start_match(self):
         """Inicia un nuevo partido"""
         match_data = self.view.get_match_data()
         
+        # Sin equipos escritos, usar el siguiente partido del calendario
+        fixture = self.tournament_model.next_fixture()
+        if fixture is not None and not match_data['team1'] and not match_data['team2']:
+            match_data['team1'] = fixture.team1
+            match_data['team2'] = fixture.team2
+        
         # Validar datos
         if not match_data['team1'] or not match_data['team2']:
+            logger.warning("Partido sin equipos")
             self.view.show_error(
                 self.view.tr("Error"),
                 self.view.tr("Please enter both team names")
@@ -68,20 +134,22 @@ class TournamentController:
             # Iniciar el partido
             self.tournament_model.start_current_match()
             
-            # Cambiar el reloj a modo temporizador
-            self.clock_controller.set_mode(ClockMode.TIMER)
-            self.clock_controller.set_timer_mode(TimerMode.REGRESSIVE)
-            
-            # Configurar el reloj
-            duration_seconds = match_data['duration'] * 60
-            self.match_duration = duration_seconds
-            self.half_time = duration_seconds // 2
-            self.break_done = False
-            self.clock_controller.set_timer_duration(duration_seconds)
-            self.clock_controller.on_reset()  # Asegurar que esté reseteado
-            
-            # Iniciar el cronómetro
-            self.clock_controller.on_start()
+            # Compilar el plan de periodos y poner el reloj en la primera fase.
+            # Una eliminatoria necesita ganador: prórroga y penaltis si hay empate
+            knockout = self.tournament_model.is_knockout_match(match)
+            plan = self.period_plan or PeriodPlan.football(
+                match_data['duration'], break_seconds=self.BREAK_DURATION,
+                extra_time=knockout, penalties=knockout
+            )
+            now = self.time_source.time()
+            self.period_machine = PeriodStateMachine(plan)
+            self.period_machine.start(now)
+            logger.info("Partido iniciado", extra={
+                'match_id': match.match_id, 'team1': match.team1, 'team2': match.team2,
+                'plan': plan.name or None, 'phases': len(plan.phases),
+            })
+            self.show_phase(now)
+            self.arm_phase_timer()
             
             # Actualizar la interfaz
             self.view.set_match_controls_enabled(False, True)
@@ -94,7 +162,10 @@ class TournamentController:
             for event in match.events:
                 self.view.add_log_entry(event)
             
+            self.save_snapshot()
+            
         except ValueError as e:
+            logger.warning("Partido no iniciado", extra={'error': str(e)})
             self.view.show_error(self.view.tr("Error"), str(e))
     
     def end_match(self):
@@ -102,6 +173,16 @@ class TournamentController:
         if not self.tournament_model.has_active_match():
             return
         
+        match = self.tournament_model.current_match
+        if self.tournament_model.is_knockout_match(match) and match.get_winner() is None:
+            # La ronda siguiente no puede emparejarse sin ganador
+            logger.warning("Eliminatoria sin ganador", extra=self._match_state(match))
+            self.view.show_error(
+                self.view.tr("Error"),
+                self.view.tr("A knockout match needs a winner: play extra time or penalties")
+            )
+            return
+        
         # Detener el cronómetro
         self.clock_controller.on_reset()
         
@@ -109,19 +190,19 @@ class TournamentController:
         self.clock_controller.set_mode(ClockMode.CLOCK)
         
         # Finalizar el partido
-        match = self.tournament_model.current_match
         match.add_event(self.view.tr("Match ended manually"))
         self.tournament_model.end_current_match()
+        logger.info("Partido terminado a mano", extra=self._match_state(match))
         
-        # Resetear variables de descanso
-        self.break_done = False
-        self.half_time = 0
-        self.match_duration = 0
+        self.stop_periods()
+        self.save_snapshot()
         
         # Actualizar la interfaz
         self.view.set_match_controls_enabled(True, False)
         self.view.update_match_status(self.view.tr("No match in progress"))
         self.view.add_log_entry(match.events[-1])
+        self.log_match_report(match)
+        self.show_next_fixture()
         
         self.view.show_message(
             self.view.tr("Match Ended"),
@@ -138,20 +219,19 @@ class TournamentController:
         
         # Finalizar el partido
         self.tournament_model.end_current_match()
-        
-        # Resetear variables de descanso
-        self.break_done = False
-        self.half_time = 0
-        self.match_duration = 0
+        logger.info("Partido terminado", extra=self._match_state(match))
+        self.stop_periods()
         
         # Cambiar el reloj de vuelta a modo reloj
         self.clock_controller.set_mode(ClockMode.CLOCK)
+        self.save_snapshot()
         
         # Actualizar la interfaz
         self.view.set_match_controls_enabled(True, False)
         
         # Añadir al log
         self.view.add_log_entry(match.events[-1])
+        self.log_match_report(match)
         
         # Mostrar mensaje
         self.view.show_message(
@@ -162,14 +242,349 @@ class TournamentController:
         self.view.update_match_status(
             self.view.tr(f"Match finished: {match.get_match_info()}")
         )
+        self.show_next_fixture()
+    
+    def match_clock_seconds(self) -> int:
+        """Tiempo de juego transcurrido según el plan de periodos"""
+        if self.period_machine is None:
+            return 0
+        return int(self.period_machine.play_elapsed(self.time_source.time()))
+    
+    # Plan de periodos
+    def set_period_plan(self, plan):
+        """
+        Plan de los próximos partidos: un PeriodPlan, una especificación
+        declarativa (ver PeriodPlan.from_spec), el nombre de un plan de
+        PRESETS o None para dos partes con la duración del formulario
+        """
+        if isinstance(plan, str):
+            plan = PeriodPlan.from_spec(PRESETS[plan], plan)
+        elif isinstance(plan, dict):
+            plan = PeriodPlan.from_spec(plan)
+        self.period_plan = plan
+    
+    def arm_phase_timer(self):
+        """Programa el temporizador hasta el final exacto de la fase actual"""
+        self.phase_timer.stop()
+        if self.period_machine is None:
+            return
+        deadline = self.period_machine.deadline()
+        if deadline is not None:
+            self.phase_timer.start(max(0, int(math.ceil((deadline - self.time_source.time()) * 1000))))
+    
+    def shutdown(self):
+        """
+        Desmonta el controlador al cerrar su ventana: guarda el estado,
+        detiene temporizadores, hilos y el proceso de calendarios, y suelta
+        las conexiones con la aplicación, los trabajadores y el reloj.
+        Un partido en curso se reanuda desde la instantánea al volver a abrir.
+        """
+        if self.broadcast is not None:
+            self.broadcast.remove("match")
+            self.broadcast = None
+        
+        for timer in (self.snapshot_timer, self.phase_timer):
+            timer.stop()
+            timer.deleteLater()
+        self.save_snapshot()
+        
+        if self.app is not None:
+            self.app.aboutToQuit.disconnect(self.fixture_worker.shutdown)
+            self.app.aboutToQuit.disconnect(self.snapshot_writer.stop)
+        self.snapshot_writer.stop()
+        self.fixture_worker.shutdown()
+        
+        # Una exportación o importación en curso termina en su hilo, pero ya
+        # no avisa a esta ventana
+        for signal in (self.fixture_worker.fixturesReady, self.fixture_worker.fixturesFailed,
+                       self.export_worker.exportProgress, self.export_worker.exportFinished,
+                       self.export_worker.exportFailed, self.import_worker.importProgress,
+                       self.import_worker.importFinished, self.import_worker.importFailed):
+            signal.disconnect()
+        
+        self.clock_controller.pausedChanged.disconnect(self.on_clock_paused)
+        self.clock_controller.shutdown()
     
-    def on_time_updated(self, time_str: str):
-        """Se llama cada vez que se actualiza el tiempo"""
-        if self.clock_controller.model.mode == ClockMode.TIMER and not self.break_done:
-            remaining = self.parse_time(time_str)
-            if remaining <= self.half_time:
-                self.break_done = True
-                self.pause_for_break()
+    def stop_periods(self):
+        self.phase_timer.stop()
+        self.period_machine = None
+    
+    def _match_state(self, match):
+        """Datos de un partido para el registro"""
+        return {'match_id': match.match_id, 'team1': match.team1, 'team2': match.team2,
+                'score1': match.score1, 'score2': match.score2}
+    
+    def is_tied(self) -> bool:
+        match = self.tournament_model.current_match
+        return match is not None and match.score1 == match.score2
+    
+    def on_phase_timer(self):
+        """Fin de una fase: aplica las transiciones y programa la siguiente"""
+        machine = self.period_machine
+        if machine is None or not self.tournament_model.has_active_match():
+            return
+        now = self.time_source.time()
+        transitions = machine.advance(now, self.is_tied())
+        if not transitions:
+            # El temporizador se adelantó al plazo
+            self.arm_phase_timer()
+            return
+        
+        match = self.tournament_model.current_match
+        for ended, started in transitions:
+            logger.info("Cambio de fase", extra={
+                'match_id': match.match_id,
+                'ended': ended.name,
+                'started': started.name if started is not None else None,
+            })
+            for text in self.phase_events(ended, started):
+                match.add_event(text)
+                self.view.add_log_entry(match.events[-1])
+        
+        if machine.finished:
+            self.on_match_time_finished()
+            return
+        self.show_phase(now)
+        self.arm_phase_timer()
+        self.save_snapshot()
+    
+    def phase_events(self, ended, started):
+        """Textos del registro para una transición entre fases"""
+        if started is None:
+            return []
+        if started.kind == BREAK:
+            if started is self.period_machine.plan.half_time():
+                return [self.view.tr("⏸️ Half-time break")]
+            return [self.view.tr("⏸️ Break: {name}").format(name=started.name)]
+        if started.kind == PENALTIES:
+            return [self.view.tr("🥅 Penalty shoot-out")]
+        return [self.view.tr("▶️ {name} started").format(name=started.name)]
+    
+    def show_phase(self, now: float):
+        """Pone el reloj en la cuenta atrás de la fase actual"""
+        machine = self.period_machine
+        phase = machine.phase
+        self.clock_controller.set_mode(ClockMode.TIMER)
+        self.clock_controller.set_timer_mode(TimerMode.REGRESSIVE)
+        if phase.kind == PENALTIES:
+            # Fase final sin tiempo: el partido se cierra a mano
+            self.clock_controller.set_timer_duration(0)
+            self.clock_controller.on_reset()
+            self.view.show_notification(self.view.tr("Penalties"))
+            return
+        
+        self.clock_controller.set_timer_duration(int(math.ceil(machine.remaining(now))))
+        self.clock_controller.on_reset()
+        self.clock_controller.on_start()
+        if machine.paused:
+            self.clock_controller.on_pause()
+        if phase.kind == BREAK:
+            self.view.show_notification(self.view.tr("Descanso"))
+        self.clock_widget.update_status(self.view.tr(phase.name))
+    
+    def add_stoppage(self, seconds: int):
+        """Añade tiempo al periodo en juego"""
+        machine = self.period_machine
+        try:
+            machine.add_stoppage(seconds)
+        except (AttributeError, ValueError):
+            logger.debug("Añadido no aplicado", extra={'seconds': seconds})
+            return
+        now = self.time_source.time()
+        match = self.tournament_model.current_match
+        logger.info("Tiempo añadido", extra={'match_id': match.match_id, 'seconds': seconds})
+        match.add_event(self.view.tr(f"+{seconds // 60}' added time"))
+        self.view.add_log_entry(match.events[-1])
+        self.show_phase(now)
+        self.arm_phase_timer()
+        self.save_snapshot()
+    
+    def on_clock_paused(self, paused: bool):
+        """El reloj del partido se pausó o reanudó desde sus botones"""
+        machine = self.period_machine
+        if machine is None or not machine.started or machine.finished:
+            return
+        now = self.time_source.time()
+        logger.info("Partido en pausa" if paused else "Partido reanudado",
+                    extra={'phase': machine.phase.name, 'remaining': machine.remaining(now)})
+        if paused:
+            machine.pause(now)
+        else:
+            machine.resume(now)
+            # La pausa no dura segundos enteros: realinear la cuenta atrás con el plan
+            self.show_phase(now)
+        self.arm_phase_timer()
+        self.save_snapshot()
+    
+    def on_last_minute(self, seconds: int):
+        """Queda un minuto de la fase en juego"""
+        machine = self.period_machine
+        if machine is not None and machine.phase is not None and machine.phase.kind == PLAY:
+            self.view.show_notification(self.view.tr("Last minute"))
+    
+    def on_goal(self, side: int):
+        """Gol del equipo 1 o 2 del partido en curso (en la tanda, penalti marcado)"""
+        if self.period_machine is not None and self.period_machine.in_penalties:
+            self.record_match_event(MatchEventType.SHOOTOUT, side)
+        else:
+            self.record_match_event(MatchEventType.GOAL, side)
+    
+    def on_card(self, side: int):
+        """Tarjeta para el equipo 1 o 2 del partido en curso"""
+        self.record_match_event(MatchEventType.CARD, side)
+    
+    def record_match_event(self, event_type: MatchEventType, side: int, detail: str = None):
+        """Registra un evento tipado en el minuto actual del partido"""
+        if not self.tournament_model.has_active_match():
+            return
+        
+        match = self.tournament_model.current_match
+        team = match.team1 if side == 1 else match.team2
+        player = self.view.get_player_name() or None
+        try:
+            self.tournament_model.record_match_event(
+                event_type, team, player, self.match_clock_seconds(), detail
+            )
+        except ValueError as e:
+            logger.warning("Evento del partido rechazado",
+                           extra={'event': event_type.name.lower(), 'team': team, 'error': str(e)})
+            self.view.show_error(self.view.tr("Error"), str(e))
+            return
+        
+        logger.info("Evento del partido", extra={
+            'match_id': match.match_id, 'event': event_type.name.lower(), 'team': team,
+            'score1': match.score1, 'score2': match.score2,
+        })
+        self.view.add_log_entry(match.events[-1])
+        self.view.update_match_status(
+            self.view.tr(f"Match in progress: {match.get_score_info()}")
+        )
+        self.view.update_match_stats(match.get_stats())
+        self.save_snapshot()
+    
+    def log_match_report(self, match):
+        """Añade al log el informe final del partido"""
+        for line in match.get_report():
+            self.view.add_log_entry(line)
+    
+    def generate_fixtures(self, teams, format: str = "round_robin", **options):
+        """Genera el calendario del torneo en un proceso aparte"""
+        try:
+            self.fixture_worker.submit(teams, format, **options)
+        except ValueError as e:
+            logger.warning("Calendario no solicitado", extra={'format': format, 'error': str(e)})
+            self.view.show_error(self.view.tr("Error"), str(e))
+            return
+        self.view.show_notification(self.view.tr("Generating fixtures..."))
+    
+    def on_fixtures_ready(self, result: dict):
+        """Carga el calendario generado"""
+        try:
+            fixtures = self.tournament_model.load_fixtures(result)
+        except ValueError as e:
+            self.view.show_error(self.view.tr("Error"), str(e))
+            return
+        logger.info("Calendario cargado", extra={'fixtures': len(fixtures)})
+        self.view.show_notification(self.view.tr(f"{len(fixtures)} fixtures generated"))
+        if not self.tournament_model.has_active_match():
+            self.show_next_fixture()
+    
+    def on_fixtures_failed(self, message: str):
+        """Informa de un error al generar el calendario"""
+        logger.error("Calendario no generado", extra={'error': message})
+        self.view.show_error(self.view.tr("Error"), message)
+    
+    def export_history(self, path: str, format: str = "csv", table: str = "matches"):
+        """Exporta el historial de partidos (o sus eventos) en un hilo aparte"""
+        try:
+            self.export_worker.submit(self.tournament_model.match_history, path, format, table)
+        except ValueError as e:
+            self.view.show_error(self.view.tr("Error"), str(e))
+    
+    def on_export_progress(self, rows: int):
+        """Muestra las filas exportadas hasta ahora"""
+        self.view.show_notification(self.view.tr(f"Exporting... {rows} rows"))
+    
+    def on_export_finished(self, path: str, rows: int):
+        """Informa del fin de la exportación"""
+        logger.info("Historial exportado", extra={'path': path, 'rows': rows})
+        self.view.show_notification(self.view.tr(f"{rows} rows exported to {path}"))
+    
+    def on_export_failed(self, message: str):
+        """Informa de un error al exportar"""
+        logger.error("Exportación fallida", extra={'error': message})
+        self.view.show_error(self.view.tr("Error"), message)
+    
+    def import_file(self, path: str):
+        """Lee y valida un fichero de equipos, jugadores o calendario en un hilo aparte"""
+        try:
+            self.import_worker.submit(path, self.tournament_model.team_names())
+        except ValueError as e:
+            self.view.show_error(self.view.tr("Error"), str(e))
+    
+    def on_import_progress(self, rows: int):
+        """Muestra las filas leídas hasta ahora"""
+        self.view.show_notification(self.view.tr(f"Importing... {rows} rows"))
+    
+    def on_import_finished(self, result):
+        """Aplica la importación validada en una sola transacción"""
+        if not result.ok:
+            logger.warning("Importación con errores", extra={'errors': len(result.errors)})
+            shown = "\n".join(str(issue) for issue in result.errors[:10])
+            if len(result.errors) > 10 or result.truncated:
+                shown += "\n..."
+            self.view.show_error(self.view.tr("Error"), shown)
+            return
+        
+        try:
+            self.tournament_model.import_roster(
+                result.teams, result.players, result.fixtures_result()
+            )
+        except ValueError as e:
+            self.view.show_error(self.view.tr("Error"), str(e))
+            return
+        
+        logger.info("Importación aplicada", extra={
+            'rows': result.rows, 'teams': len(result.teams), 'players': len(result.players),
+            'elapsed': result.elapsed,
+        })
+        self.view.set_team_suggestions(self.tournament_model.team_names())
+        self.view.show_notification(self.view.tr(
+            f"{result.rows} rows imported in {result.elapsed:.2f} s "
+            f"({result.rows_per_second:.0f} rows/s)"
+        ))
+        if result.fixtures and not self.tournament_model.has_active_match():
+            self.show_next_fixture()
+    
+    def on_import_failed(self, message: str):
+        """Informa de un error al leer el fichero"""
+        logger.error("Importación fallida", extra={'error': message})
+        self.view.show_error(self.view.tr("Error"), message)
+    
+    def show_next_fixture(self):
+        """Rellena los equipos con el siguiente partido del calendario"""
+        # Al terminar los grupos, las plazas de la eliminatoria pasan a ser equipos
+        resolved = self.tournament_model.resolve_knockout_seeds()
+        if resolved:
+            logger.info("Eliminatoria resuelta", extra={'fixtures': len(resolved)})
+        # Terminada una ronda de eliminatoria, sus ganadores pasan a la siguiente
+        info = self.tournament_model.fixture_info
+        if (info.get('seeds_resolved') and self.tournament_model.next_fixture() is None
+                and not self.tournament_model.has_active_match()):
+            try:
+                fixtures = self.tournament_model.next_knockout_round()
+            except ValueError as e:
+                logger.warning("Ronda de eliminatoria no emparejada", extra={'error': str(e)})
+                self.view.show_error(self.view.tr("Error"), str(e))
+            else:
+                if fixtures:
+                    logger.info("Ronda de eliminatoria", extra={
+                        'round': fixtures[0].round, 'stage': fixtures[0].stage,
+                        'fixtures': len(fixtures),
+                    })
+        fixture = self.tournament_model.next_fixture()
+        if fixture is not None:
+            self.view.set_match_teams(fixture.team1, fixture.team2)
     
     def change_language(self, language: str):
         """Cambia el idioma de la aplicación"""
@@ -186,38 +601,83 @@ class TournamentController:
         self.view.retranslateUi(self.current_language)
         self.clock_widget.retranslateUi(self.current_language)
     
-    def parse_time(self, time_str: str) -> int:
-        """Convierte una cadena de tiempo MM:SS o HH:MM:SS a segundos"""
-        parts = time_str.split(':')
-        if len(parts) == 2:
-            m, s = map(int, parts)
-            return m * 60 + s
-        elif len(parts) == 3:
-            h, m, s = map(int, parts)
-            return h * 3600 + m * 60 + s
-        return 0
-    
-    def pause_for_break(self):
-        """Pausa el partido para el descanso"""
-        self.clock_controller.on_pause()
-        self.view.show_notification(self.view.tr("Descanso"))
-        
-        # Añadir al log
+    def on_snapshot_timer(self):
+        """Guarda periódicamente mientras haya un partido en juego"""
         if self.tournament_model.has_active_match():
-            match = self.tournament_model.current_match
-            match.add_event(self.view.tr("⏸️ Half-time break"))
-            self.view.add_log_entry(match.events[-1])
-        
-        from PySide6.QtCore import QTimer
-        QTimer.singleShot(5000, self.resume_match)
+            self.save_snapshot()
+    
+    def save_snapshot(self):
+        """Entrega el estado actual al escritor de instantáneas y a las pantallas"""
+        match = self.tournament_model.current_match
+        active = self.tournament_model.has_active_match()
+        self.snapshot_writer.submit({
+            'match': match.to_dict() if active else None,
+            'clock': self.clock_model.to_snapshot(self.time_source.time()),
+            'periods': self.period_machine.to_dict() if active and self.period_machine else None,
+        })
+        if self.broadcast is not None:
+            self.publish_match()
     
-    def resume_match(self):
-        """Reanuda el partido después del descanso"""
-        self.clock_controller.on_pause()  # Resume
-        self.view.show_notification(self.view.tr("Second half started"))
+    def set_broadcast(self, server):
+        """Publica el reloj y el partido en un BroadcastServer"""
+        self.broadcast = server
+        self.clock_controller.set_broadcast(server, "match_clock")
+        if server is not None:
+            self.publish_match()
+    
+    def publish_match(self):
+        """Envía el marcador del partido actual al servidor de difusión"""
+        match = self.tournament_model.current_match
+        if match is None:
+            self.broadcast.publish("match", {'in_progress': False})
+            return
+        self.broadcast.publish("match", {
+            'match_id': match.match_id,
+            'team1': match.team1,
+            'team2': match.team2,
+            'score1': match.score1,
+            'score2': match.score2,
+            'in_progress': match.in_progress,
+            'on_break': self.period_machine is not None and self.period_machine.on_break,
+            'events': len(match.timeline),
+        })
+    
+    def restore_snapshot(self):
+        """Reanuda el partido guardado donde indica el tiempo real"""
+        state = load_snapshot(self.SNAPSHOT_KEY)
+        # Las instantáneas sin plan de periodos son de una versión anterior
+        if not state or not state.get('match') or not state.get('periods'):
+            return
         
-        # Añadir al log
-        if self.tournament_model.has_active_match():
-            match = self.tournament_model.current_match
-            match.add_event(self.view.tr("▶️ Second half started"))
-            self.view.add_log_entry(match.events[-1])
+        now = self.time_source.time()
+        match = self.tournament_model.restore_current_match(state['match'])
+        self.clock_model.restore_snapshot(state['clock'], now)
+        self.period_machine = PeriodStateMachine.from_dict(state['periods'])
+        
+        # Transiciones que ocurrieron con la aplicación cerrada, cada una en
+        # su instante exacto
+        transitions = self.period_machine.advance(now, self.is_tied())
+        for ended, started in transitions:
+            for text in self.phase_events(ended, started):
+                match.add_event(text)
+        logger.info("Partido restaurado", extra={
+            'match_id': match.match_id, 'missed_transitions': len(transitions),
+            'finished': self.period_machine.finished,
+        })
+        
+        # Actualizar la interfaz
+        self.view.set_match_controls_enabled(False, True)
+        self.view.update_match_status(
+            self.view.tr(f"Match in progress: {match.get_match_info()}")
+        )
+        self.view.clear_log()
+        for event in match.events:
+            self.view.add_log_entry(event)
+        
+        if self.period_machine.finished:
+            self.on_match_time_finished()
+            return
+        
+        self.show_phase(now)
+        self.arm_phase_timer()
+        self.save_snapshot()
@@ -0,0 +1,148 @@
+"""
+Reserva de ventanas de torneo preparadas
+Tras mostrar la ventana principal, en los huecos libres del bucle de
+eventos se importan los módulos del torneo y se construyen ventanas ocultas
+(con su .ui ya cargado y su reloj insertado). Abrir el modo Fútbol solo
+tiene que tomar una de la reserva; cada ventana se usa una sola vez y la
+reserva se rellena en el siguiente hueco libre.
+"""
+import logging
+import time
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZE = 1
+
+
+def prewarm_size_from_args(argv):
+    """
+    Tamaño de la reserva indicado con --prewarm=N (0 la desactiva);
+    DEFAULT_SIZE si no se indica
+    """
+    for arg in argv:
+        if arg == "--no-prewarm":
+            return 0
+        if arg.startswith("--prewarm="):
+            return max(0, int(arg.split("=", 1)[1]))
+    return DEFAULT_SIZE
+
+
+class TournamentWindowPool(QObject):
+    """
+    Ventanas de torneo construidas por adelantado.
+    Cada paso de preparación hace una sola cosa (importar o construir una
+    ventana) para no bloquear la interfaz más que una construcción normal.
+    """
+    
+    # Milisegundos ahorrados al servir una ventana desde la reserva
+    latencySaved = Signal(float)
+    
+    # Espera tras mostrar la ventana principal antes de empezar a preparar
+    START_DELAY_MS = 500
+    
+    def __init__(self, size: int = DEFAULT_SIZE, parent=None):
+        super().__init__(parent)
+        self.size = size
+        self._ready = []            # (ventana, reloj, ms que costó construirla)
+        self._imported = False
+        
+        # Estadísticas
+        self.hits = 0
+        self.misses = 0
+        self.saved_ms = 0.0
+        self.build_ms = None        # Última construcción medida
+        
+        # Un temporizador de intervalo 0 se ejecuta cuando el bucle queda libre
+        self._idle_timer = QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.timeout.connect(self._prewarm_step)
+    
+    @property
+    def enabled(self):
+        return self.size > 0
+    
+    def __len__(self):
+        return len(self._ready)
+    
+    def start(self):
+        """Empieza a preparar (llamar después de mostrar la ventana principal)"""
+        if self.enabled:
+            self._idle_timer.start(self.START_DELAY_MS)
+    
+    def set_size(self, size: int):
+        """Cambia el tamaño de la reserva (0 la desactiva y libera las ventanas)"""
+        self.size = max(0, size)
+        while len(self._ready) > self.size:
+            window, _, _ = self._ready.pop()
+            window.deleteLater()
+        self._schedule()
+    
+    def _schedule(self):
+        if self.enabled and len(self._ready) < self.size and not self._idle_timer.isActive():
+            self._idle_timer.start(0)
+    
+    def _prewarm_step(self):
+        if not self.enabled:
+            return
+        if not self._imported:
+            self._import_modules()
+        elif len(self._ready) < self.size:
+            start = time.perf_counter()
+            window, clock_widget = self._build()
+            self.build_ms = (time.perf_counter() - start) * 1000
+            self._ready.append((window, clock_widget, self.build_ms))
+        self._schedule()
+    
+    def _import_modules(self):
+        started = time.perf_counter()
+        import views.tournament_window
+        import controllers.tournament_controller
+        self._imported = True
+        logger.debug("Módulos del torneo importados en %.1f ms",
+                     (time.perf_counter() - started) * 1000)
+    
+    @staticmethod
+    def _build():
+        """Ventana de torneo oculta con su reloj insertado"""
+        from views.tournament_window import TournamentWindow
+        from views.digital_clock_widget import DigitalClockWidget
+        
+        window = TournamentWindow()
+        clock_widget = DigitalClockWidget()
+        window.add_clock_widget(clock_widget)
+        return window, clock_widget
+    
+    def acquire(self):
+        """
+        Devuelve (ventana, reloj) sin mostrar. Si la reserva está vacía la
+        construye en el momento. La reserva se rellena en el siguiente hueco.
+        """
+        started = time.perf_counter()
+        if self._ready:
+            window, clock_widget, build_ms = self._ready.pop(0)
+            self.hits += 1
+            saved = max(0.0, build_ms - (time.perf_counter() - started) * 1000)
+            self.saved_ms += saved
+            logger.info("Ventana de torneo servida desde la reserva: %.1f ms ahorrados", saved)
+            self.latencySaved.emit(saved)
+        else:
+            window, clock_widget = self._build()
+            self.build_ms = (time.perf_counter() - started) * 1000
+            self.misses += 1
+            logger.info("Ventana de torneo construida al abrir: %.1f ms", self.build_ms)
+        self._schedule()
+        return window, clock_widget
+    
+    def clear(self):
+        """Libera las ventanas preparadas"""
+        self._idle_timer.stop()
+        for window, _, _ in self._ready:
+            window.deleteLater()
+        self._ready = []
+    
+    def stats(self):
+        return {'size': self.size, 'ready': len(self._ready), 'hits': self.hits,
+                'misses': self.misses, 'saved_ms': self.saved_ms}
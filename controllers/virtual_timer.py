@@ -0,0 +1,66 @@
+"""
+Temporizadores sobre una fuente de tiempo
+create_timer da un QTimer normal con la fuente real y un VirtualTimer con
+una VirtualTimeSource. El VirtualTimer tiene la parte de la interfaz de
+QTimer que usan los relojes, pero se dispara cuando la fuente virtual
+avanza, no por el bucle de eventos.
+"""
+from PySide6.QtCore import QObject, QTimer, Signal
+
+
+class VirtualTimer(QObject):
+    """QTimer que se dispara al avanzar una VirtualTimeSource"""
+    
+    timeout = Signal()
+    
+    def __init__(self, source, parent=None):
+        super().__init__(parent)
+        self.source = source
+        self._interval = 0
+        self._single_shot = False
+        self._handle = None
+    
+    def setSingleShot(self, single_shot: bool):
+        self._single_shot = single_shot
+    
+    def isSingleShot(self):
+        return self._single_shot
+    
+    def setTimerType(self, timer_type):
+        """Sin efecto: el tiempo virtual es exacto"""
+    
+    def setInterval(self, msec: int):
+        # Como en QTimer, cambiar el intervalo de un temporizador activo lo reinicia
+        self._interval = int(msec)
+        if self._handle is not None:
+            self.start()
+    
+    def interval(self):
+        return self._interval
+    
+    def isActive(self):
+        return self._handle is not None
+    
+    def start(self, msec: int = None):
+        if msec is not None:
+            self._interval = int(msec)
+        self.stop()
+        self._handle = self.source.call_later(self._interval / 1000.0, self._fire)
+    
+    def stop(self):
+        if self._handle is not None:
+            self.source.cancel(self._handle)
+            self._handle = None
+    
+    def _fire(self):
+        self._handle = None
+        if not self._single_shot:
+            self._handle = self.source.call_later(self._interval / 1000.0, self._fire)
+        self.timeout.emit()
+
+
+def create_timer(source, parent=None):
+    """Temporizador de la fuente: VirtualTimer si es virtual, QTimer si no"""
+    if getattr(source, 'virtual', False):
+        return VirtualTimer(source, parent)
+    return QTimer(parent)
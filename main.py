@@ -8,9 +8,17 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QStandardPaths
+from controllers.gui_watchdog import GuiWatchdog
+from controllers.log_service import start_logging
+from controllers.clock_sync_service import start_clock_sync
+from controllers.broadcast_server import PublisherGroup, start_broadcast
+from controllers.shared_clock_memory import open_shared_memory
 from views.main_window import MainWindow
 from views.digital_clock_widget import DigitalClockWidget
 from controllers.main_controller import MainWindowController
+from models.profiles import ProfileStore, PROFILE_FILE
+from controllers.tournament_pool import TournamentWindowPool, prewarm_size_from_args
 
 
 def main():
@@ -21,22 +29,73 @@ def main():
     app.setOrganizationName("DigitalClock")
     app.setApplicationName("DigitalClockTest")
     
+    # Registro estructurado en segundo plano
+    # (--log-level=NIVEL, --log-file=RUTA, --log-sample=MÓDULO:TASA, --no-log)
+    log_service = start_logging(
+        sys.argv, QStandardPaths.writableLocation(QStandardPaths.AppLocalDataLocation)
+    )
+    
+    # Vigilante de bloqueos del hilo de la GUI
+    watchdog = GuiWatchdog()
+    watchdog.start()
+    
+    # Perfil activo, leído antes de construir las ventanas para que se abran
+    # ya con su configuración e idioma
+    profiles = ProfileStore.load(os.path.join(
+        QStandardPaths.writableLocation(QStandardPaths.AppConfigLocation), PROFILE_FILE
+    ))
+    profile = profiles.active_profile()
+    
     # Crear la ventana principal
-    main_window = MainWindow()
+    main_window = MainWindow(profile.config, profile.language)
     
     # Crear el widget del reloj
-    clock_widget = DigitalClockWidget()
+    clock_widget = DigitalClockWidget(language=profile.language)
     
     # Añadir el reloj a la ventana
     main_window.add_clock_widget(clock_widget)
     
     # Crear el controlador
-    controller = MainWindowController(main_window, clock_widget, app)
+    controller = MainWindowController(main_window, clock_widget, app, profiles)
+    
+    # Difusión del marcador a pantallas locales (--broadcast[=PUERTO]); con el
+    # puerto ocupado se avisa y se sigue sin difusión
+    broadcast, broadcast_error = start_broadcast(sys.argv)
+    if broadcast_error is not None:
+        main_window.show_notification(f"{main_window.tr('Broadcast disabled')}: {broadcast_error}")
+    
+    # Estado del reloj para pantallas en otros procesos (--shared-memory[=NOMBRE]);
+    # si otro proceso vivo ya escribe en ese bloque se avisa y se sigue sin él
+    shared, shared_error = open_shared_memory(sys.argv)
+    if shared_error is not None:
+        main_window.show_notification(f"{main_window.tr('Shared memory disabled')}: {shared_error}")
+    
+    if broadcast is not None or shared is not None:
+        controller.set_broadcast(PublisherGroup([broadcast, shared]))
+    
+    # Sincronización con otros nodos (--sync-primary[=PUERTO] / --sync-follow=HOST[:PUERTO])
+    sync_services = start_clock_sync(sys.argv, controller.clock_controller)
+    
+    # Ventanas de torneo preparadas en segundo plano (--prewarm=N, --no-prewarm)
+    tournament_pool = TournamentWindowPool(prewarm_size_from_args(sys.argv))
+    controller.set_tournament_pool(tournament_pool)
     
     # Mostrar la ventana
     main_window.show()
+    # La preparación empieza cuando la ventana principal ya está pintada
+    tournament_pool.start()
     
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    watchdog.stop()
+    for service in sync_services:
+        service.stop()
+    if broadcast is not None:
+        broadcast.stop()
+    if shared is not None:
+        shared.close()
+    if log_service is not None:
+        log_service.stop()
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
@@ -8,6 +8,12 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QStandardPaths
+from controllers.gui_watchdog import GuiWatchdog
+from controllers.log_service import start_logging
+from controllers.clock_sync_service import start_clock_sync
+from controllers.broadcast_server import PublisherGroup, start_broadcast
+from controllers.shared_clock_memory import open_shared_memory
 from views.tournament_window import TournamentWindow
 from views.digital_clock_widget import DigitalClockWidget
 from controllers.tournament_controller import TournamentController
@@ -21,6 +27,16 @@ def main():
     app.setOrganizationName("TournamentManager")
     app.setApplicationName("FootballTournament")
     
+    # Registro estructurado en segundo plano
+    # (--log-level=NIVEL, --log-file=RUTA, --log-sample=MÓDULO:TASA, --no-log)
+    log_service = start_logging(
+        sys.argv, QStandardPaths.writableLocation(QStandardPaths.AppLocalDataLocation)
+    )
+    
+    # Vigilante de bloqueos del hilo de la GUI
+    watchdog = GuiWatchdog()
+    watchdog.start()
+    
     # Crear la ventana principal
     tournament_window = TournamentWindow()
     
@@ -33,10 +49,38 @@ def main():
     # Crear el controlador
     controller = TournamentController(tournament_window, clock_widget, app)
     
+    # Difusión del marcador a pantallas locales (--broadcast[=PUERTO]); con el
+    # puerto ocupado se avisa y se sigue sin difusión
+    broadcast, broadcast_error = start_broadcast(sys.argv)
+    if broadcast_error is not None:
+        tournament_window.show_notification(f"{tournament_window.tr('Broadcast disabled')}: {broadcast_error}")
+    
+    # Estado de los relojes para pantallas en otros procesos (--shared-memory[=NOMBRE]);
+    # si otro proceso vivo ya escribe en ese bloque se avisa y se sigue sin él
+    shared, shared_error = open_shared_memory(sys.argv)
+    if shared_error is not None:
+        tournament_window.show_notification(f"{tournament_window.tr('Shared memory disabled')}: {shared_error}")
+    
+    if broadcast is not None or shared is not None:
+        controller.set_broadcast(PublisherGroup([broadcast, shared]))
+    
+    # Sincronización con otros nodos (--sync-primary[=PUERTO] / --sync-follow=HOST[:PUERTO])
+    sync_services = start_clock_sync(sys.argv, controller.clock_controller)
+    
     # Mostrar la ventana
     tournament_window.show()
     
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    watchdog.stop()
+    for service in sync_services:
+        service.stop()
+    if broadcast is not None:
+        broadcast.stop()
+    if shared is not None:
+        shared.close()
+    if log_service is not None:
+        log_service.stop()
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
@@ -3,5 +3,26 @@ Models module
 """
 from .clock_model import ClockModel, ClockMode, TimerMode
 from .tournament_model import TournamentModel, Match
+from .tournament_events import TournamentEvent
+from .fixtures import Fixture, generate_fixtures
+from .standings import StandingsTable, TeamRecord
+from .match_events import MatchEvent, MatchEventType, MatchEventIndex
+from .exporter import export_history, read_columnar
+from .importer import import_file, ImportResult, ImportIssue
+from .clock_sync import ClockSyncEstimator, SyncSample
+from .recurrence import RecurrenceRule, RecurrenceError, compile_rule
+from .world_clock import WorldClock, ZoneClock
+from .laps import LapRecorder, LapStats
+from .period_plan import PeriodPlan, PeriodStateMachine, Phase
+from .clock_config import ClockConfig, WindowMode
+from .profiles import Profile, ProfileStore
+from .time_source import TimeSource, RealTimeSource, VirtualTimeSource
 
-__all__ = ['ClockModel', 'ClockMode', 'TimerMode', 'TournamentModel', 'Match']
+__all__ = ['ClockModel', 'ClockMode', 'TimerMode', 'TournamentModel', 'Match', 'TournamentEvent',
+           'Fixture', 'generate_fixtures', 'StandingsTable', 'TeamRecord',
+           'MatchEvent', 'MatchEventType', 'MatchEventIndex', 'export_history', 'read_columnar',
+           'import_file', 'ImportResult', 'ImportIssue', 'ClockSyncEstimator', 'SyncSample',
+           'RecurrenceRule', 'RecurrenceError', 'compile_rule', 'WorldClock', 'ZoneClock',
+           'LapRecorder', 'LapStats', 'PeriodPlan', 'PeriodStateMachine', 'Phase',
+           'ClockConfig', 'WindowMode', 'Profile', 'ProfileStore',
+           'TimeSource', 'RealTimeSource', 'VirtualTimeSource']
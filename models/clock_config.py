@@ -0,0 +1,73 @@
+"""
+Configuración de la ventana del reloj
+Un valor inmutable con todos los campos del formulario. Al aplicar, el
+controlador compara con la última configuración aplicada y solo ejecuta
+los manejadores de los campos que cambiaron.
+"""
+from dataclasses import dataclass, field, fields, replace, asdict
+from enum import IntEnum
+
+
+class WindowMode(IntEnum):
+    """Modos del selector de la ventana principal (índice de comboMode)"""
+    CLOCK = 0
+    TIMER = 1
+    FOOTBALL = 2
+    CHRONOMETER = 3
+    WORLD = 4
+
+
+# Campos que se aplican juntos con set_alarm
+ALARM_FIELDS = frozenset(('alarm_enabled', 'alarm_hour', 'alarm_minute', 'alarm_message', 'alarm_rule'))
+
+
+@dataclass(frozen=True)
+class ClockConfig:
+    """Configuración del reloj tal como está en el formulario"""
+    mode: WindowMode = WindowMode.CLOCK
+    format_24h: bool = True
+    alarm_enabled: bool = False
+    alarm_hour: int = 0
+    alarm_minute: int = 0
+    alarm_message: str = ""
+    alarm_rule: str = ""
+    timer_duration: int = 60
+    world_zones: tuple = field(default=())
+    
+    def __post_init__(self):
+        # Normalizar para que dos formularios iguales den valores iguales
+        object.__setattr__(self, 'mode', WindowMode(self.mode))
+        object.__setattr__(self, 'alarm_rule', self.alarm_rule.strip())
+        object.__setattr__(self, 'world_zones',
+                           tuple(zone.strip() for zone in self.world_zones if zone.strip()))
+    
+    def diff(self, previous: "ClockConfig" = None):
+        """Nombres de los campos que cambian respecto a `previous` (todos si es None)"""
+        if previous is None:
+            return {item.name for item in fields(self)}
+        return {item.name for item in fields(self)
+                if getattr(self, item.name) != getattr(previous, item.name)}
+    
+    def merge(self, applied: "ClockConfig", names):
+        """
+        Configuración aplicada tras aplicar solo los campos `names` de esta
+        sobre `applied` (None si aún no se había aplicado nada)
+        """
+        if applied is None:
+            applied = ClockConfig()
+        return replace(applied, **{name: getattr(self, name) for name in names})
+    
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data['mode'] = int(self.mode)
+        data['world_zones'] = list(self.world_zones)
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "ClockConfig":
+        """Crea la configuración ignorando claves desconocidas"""
+        names = {item.name for item in fields(cls)}
+        values = {key: value for key, value in data.items() if key in names}
+        if 'world_zones' in values:
+            values['world_zones'] = tuple(values['world_zones'])
+        return cls(**values)
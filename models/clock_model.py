@@ -3,13 +3,15 @@ Modelo del Reloj Digital
 Define las enumeraciones y la lógica de datos del componente
 """
 from enum import Enum
-from datetime import datetime, time
+from models.world_clock import WorldClock
+from models.time_source import REAL_TIME, as_time_source
 
 
 class ClockMode(Enum):
     """Modo de funcionamiento del reloj"""
     CLOCK = "clock"
     TIMER = "timer"
+    WORLD = "world"      # Reloj con varias zonas horarias
 
 
 class TimerMode(Enum):
@@ -33,7 +35,8 @@ class ClockModel:
         self._alarm_hour = 0
         self._alarm_minute = 0
         self._alarm_message = "Mensaje para la alarma!!"
-        self._alarm_triggered = False
+        # Regla de repetición (cron o RRULE); vacía = todos los días a la hora indicada
+        self._alarm_rule = ""
         
         # Configuración de temporizador
         self._timer_mode = TimerMode.REGRESSIVE
@@ -42,6 +45,36 @@ class ClockModel:
         self._timer_running = False
         self._timer_paused = False
         
+        # Fuente del tiempo (hora de pared y monótono); un seguidor sincronizado
+        # usa la hora del nodo principal y las simulaciones una fuente virtual
+        self._time_source = REAL_TIME
+        
+        # Zonas del modo reloj mundial
+        self.world_clock = WorldClock()
+        
+    def set_time_source(self, time_source):
+        """
+        Cambia la fuente del tiempo: una TimeSource, una función de hora de
+        pared (segundos epoch) o None para volver al reloj del sistema
+        """
+        self._time_source = as_time_source(time_source)
+    
+    # Compatibilidad: antes solo se podía cambiar la función de hora de pared
+    set_time_function = set_time_source
+    
+    @property
+    def time_source(self):
+        return self._time_source
+    
+    @property
+    def time_function(self):
+        """Fuente de la hora de pared (segundos epoch)"""
+        return self._time_source.time
+    
+    def now(self):
+        """Hora de pared según la fuente configurada"""
+        return self._time_source.now()
+    
     # Propiedades de modo
     @property
     def mode(self):
@@ -53,6 +86,17 @@ class ClockModel:
             self._mode = value
             self.reset_timer()
     
+    @property
+    def is_wall_clock(self):
+        """True en los modos que muestran la hora de pared"""
+        return self._mode in (ClockMode.CLOCK, ClockMode.WORLD)
+    
+    @property
+    def is_chronometer(self):
+        """True en el cronómetro: temporizador progresivo sin límite"""
+        return (self._mode == ClockMode.TIMER and self._timer_mode == TimerMode.PROGRESSIVE
+                and self._timer_duration == 0)
+    
     # Propiedades de formato
     @property
     def format_24h(self):
@@ -70,8 +114,6 @@ class ClockModel:
     @alarm_enabled.setter
     def alarm_enabled(self, value: bool):
         self._alarm_enabled = value
-        if value:
-            self._alarm_triggered = False
     
     @property
     def alarm_hour(self):
@@ -81,7 +123,6 @@ class ClockModel:
     def alarm_hour(self, value: int):
         if 0 <= value <= 23:
             self._alarm_hour = value
-            self._alarm_triggered = False
     
     @property
     def alarm_minute(self):
@@ -91,7 +132,6 @@ class ClockModel:
     def alarm_minute(self, value: int):
         if 0 <= value <= 59:
             self._alarm_minute = value
-            self._alarm_triggered = False
     
     @property
     def alarm_message(self):
@@ -102,12 +142,12 @@ class ClockModel:
         self._alarm_message = value
     
     @property
-    def alarm_triggered(self):
-        return self._alarm_triggered
+    def alarm_rule(self):
+        return self._alarm_rule
     
-    def mark_alarm_as_triggered(self):
-        """Marca la alarma como disparada para evitar repeticiones"""
-        self._alarm_triggered = True
+    @alarm_rule.setter
+    def alarm_rule(self, value: str):
+        self._alarm_rule = (value or "").strip()
     
     # Propiedades de temporizador
     @property
@@ -190,25 +230,72 @@ class ClockModel:
         
         return False
     
-    def check_alarm(self):
-        """Verifica si debe dispararse la alarma"""
-        if not self._alarm_enabled or self._alarm_triggered:
+    # Instantáneas
+    def to_snapshot(self, now: float) -> dict:
+        """
+        Obtiene el estado del reloj anclado a la hora de pared `now`
+        (segundos epoch), no al número de ticks transcurridos
+        """
+        return {
+            'mode': self._mode.value,
+            'format_24h': self._format_24h,
+            'alarm_enabled': self._alarm_enabled,
+            'alarm_hour': self._alarm_hour,
+            'alarm_minute': self._alarm_minute,
+            'alarm_message': self._alarm_message,
+            'alarm_rule': self._alarm_rule,
+            'world_zones': self.world_clock.zone_names(),
+            'timer_mode': self._timer_mode.value,
+            'timer_duration': self._timer_duration,
+            'timer_value': self._timer_current,
+            'timer_running': self._timer_running,
+            'timer_paused': self._timer_paused,
+            'anchor': now,
+        }
+    
+    def restore_snapshot(self, data: dict, now: float):
+        """
+        Restaura un estado guardado avanzando el temporizador el tiempo
+        real transcurrido desde el ancla.
+        Devuelve True si un temporizador regresivo terminó mientras tanto.
+        """
+        self._mode = ClockMode(data['mode'])
+        self._format_24h = data['format_24h']
+        self._alarm_enabled = data['alarm_enabled']
+        self._alarm_hour = data['alarm_hour']
+        self._alarm_minute = data['alarm_minute']
+        self._alarm_message = data['alarm_message']
+        self._alarm_rule = data.get('alarm_rule', "")
+        self.world_clock.set_zones(data.get('world_zones', []))
+        self._timer_mode = TimerMode(data['timer_mode'])
+        self._timer_duration = data['timer_duration']
+        self._timer_current = data['timer_value']
+        self._timer_running = data['timer_running']
+        self._timer_paused = data['timer_paused']
+        
+        if not self._timer_running or self._timer_paused:
             return False
         
-        now = datetime.now()
-        if now.hour == self._alarm_hour and now.minute == self._alarm_minute:
-            return True
+        elapsed = max(0, int(now - data['anchor']))
+        if self._timer_mode == TimerMode.PROGRESSIVE:
+            self._timer_current += elapsed
+            return False
         
-        return False
+        self._timer_current = max(0, self._timer_current - elapsed)
+        return self._timer_current == 0
     
     def get_current_time_string(self):
         """Obtiene la hora actual como string formateado"""
-        now = datetime.now()
+        now = self.now()
         if self._format_24h:
             return now.strftime("%H:%M:%S")
         else:
             return now.strftime("%I:%M:%S %p")
     
+    def get_world_time_lines(self):
+        """Hora de cada zona del reloj mundial, una línea por zona"""
+        return self.world_clock.lines(self._time_source.time(), self._format_24h)
+    
     def get_timer_string(self):
         """Obtiene el tiempo del temporizador como string formateado"""
         hours = self._timer_current // 3600
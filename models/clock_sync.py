@@ -0,0 +1,189 @@
+"""
+Estimación del desfase entre el reloj local y el de un nodo principal
+Cada intercambio petición/respuesta (estilo NTP) da cuatro marcas de
+tiempo que acotan el desfase por arriba (ida) y por abajo (vuelta); de una
+ráfaga se toma el centro de las cotas más estrechas, y con varias ráfagas
+se estima también la deriva (skew) del reloj local con la pendiente de
+Theil-Sen, que no se deja arrastrar por las ráfagas anómalas
+"""
+
+
+class SyncSample:
+    """
+    Intercambio con el principal:
+    t0 envío local, t1 recepción en el principal, t2 respuesta del principal,
+    t3 recepción local
+    """
+    
+    __slots__ = ('t0', 't1', 't2', 't3')
+    
+    def __init__(self, t0: float, t1: float, t2: float, t3: float):
+        self.t0 = t0
+        self.t1 = t1
+        self.t2 = t2
+        self.t3 = t3
+    
+    @property
+    def offset(self):
+        """Desfase del principal respecto al reloj local"""
+        return ((self.t1 - self.t0) + (self.t2 - self.t3)) / 2
+    
+    @property
+    def delay(self):
+        """Retardo de ida y vuelta sin el tiempo de proceso del principal"""
+        return (self.t3 - self.t0) - (self.t2 - self.t1)
+    
+    @property
+    def upper_bound(self):
+        """Cota superior del desfase: la ida no puede tardar menos de cero"""
+        return self.t1 - self.t0
+    
+    @property
+    def lower_bound(self):
+        """Cota inferior del desfase: la vuelta no puede tardar menos de cero"""
+        return self.t2 - self.t3
+    
+    @property
+    def midpoint(self):
+        """Instante local al que corresponde la medida"""
+        return (self.t0 + self.t3) / 2
+
+
+def _median(values):
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    if len(ordered) % 2:
+        return ordered[middle]
+    return (ordered[middle - 1] + ordered[middle]) / 2
+
+
+class ClockSyncEstimator:
+    """
+    Desfase y deriva del principal respecto al reloj local.
+    `primary_time(local)` traduce una hora local a la línea temporal del principal.
+    """
+    
+    # Una muestra se descarta si su retardo supera al mínimo de la ráfaga
+    # en más de este factor más el margen fijo
+    DELAY_FACTOR = 1.5
+    DELAY_MARGIN = 0.002
+    # Ráfagas que se conservan para estimar la deriva
+    HISTORY = 16
+    # Tiempo mínimo cubierto por el historial para estimar la deriva (s)
+    MIN_SKEW_SPAN = 30.0
+    # Ráfagas anómalas seguidas a partir de las que se reinicia la estimación
+    MAX_REJECTIONS = 3
+    # Deriva máxima admitida (un cuarzo normal está muy por debajo)
+    MAX_SKEW = 500e-6
+    
+    def __init__(self):
+        self.offset = 0.0       # Desfase en el instante de referencia
+        self.skew = 0.0         # Segundos de desfase que se acumulan por segundo local
+        self.skew_error = None  # Error típico estimado de la deriva (None sin estimación)
+        self.reference = 0.0    # Instante local de referencia
+        self.delay = None       # Retardo de la mejor muestra de la última ráfaga
+        self.synchronized = False
+        self.rejected_bursts = 0
+        self._consecutive_rejections = 0
+        self._history = []      # (instante local, desfase) de cada ráfaga aceptada
+    
+    def add_burst(self, samples):
+        """
+        Incorpora una ráfaga de intercambios.
+        Devuelve False si no tenía muestras útiles o era anómala.
+        """
+        samples = [sample for sample in samples if sample.delay >= 0]
+        if not samples:
+            return False
+        
+        # Filtrar por retardo: las colas y reintentos inflan el retardo y sesgan el desfase
+        best_delay = min(sample.delay for sample in samples)
+        limit = best_delay * self.DELAY_FACTOR + self.DELAY_MARGIN
+        accepted = [sample for sample in samples if sample.delay <= limit]
+        # Cada sentido aporta su intercambio más rápido, aunque el otro sentido
+        # de ese intercambio se retrasara: el desfase queda entre ambas cotas
+        upper = min(sample.upper_bound for sample in samples)
+        lower = max(sample.lower_bound for sample in samples)
+        if lower <= upper:
+            offset = (lower + upper) / 2
+        else:
+            # Cotas incompatibles (el reloj saltó durante la ráfaga)
+            offset = _median([sample.offset for sample in accepted])
+        # Centro de la ráfaga
+        midpoint = _median([sample.midpoint for sample in samples])
+        
+        if self._is_outlier(midpoint, offset):
+            self.rejected_bursts += 1
+            self._consecutive_rejections += 1
+            if self._consecutive_rejections < self.MAX_REJECTIONS:
+                return False
+            # Varias ráfagas seguidas fuera de la recta: el reloj del principal
+            # saltó; se empieza de nuevo desde esta medida
+            self._history = []
+        self._consecutive_rejections = 0
+        
+        self.delay = best_delay
+        self._history.append((midpoint, offset))
+        del self._history[:-self.HISTORY]
+        self._fit()
+        self.synchronized = True
+        return True
+    
+    def _is_outlier(self, midpoint: float, offset: float):
+        """Una ráfaga que se aleja mucho de la recta estimada se descarta"""
+        if len(self._history) < 4:
+            return False
+        residuals = [abs(o - self.offset_at(t)) for t, o in self._history]
+        spread = max(_median(residuals) * 3, self.DELAY_MARGIN * 2)
+        return abs(offset - self.offset_at(midpoint)) > spread + (self.delay or 0) / 2
+    
+    def _fit(self):
+        """
+        Recta del desfase frente al tiempo local: pendiente de Theil-Sen
+        (mediana de las pendientes entre cada par de ráfagas) y desfase en la
+        última ráfaga como mediana de los desfases trasladados a ese instante
+        """
+        history = self._history
+        times = [t for t, _ in history]
+        offsets = [o for _, o in history]
+        self.reference = times[-1]
+        if times[-1] - times[0] < self.MIN_SKEW_SPAN:
+            self.skew = 0.0
+            self.skew_error = None
+            self.offset = _median(offsets[-3:])
+            return
+        
+        slopes = [
+            (history[j][1] - history[i][1]) / (history[j][0] - history[i][0])
+            for i in range(len(history)) for j in range(i + 1, len(history))
+            if history[j][0] > history[i][0]
+        ]
+        slope = _median(slopes)
+        self.skew = max(-self.MAX_SKEW, min(self.MAX_SKEW, slope))
+        self.offset = _median([o + self.skew * (self.reference - t) for t, o in history])
+        
+        # Error típico de la pendiente con una dispersión robusta de los residuos
+        mean_t = sum(times) / len(times)
+        variance = sum((t - mean_t) ** 2 for t in times)
+        spread = 1.4826 * _median([abs(o - self.offset_at(t)) for t, o in history])
+        self.skew_error = spread / variance ** 0.5
+    
+    def offset_at(self, local: float):
+        """Desfase estimado en el instante local dado"""
+        return self.offset + self.skew * (local - self.reference)
+    
+    def primary_time(self, local: float):
+        """Hora del principal correspondiente a la hora local dada"""
+        return local + self.offset_at(local)
+    
+    def get_stats(self):
+        """Estado de la estimación (para registro y diagnóstico)"""
+        return {
+            'synchronized': self.synchronized,
+            'offset_ms': self.offset * 1000,
+            'skew_ppm': self.skew * 1e6,
+            'skew_error_ppm': self.skew_error * 1e6 if self.skew_error is not None else None,
+            'delay_ms': self.delay * 1000 if self.delay is not None else None,
+            'bursts': len(self._history),
+            'rejected_bursts': self.rejected_bursts,
+        }
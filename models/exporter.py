@@ -0,0 +1,202 @@
+"""
+Exportación en streaming del historial de partidos
+Recorre partidos y eventos con generadores y escribe por bloques en CSV,
+JSONL o un formato binario columnar compacto, sin construir el conjunto
+de datos completo en memoria
+"""
+import csv
+import json
+import struct
+from array import array
+
+
+MATCH_COLUMNS = (
+    ('match_id', 'i'), ('team1', 's'), ('team2', 's'), ('duration_minutes', 'i'),
+    ('start_time', 's'), ('end_time', 's'), ('score1', 'i'), ('score2', 'i'),
+)
+EVENT_COLUMNS = (
+    ('match_id', 'i'), ('type', 's'), ('team', 's'), ('player', 's'),
+    ('clock_seconds', 'i'), ('detail', 's'),
+)
+
+CHUNK_ROWS = 4096
+BUFFER_SIZE = 1 << 16
+
+COLUMNAR_MAGIC = b"DCX1"
+COLUMNAR_VERSION = 1
+
+
+def iter_match_rows(matches):
+    """Una fila por partido"""
+    for match in matches:
+        yield (
+            match.match_id or 0,
+            match.team1,
+            match.team2,
+            match.duration_minutes,
+            match.start_time.isoformat() if match.start_time else "",
+            match.end_time.isoformat() if match.end_time else "",
+            match.score1,
+            match.score2,
+        )
+
+
+def iter_event_rows(matches):
+    """Una fila por evento tipado de cada partido"""
+    for match in matches:
+        for event in match.timeline.all_events():
+            yield (
+                match.match_id or 0,
+                event.type.value,
+                event.team,
+                event.player or "",
+                event.clock_seconds,
+                event.detail or "",
+            )
+
+
+def iter_chunks(rows, size: int = CHUNK_ROWS):
+    """Agrupa las filas en bloques de `size`"""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def write_csv(path: str, columns, rows, progress=None):
+    """Escribe CSV con cabecera; devuelve el número de filas"""
+    count = 0
+    with open(path, 'w', newline='', encoding='utf-8', buffering=BUFFER_SIZE) as f:
+        writer = csv.writer(f)
+        writer.writerow([name for name, _ in columns])
+        for chunk in iter_chunks(rows):
+            writer.writerows(chunk)
+            count += len(chunk)
+            if progress:
+                progress(count)
+    return count
+
+
+def write_jsonl(path: str, columns, rows, progress=None):
+    """Escribe un objeto JSON por línea; devuelve el número de filas"""
+    names = [name for name, _ in columns]
+    count = 0
+    with open(path, 'w', encoding='utf-8', buffering=BUFFER_SIZE) as f:
+        for chunk in iter_chunks(rows):
+            f.write("".join(
+                json.dumps(dict(zip(names, row)), ensure_ascii=False, separators=(',', ':')) + "\n"
+                for row in chunk
+            ))
+            count += len(chunk)
+            if progress:
+                progress(count)
+    return count
+
+
+def write_columnar(path: str, columns, rows, progress=None):
+    """
+    Formato columnar binario (little endian):
+    cabecera  = "DCX1", versión u16, nº columnas u16, y por columna
+                longitud u16 + nombre utf-8 + tipo (b'i' entero, b's' texto)
+    bloque    = nº filas u32 y, por columna, int64[n] o bien
+                longitudes u32[n] + bytes utf-8 concatenados
+    fin       = bloque con 0 filas
+    """
+    count = 0
+    with open(path, 'wb', buffering=BUFFER_SIZE) as f:
+        f.write(COLUMNAR_MAGIC)
+        f.write(struct.pack('<HH', COLUMNAR_VERSION, len(columns)))
+        for name, kind in columns:
+            encoded = name.encode('utf-8')
+            f.write(struct.pack('<H', len(encoded)))
+            f.write(encoded)
+            f.write(kind.encode('ascii'))
+        
+        for chunk in iter_chunks(rows):
+            f.write(struct.pack('<I', len(chunk)))
+            for index, (_, kind) in enumerate(columns):
+                values = [row[index] for row in chunk]
+                if kind == 'i':
+                    f.write(_little_endian(array('q', values)).tobytes())
+                else:
+                    encoded = [value.encode('utf-8') for value in values]
+                    f.write(_little_endian(array('I', map(len, encoded))).tobytes())
+                    f.write(b"".join(encoded))
+            count += len(chunk)
+            if progress:
+                progress(count)
+        f.write(struct.pack('<I', 0))
+    return count
+
+
+def _little_endian(values: array):
+    """Asegura el orden de bytes little endian del formato"""
+    if struct.pack('=H', 1) != struct.pack('<H', 1):
+        values.byteswap()
+    return values
+
+
+def read_columnar(path: str):
+    """Lee un fichero columnar; genera (nombres de columna, bloque de filas)"""
+    with open(path, 'rb', buffering=BUFFER_SIZE) as f:
+        if f.read(4) != COLUMNAR_MAGIC:
+            raise ValueError("No es un fichero columnar DCX1")
+        version, column_count = struct.unpack('<HH', f.read(4))
+        if version != COLUMNAR_VERSION:
+            raise ValueError(f"Versión de formato no soportada: {version}")
+        columns = []
+        for _ in range(column_count):
+            (length,) = struct.unpack('<H', f.read(2))
+            name = f.read(length).decode('utf-8')
+            columns.append((name, f.read(1).decode('ascii')))
+        
+        names = [name for name, _ in columns]
+        while True:
+            (row_count,) = struct.unpack('<I', f.read(4))
+            if row_count == 0:
+                return
+            data = []
+            for _, kind in columns:
+                if kind == 'i':
+                    values = array('q')
+                    values.frombytes(f.read(8 * row_count))
+                    data.append(_little_endian(values))
+                else:
+                    lengths = array('I')
+                    lengths.frombytes(f.read(4 * row_count))
+                    _little_endian(lengths)
+                    blob = f.read(sum(lengths))
+                    strings, offset = [], 0
+                    for length in lengths:
+                        strings.append(blob[offset:offset + length].decode('utf-8'))
+                        offset += length
+                    data.append(strings)
+            yield names, list(zip(*data))
+
+
+WRITERS = {
+    'csv': write_csv,
+    'jsonl': write_jsonl,
+    'columnar': write_columnar,
+}
+
+
+def export_history(matches, path: str, format: str = 'csv', table: str = 'matches',
+                   progress=None):
+    """
+    Exporta partidos (`table='matches'`) o sus eventos (`table='events'`).
+    `progress(filas_escritas)` se llama tras cada bloque.
+    """
+    if format not in WRITERS:
+        raise ValueError(f"Formato de exportación desconocido: {format}")
+    if table == 'matches':
+        columns, rows = MATCH_COLUMNS, iter_match_rows(matches)
+    elif table == 'events':
+        columns, rows = EVENT_COLUMNS, iter_event_rows(matches)
+    else:
+        raise ValueError(f"Tabla de exportación desconocida: {table}")
+    return WRITERS[format](path, columns, rows, progress)
@@ -0,0 +1,301 @@
+"""
+Generación de calendarios de torneo
+Liga (método del círculo), grupos con eliminatoria, emparejamiento suizo
+y asignación de partidos a campos y franjas horarias con descanso mínimo
+"""
+import random
+
+
+class Fixture:
+    """Partido programado del calendario"""
+    
+    __slots__ = ('round', 'team1', 'team2', 'stage', 'pitch', 'slot')
+    
+    def __init__(self, round_number: int, team1: str, team2: str, stage: str = "league"):
+        self.round = round_number
+        self.team1 = team1
+        self.team2 = team2
+        self.stage = stage
+        self.pitch = None
+        self.slot = None
+    
+    def __repr__(self):
+        return f"Fixture(r{self.round} {self.team1} vs {self.team2} p={self.pitch} s={self.slot})"
+    
+    def to_dict(self):
+        """Serializa el partido programado"""
+        return {
+            'round': self.round,
+            'team1': self.team1,
+            'team2': self.team2,
+            'stage': self.stage,
+            'pitch': self.pitch,
+            'slot': self.slot,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Reconstruye un partido programado serializado con to_dict"""
+        fixture = cls(data['round'], data['team1'], data['team2'], data['stage'])
+        fixture.pitch = data['pitch']
+        fixture.slot = data['slot']
+        return fixture
+
+
+def round_robin(teams, double: bool = False, stage: str = "league"):
+    """
+    Liga todos contra todos con el método del círculo.
+    Un equipo queda fijo y el resto rota; con número impar se añade un
+    descanso (None) y esos cruces se omiten.
+    """
+    teams = list(teams)
+    if len(teams) < 2:
+        return []
+    if len(teams) % 2:
+        teams.append(None)
+    
+    n = len(teams)
+    half = n // 2
+    fixed, rotating = teams[0], teams[1:]
+    fixtures = []
+    
+    for round_index in range(n - 1):
+        lineup = [fixed] + rotating
+        for i in range(half):
+            home, away = lineup[i], lineup[n - 1 - i]
+            if home is None or away is None:
+                continue
+            # Alternar local/visitante del equipo fijo
+            if i == 0 and round_index % 2:
+                home, away = away, home
+            fixtures.append(Fixture(round_index + 1, home, away, stage))
+        rotating = rotating[-1:] + rotating[:-1]
+    
+    if double:
+        rounds = n - 1
+        fixtures += [
+            Fixture(f.round + rounds, f.team2, f.team1, stage) for f in list(fixtures)
+        ]
+    return fixtures
+
+
+def split_groups(teams, group_count: int):
+    """Reparte los equipos en grupos en serpentina (respeta el orden de cabezas de serie)"""
+    groups = [[] for _ in range(group_count)]
+    for index, team in enumerate(teams):
+        row, col = divmod(index, group_count)
+        groups[col if row % 2 == 0 else group_count - 1 - col].append(team)
+    return groups
+
+
+def group_stage(teams, group_count: int):
+    """Fase de grupos: una liga por grupo, con las jornadas alineadas"""
+    groups = split_groups(list(teams), group_count)
+    fixtures = []
+    for index, group in enumerate(groups):
+        fixtures += round_robin(group, stage=f"group_{chr(ord('A') + index)}")
+    fixtures.sort(key=lambda f: f.round)
+    return groups, fixtures
+
+
+def knockout_bracket(qualified, first_round: int = 1):
+    """
+    Primera ronda de eliminatoria para los clasificados (ordenados por
+    cabeza de serie): 1 contra el último, 2 contra el penúltimo...
+    Si el número no es potencia de dos, los mejores pasan sin jugar.
+    Las rondas siguientes dependen de los resultados: se emparejan igual,
+    con los exentos seguidos de los ganadores en el orden de los partidos
+    (TournamentModel.next_knockout_round).
+    """
+    qualified = list(qualified)
+    size = 1
+    while size < len(qualified):
+        size *= 2
+    byes = size - len(qualified)
+    playing = qualified[byes:]
+    fixtures = []
+    for i in range(len(playing) // 2):
+        fixtures.append(Fixture(first_round, playing[i], playing[-1 - i], f"knockout_{size}"))
+    return qualified[:byes], fixtures
+
+
+def seed_label(position: int, group_index: int) -> str:
+    """Plaza simbólica de la eliminatoria: "1A" es el primero del grupo A"""
+    return f"{position}{chr(ord('A') + group_index)}"
+
+
+def groups_then_knockout(teams, group_count: int, qualifiers_per_group: int = 2):
+    """
+    Grupos y eliminatoria. La primera ronda de eliminatoria enfrenta a los
+    primeros de grupo con los segundos de otro grupo (plazas simbólicas
+    "1A", "2B"... que resolve_seeds sustituye cuando terminan los grupos).
+    """
+    groups, fixtures = group_stage(teams, group_count)
+    last_round = max((f.round for f in fixtures), default=0)
+    
+    seeds = []
+    for position in range(1, qualifiers_per_group + 1):
+        for index in range(len(groups)):
+            seeds.append(seed_label(position, index))
+    byes, knockout = knockout_bracket(seeds, last_round + 1)
+    return groups, fixtures + knockout, byes
+
+
+def resolve_seeds(fixtures, byes, group_rankings):
+    """
+    Sustituye las plazas simbólicas de la eliminatoria por equipos.
+    `group_rankings` tiene, por grupo y en orden, los equipos según la
+    clasificación final. Devuelve (partidos, exentos) nuevos; los partidos
+    que no son de eliminatoria no cambian.
+    """
+    teams = {}
+    for index, ranking in enumerate(group_rankings):
+        for position, team in enumerate(ranking, 1):
+            teams[seed_label(position, index)] = team
+    
+    resolved = []
+    for fixture in fixtures:
+        if fixture.stage.startswith("knockout"):
+            data = fixture.to_dict()
+            data['team1'] = teams.get(fixture.team1, fixture.team1)
+            data['team2'] = teams.get(fixture.team2, fixture.team2)
+            fixture = Fixture.from_dict(data)
+        resolved.append(fixture)
+    return resolved, [teams.get(bye, bye) for bye in byes]
+
+
+def swiss_pairings(standings, played: set, round_number: int):
+    """
+    Emparejamiento suizo de una ronda.
+    `standings` es la lista de equipos ordenada por puntos; `played` contiene
+    los cruces ya jugados como frozenset. Se empareja cada equipo con el más
+    cercano en la clasificación que no sea repetido, retrocediendo si un
+    emparejamiento deja equipos sin rival posible.
+    """
+    teams = list(standings)
+    bye = None
+    if len(teams) % 2:
+        # Descansa el peor clasificado
+        bye = teams.pop()
+    
+    pairs = _pair_swiss(teams, played)
+    if pairs is None:
+        # Sin solución sin repetir: permitir repeticiones
+        pairs = [(teams[i], teams[i + 1]) for i in range(0, len(teams), 2)]
+    return [Fixture(round_number, a, b, "swiss") for a, b in pairs], bye
+
+
+def _pair_swiss(teams, played):
+    """Búsqueda con retroceso (iterativa) de emparejamientos sin repetir"""
+    pairs = []
+    remaining = list(teams)
+    # Pila de (equipos restantes, índice del siguiente candidato a probar)
+    stack = []
+    candidate = 1
+    steps = 0
+    max_steps = 200000
+    
+    while remaining:
+        steps += 1
+        if steps > max_steps:
+            return None
+        team = remaining[0]
+        found = False
+        for index in range(candidate, len(remaining)):
+            if frozenset((team, remaining[index])) not in played:
+                stack.append((remaining, index))
+                pairs.append((team, remaining[index]))
+                remaining = remaining[1:index] + remaining[index + 1:]
+                candidate = 1
+                found = True
+                break
+        if not found:
+            if not stack:
+                return None
+            remaining, index = stack.pop()
+            pairs.pop()
+            candidate = index + 1
+    return pairs
+
+
+def assign_slots(fixtures, pitches: int, min_rest_slots: int = 1):
+    """
+    Asigna campo y franja a cada partido, en el orden de las jornadas, con
+    un descanso mínimo (en franjas) para cada equipo entre dos partidos.
+    Un salto de franjas llenas con compresión de caminos hace que cada
+    asignación sea casi O(1), por lo que escala a cientos de equipos.
+    """
+    next_free = {}      # Franja mínima en la que cada equipo puede volver a jugar
+    used = []           # Partidos ya asignados en cada franja
+    skip = []           # Siguiente franja candidata (unión-búsqueda)
+    
+    def ensure(slot):
+        while len(used) <= slot:
+            used.append(0)
+            skip.append(len(skip))
+    
+    def find(slot):
+        ensure(slot)
+        root = slot
+        while skip[root] != root:
+            root = skip[root]
+            ensure(root)
+        # Compresión de caminos
+        while skip[slot] != root:
+            skip[slot], slot = root, skip[slot]
+        return root
+    
+    for fixture in fixtures:
+        earliest = max(next_free.get(fixture.team1, 0), next_free.get(fixture.team2, 0))
+        slot = find(earliest)
+        fixture.slot = slot
+        fixture.pitch = used[slot]
+        used[slot] += 1
+        if used[slot] >= pitches:
+            # Franja llena: las búsquedas saltan a la siguiente
+            ensure(slot + 1)
+            skip[slot] = slot + 1
+        rest = slot + 1 + min_rest_slots
+        next_free[fixture.team1] = rest
+        next_free[fixture.team2] = rest
+    return fixtures
+
+
+def generate_fixtures(teams, format: str = "round_robin", pitches: int = 1,
+                      min_rest_slots: int = 1, group_count: int = 4,
+                      qualifiers_per_group: int = 2, double: bool = False,
+                      swiss_rounds: int = 5, seed: int = None):
+    """
+    Genera y programa el calendario completo.
+    Función de nivel de módulo para poder ejecutarse en otro proceso.
+    """
+    teams = list(teams)
+    result = {
+        'format': format,
+        'teams': teams,
+        'groups': None,
+        'byes': [],
+        'pitches': pitches,
+        'min_rest_slots': min_rest_slots,
+    }
+    
+    if format == "round_robin":
+        fixtures = round_robin(teams, double=double)
+    elif format == "groups_knockout":
+        groups, fixtures, byes = groups_then_knockout(teams, group_count, qualifiers_per_group)
+        result['groups'] = groups
+        result['byes'] = byes
+    elif format == "swiss":
+        # Solo la primera ronda se conoce de antemano; el orden inicial es aleatorio
+        rng = random.Random(seed)
+        order = list(teams)
+        rng.shuffle(order)
+        result['teams'] = order
+        fixtures, bye = swiss_pairings(order, set(), 1)
+        result['byes'] = [bye] if bye else []
+    else:
+        raise ValueError(f"Formato de torneo desconocido: {format}")
+    
+    assign_slots(fixtures, pitches, min_rest_slots)
+    result['fixtures'] = [fixture.to_dict() for fixture in fixtures]
+    return result
@@ -0,0 +1,362 @@
+"""
+Importación masiva de equipos, jugadores y calendario
+Los ficheros CSV, JSON (lista de objetos) y JSONL se leen fila a fila,
+se validan por lotes y se devuelven como un único resultado que
+TournamentModel.import_roster aplica en una sola transacción
+"""
+import csv
+import json
+import os
+import time
+
+from models.fixtures import Fixture, assign_slots
+
+
+BATCH_SIZE = 1000
+MAX_ERRORS = 100
+READ_CHUNK = 1 << 16
+MAX_JSON_OBJECT = 1 << 20   # Un objeto JSON más grande se considera corrupto
+
+ROW_TEAM = "team"
+ROW_PLAYER = "player"
+ROW_FIXTURE = "fixture"
+
+
+class ImportIssue:
+    """Error de validación de una fila"""
+    
+    __slots__ = ('line', 'message')
+    
+    def __init__(self, line: int, message: str):
+        self.line = line
+        self.message = message
+    
+    def __repr__(self):
+        return f"ImportIssue({self.line}, {self.message!r})"
+    
+    def __str__(self):
+        return f"Línea {self.line}: {self.message}"
+
+
+class ImportParseError(ValueError):
+    """Error de formato que impide seguir leyendo el fichero"""
+    
+    def __init__(self, line: int, message: str):
+        super().__init__(f"Línea {line}: {message}")
+        self.line = line
+        self.message = message
+
+
+class ImportResult:
+    """Registros validados, errores y rendimiento de una importación"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.teams = []
+        self.players = []
+        self.fixtures = []
+        self.errors = []
+        self.rows = 0
+        self.elapsed = 0.0
+        self.truncated = False
+    
+    @property
+    def ok(self):
+        return not self.errors
+    
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+    
+    def fixtures_result(self, pitches: int = 1, min_rest_slots: int = 1):
+        """
+        Calendario importado con el formato de models.fixtures.generate_fixtures.
+        Los partidos sin campo o franja se programan con assign_slots.
+        """
+        if not self.fixtures:
+            return None
+        fixtures = []
+        for data in self.fixtures:
+            fixture = Fixture(data['round'], data['team1'], data['team2'], data['stage'])
+            fixture.pitch = data['pitch']
+            fixture.slot = data['slot']
+            fixtures.append(fixture)
+        
+        if any(fixture.slot is None for fixture in fixtures):
+            assign_slots(fixtures, pitches, min_rest_slots)
+        else:
+            pitches = max(pitches, max(fixture.pitch or 0 for fixture in fixtures) + 1)
+        
+        teams = {}
+        for fixture in fixtures:
+            teams[fixture.team1] = None
+            teams[fixture.team2] = None
+        return {
+            'format': "imported",
+            'teams': list(teams),
+            'groups': None,
+            'byes': [],
+            'pitches': pitches,
+            'min_rest_slots': min_rest_slots,
+            'fixtures': [fixture.to_dict() for fixture in fixtures],
+        }
+
+
+# Lectura en streaming
+def iter_csv_rows(f):
+    """Genera (línea, fila) de un CSV con cabecera"""
+    reader = csv.DictReader(f)
+    for row in reader:
+        if None in row:
+            # Columnas de más: se conservan para que la validación las rechace
+            row['__extra__'] = row.pop(None)
+        yield reader.line_num, row
+
+
+def iter_jsonl_rows(f):
+    """Genera (línea, objeto) de un fichero con un objeto JSON por línea"""
+    for line_number, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ImportParseError(line_number, f"JSON no válido: {e.msg}")
+
+
+def iter_json_rows(f):
+    """
+    Genera (línea, objeto) de una lista JSON sin cargar el fichero entero:
+    se decodifica un elemento cada vez sobre un búfer que se va leyendo
+    por bloques
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    line = 1
+    eof = False
+    
+    def fill():
+        nonlocal buffer, pos, eof
+        chunk = f.read(READ_CHUNK)
+        if not chunk:
+            eof = True
+        # Descartar lo ya consumido para que el búfer no crezca
+        buffer = buffer[pos:] + chunk
+        pos = 0
+    
+    def skip():
+        """Avanza sobre espacios contando líneas"""
+        nonlocal pos, line
+        while True:
+            while pos < len(buffer) and buffer[pos].isspace():
+                if buffer[pos] == "\n":
+                    line += 1
+                pos += 1
+            if pos < len(buffer) or eof:
+                return
+            fill()
+    
+    def next_char():
+        """Siguiente carácter significativo (None al final del fichero)"""
+        skip()
+        return buffer[pos] if pos < len(buffer) else None
+    
+    fill()
+    if next_char() != "[":
+        raise ImportParseError(line, "Se esperaba una lista JSON de objetos")
+    pos += 1
+    char = next_char()
+    if char is None:
+        raise ImportParseError(line, "Lista JSON sin cerrar")
+    if char == "]":
+        return
+    
+    while True:
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as e:
+            if eof or len(buffer) - pos > MAX_JSON_OBJECT:
+                raise ImportParseError(line + buffer.count("\n", pos, e.pos),
+                                       f"JSON no válido: {e.msg}")
+            # Elemento incompleto: leer más y reintentar
+            fill()
+            continue
+        item_line = line
+        line += buffer.count("\n", pos, end)
+        pos = end
+        yield item_line, value
+        
+        # Entre elementos, exactamente una coma; ninguna antes del cierre
+        char = next_char()
+        if char is None:
+            raise ImportParseError(line, "Lista JSON sin cerrar")
+        if char == "]":
+            return
+        if char != ",":
+            raise ImportParseError(line, f"Se esperaba ',' o ']' y se encontró {char!r}")
+        pos += 1
+        char = next_char()
+        if char is None:
+            raise ImportParseError(line, "Lista JSON sin cerrar")
+        if char in ",]":
+            raise ImportParseError(line, f"Elemento vacío antes de {char!r}")
+
+READERS = {
+    '.csv': iter_csv_rows,
+    '.jsonl': iter_jsonl_rows,
+    '.ndjson': iter_jsonl_rows,
+    '.json': iter_json_rows,
+}
+
+
+# Validación
+def row_kind(row: dict):
+    """Tipo de fila: columna `kind` explícita o deducido de las columnas"""
+    kind = row.get('kind')
+    if kind:
+        return str(kind).strip().lower()
+    if 'team1' in row or 'team2' in row:
+        return ROW_FIXTURE
+    if 'team' in row:
+        return ROW_PLAYER
+    return ROW_TEAM
+
+
+def _text(row: dict, key: str, required: bool = True):
+    value = row.get(key)
+    value = "" if value is None else str(value).strip()
+    if required and not value:
+        raise ValueError(f"Falta el campo '{key}'")
+    return value or None
+
+
+def _integer(row: dict, key: str, default=None, minimum: int = 0):
+    value = row.get(key)
+    if value is None or value == "":
+        return default
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{key}' debe ser un entero: {value!r}")
+    if number < minimum:
+        raise ValueError(f"'{key}' debe ser mayor o igual que {minimum}")
+    return number
+
+
+class _Validator:
+    """Estado de validación compartido entre lotes (duplicados, equipos conocidos)"""
+    
+    def __init__(self, result: ImportResult, known_teams):
+        self.result = result
+        self.known_teams = set(known_teams)
+        self.player_numbers = set()
+        self.pairings = set()
+    
+    def validate_batch(self, batch):
+        """Valida un lote de (línea, fila) y acumula registros o errores"""
+        for line, row in batch:
+            try:
+                if not isinstance(row, dict):
+                    raise ValueError("Se esperaba un objeto")
+                if row.get('__extra__'):
+                    raise ValueError("La fila tiene más columnas que la cabecera")
+                kind = row_kind(row)
+                if kind == ROW_TEAM:
+                    self._team(row)
+                elif kind == ROW_PLAYER:
+                    self._player(row)
+                elif kind == ROW_FIXTURE:
+                    self._fixture(row)
+                else:
+                    raise ValueError(f"Tipo de fila desconocido: {kind}")
+            except ValueError as e:
+                self.result.errors.append(ImportIssue(line, str(e)))
+    
+    def _team(self, row):
+        name = _text(row, 'name')
+        if name in self.known_teams:
+            raise ValueError(f"Equipo duplicado: {name}")
+        self.known_teams.add(name)
+        self.result.teams.append(name)
+    
+    def _player(self, row):
+        team = _text(row, 'team')
+        name = _text(row, 'name')
+        number = _integer(row, 'number', minimum=1)
+        if team not in self.known_teams:
+            raise ValueError(f"Equipo desconocido: {team}")
+        if number is not None:
+            if (team, number) in self.player_numbers:
+                raise ValueError(f"Dorsal {number} repetido en {team}")
+            self.player_numbers.add((team, number))
+        self.result.players.append({'team': team, 'name': name, 'number': number})
+    
+    def _fixture(self, row):
+        team1 = _text(row, 'team1')
+        team2 = _text(row, 'team2')
+        if team1 == team2:
+            raise ValueError(f"Un equipo no puede jugar contra sí mismo: {team1}")
+        round_number = _integer(row, 'round', default=1, minimum=1)
+        pitch = _integer(row, 'pitch')
+        slot = _integer(row, 'slot')
+        if (pitch is None) != (slot is None):
+            raise ValueError("'pitch' y 'slot' deben indicarse juntos")
+        pairing = (round_number, frozenset((team1, team2)))
+        if pairing in self.pairings:
+            raise ValueError(f"Partido repetido en la jornada {round_number}: {team1} - {team2}")
+        self.pairings.add(pairing)
+        self.result.fixtures.append({
+            'round': round_number,
+            'team1': team1,
+            'team2': team2,
+            'stage': _text(row, 'stage', required=False) or "league",
+            'pitch': pitch,
+            'slot': slot,
+        })
+
+
+def import_file(path: str, known_teams=(), batch_size: int = BATCH_SIZE,
+                max_errors: int = MAX_ERRORS, progress=None):
+    """
+    Lee y valida un fichero de importación.
+    Devuelve un ImportResult; no modifica ningún modelo. Si hay errores
+    el resultado no debe aplicarse. `progress(filas_leídas)` se llama tras
+    cada lote.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    reader = READERS.get(extension)
+    if reader is None:
+        raise ValueError(f"Formato de importación no soportado: {extension}")
+    
+    result = ImportResult(path)
+    validator = _Validator(result, known_teams)
+    started = time.perf_counter()
+    
+    with open(path, 'r', newline='', encoding='utf-8-sig', buffering=READ_CHUNK) as f:
+        batch = []
+        try:
+            for line, row in reader(f):
+                batch.append((line, row))
+                if len(batch) >= batch_size:
+                    validator.validate_batch(batch)
+                    result.rows += len(batch)
+                    batch = []
+                    if progress:
+                        progress(result.rows)
+                    if len(result.errors) >= max_errors:
+                        result.truncated = True
+                        break
+        except ImportParseError as e:
+            result.errors.append(ImportIssue(e.line, e.message))
+        except (csv.Error, UnicodeDecodeError) as e:
+            result.errors.append(ImportIssue(result.rows + len(batch) + 1, str(e)))
+        if batch:
+            validator.validate_batch(batch)
+            result.rows += len(batch)
+            if progress:
+                progress(result.rows)
+    
+    result.elapsed = time.perf_counter() - started
+    return result
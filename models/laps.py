@@ -0,0 +1,186 @@
+"""
+Vueltas y parciales del cronómetro
+Los tiempos se guardan en arrays de doubles que crecen con las vueltas
+hasta la capacidad y a partir de ahí funcionan como búfer circular; las
+estadísticas (mejor, peor, media y percentiles por histograma) se
+actualizan al llegar cada vuelta, sin recorrer las anteriores.
+"""
+import math
+from array import array
+
+
+DEFAULT_CAPACITY = 1 << 17      # 131072 vueltas guardadas (1 MiB por array)
+
+# Histograma logarítmico: cubetas del 1 % desde 1 ms hasta ~27 horas
+HISTOGRAM_MIN = 0.001
+HISTOGRAM_GROWTH = 1.01
+HISTOGRAM_BUCKETS = 1720
+_LOG_GROWTH = math.log(HISTOGRAM_GROWTH)
+
+
+def format_lap(seconds: float):
+    """MM:SS.mmm (o H:MM:SS.mmm a partir de una hora)"""
+    millis = int(round(seconds * 1000))
+    total_seconds, millis = divmod(millis, 1000)
+    minutes, secs = divmod(total_seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}.{millis:03d}"
+    return f"{minutes:02d}:{secs:02d}.{millis:03d}"
+
+
+class LapStats:
+    """Estadísticas acumuladas de todas las vueltas (también las ya sobrescritas)"""
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        self.count = 0
+        self.total = 0.0
+        self.best = None
+        self.best_number = None
+        self.worst = None
+        self.worst_number = None
+        self._histogram = array('q', bytes(8 * HISTOGRAM_BUCKETS))
+    
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+    
+    def add(self, number: int, lap: float):
+        self.count += 1
+        self.total += lap
+        if self.best is None or lap < self.best:
+            self.best = lap
+            self.best_number = number
+        if self.worst is None or lap > self.worst:
+            self.worst = lap
+            self.worst_number = number
+        self._histogram[self._bucket(lap)] += 1
+    
+    @staticmethod
+    def _bucket(lap: float):
+        if lap <= HISTOGRAM_MIN:
+            return 0
+        index = int(math.log(lap / HISTOGRAM_MIN) / _LOG_GROWTH) + 1
+        return min(index, HISTOGRAM_BUCKETS - 1)
+    
+    @staticmethod
+    def _bucket_value(index: int):
+        """Valor representativo de la cubeta (centro geométrico)"""
+        if index == 0:
+            return HISTOGRAM_MIN
+        return HISTOGRAM_MIN * HISTOGRAM_GROWTH ** (index - 0.5)
+    
+    def percentiles(self, fractions=(0.5, 0.9)):
+        """
+        Percentiles aproximados (error < 1 %) a partir del histograma.
+        Devuelve una lista con un valor por fracción (None sin vueltas).
+        """
+        if not self.count:
+            return [None] * len(fractions)
+        targets = sorted((max(1, math.ceil(fraction * self.count)), position)
+                         for position, fraction in enumerate(fractions))
+        results = [None] * len(fractions)
+        cumulative = 0
+        pending = 0
+        for index, bucket_count in enumerate(self._histogram):
+            if not bucket_count:
+                continue
+            cumulative += bucket_count
+            while pending < len(targets) and cumulative >= targets[pending][0]:
+                value = self._bucket_value(index)
+                # La mejor y la peor vuelta son exactas
+                results[targets[pending][1]] = min(max(value, self.best), self.worst)
+                pending += 1
+            if pending == len(targets):
+                break
+        return results
+
+
+class LapRecorder:
+    """
+    Registro de vueltas del cronómetro con marcas de tiempo monótonas.
+    Las pausas no cuentan: el tiempo transcurrido es el de marcha.
+    """
+    
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        # Duración de cada vuelta y tiempo acumulado (parcial) al cerrarla.
+        # Empiezan vacíos: un reloj que nunca marca vueltas no reserva nada
+        self._laps = array('d')
+        self._splits = array('d')
+        self.stats = LapStats()
+        self.count = 0              # Vueltas registradas desde el inicio
+        self.running = False
+        self._started_at = 0.0      # Marca monótona equivalente al inicio
+        self._paused_at = None
+        self._last_split = 0.0
+    
+    def start(self, now: float, elapsed: float = 0.0):
+        """Empieza a contar en `now`; `elapsed` permite continuar una cuenta previa"""
+        self.running = True
+        self._started_at = now - elapsed
+        self._paused_at = None
+    
+    def pause(self, now: float):
+        if self.running and self._paused_at is None:
+            self._paused_at = now
+    
+    def resume(self, now: float):
+        if self._paused_at is not None:
+            self._started_at += now - self._paused_at
+            self._paused_at = None
+    
+    def reset(self):
+        self.running = False
+        self._paused_at = None
+        self._last_split = 0.0
+        self.count = 0
+        self._laps = array('d')
+        self._splits = array('d')
+        self.stats.reset()
+    
+    def elapsed(self, now: float):
+        """Tiempo de marcha hasta `now`"""
+        if not self.running:
+            return 0.0
+        end = self._paused_at if self._paused_at is not None else now
+        return end - self._started_at
+    
+    def mark(self, now: float):
+        """
+        Cierra una vuelta en `now`.
+        Devuelve (número de vuelta, duración, parcial).
+        """
+        split = self.elapsed(now)
+        lap = split - self._last_split
+        self._last_split = split
+        slot = self.count % self.capacity
+        if slot == len(self._laps):
+            # Hasta llenarse, los arrays crecen (append amortizado O(1))
+            self._laps.append(lap)
+            self._splits.append(split)
+        else:
+            self._laps[slot] = lap
+            self._splits[slot] = split
+        self.count += 1
+        self.stats.add(self.count, lap)
+        return self.count, lap, split
+    
+    def __len__(self):
+        """Vueltas guardadas (las más antiguas se sobrescriben al llenarse)"""
+        return min(self.count, self.capacity)
+    
+    @property
+    def first_number(self):
+        """Número de la vuelta guardada más antigua"""
+        return self.count - len(self) + 1
+    
+    def lap(self, number: int):
+        """(duración, parcial) de la vuelta `number` si sigue guardada"""
+        if not self.first_number <= number <= self.count:
+            raise IndexError(f"Vuelta no disponible: {number}")
+        slot = (number - 1) % self.capacity
+        return self._laps[slot], self._splits[slot]
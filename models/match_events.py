@@ -0,0 +1,164 @@
+"""
+Eventos tipados de un partido (goles, tarjetas, cambios, tiempo añadido)
+Se indexan por tiempo de juego y por equipo para responder consultas por
+rango de minutos con bisect en lugar de recorrer la lista
+"""
+from bisect import bisect_left, bisect_right
+from enum import Enum
+
+
+class MatchEventType(Enum):
+    """Tipo de evento del partido"""
+    GOAL = "goal"
+    CARD = "card"
+    SUBSTITUTION = "substitution"
+    INJURY_TIME = "injury_time"
+    SHOOTOUT = "shootout"           # Penalti marcado en la tanda (no cuenta como gol)
+
+
+class MatchEvent:
+    """Evento tipado con el tiempo de juego en segundos"""
+    
+    __slots__ = ('type', 'team', 'player', 'clock_seconds', 'detail')
+    
+    def __init__(self, event_type: MatchEventType, team: str, player: str = None,
+                 clock_seconds: int = 0, detail: str = None):
+        self.type = event_type
+        self.team = team
+        self.player = player
+        self.clock_seconds = clock_seconds
+        self.detail = detail
+    
+    @property
+    def minute(self):
+        """Minuto de juego (el minuto 1 va de 0:00 a 0:59)"""
+        return self.clock_seconds // 60 + 1
+    
+    def __repr__(self):
+        return f"MatchEvent({self.type.value}, {self.team!r}, {self.minute}')"
+    
+    def describe(self):
+        """Texto legible para el registro y los informes"""
+        text = f"{self.minute}' {self.type.value} {self.team}"
+        if self.player:
+            text += f" ({self.player})"
+        if self.detail:
+            text += f" [{self.detail}]"
+        return text
+    
+    def to_dict(self):
+        """Serializa el evento"""
+        return {
+            'type': self.type.value,
+            'team': self.team,
+            'player': self.player,
+            'clock': self.clock_seconds,
+            'detail': self.detail,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Reconstruye un evento serializado con to_dict"""
+        return cls(MatchEventType(data['type']), data['team'], data.get('player'),
+                   data.get('clock', 0), data.get('detail'))
+
+
+class _TimeSeries:
+    """Lista de eventos ordenada por tiempo de juego, con sus tiempos en paralelo"""
+    
+    __slots__ = ('times', 'events')
+    
+    def __init__(self):
+        self.times = []
+        self.events = []
+    
+    def add(self, event: MatchEvent):
+        # Lo normal es que lleguen en orden: añadir al final es O(1)
+        if not self.times or event.clock_seconds >= self.times[-1]:
+            self.times.append(event.clock_seconds)
+            self.events.append(event)
+        else:
+            index = bisect_right(self.times, event.clock_seconds)
+            self.times.insert(index, event.clock_seconds)
+            self.events.insert(index, event)
+    
+    def bounds(self, start: int, end: int):
+        """Índices [i, j) de los eventos con start <= tiempo <= end"""
+        return bisect_left(self.times, start), bisect_right(self.times, end)
+
+
+class MatchEventIndex:
+    """
+    Índice de eventos de un partido: una serie global y series por equipo,
+    por tipo y por (equipo, tipo), todas ordenadas por tiempo de juego
+    """
+    
+    def __init__(self):
+        self._all = _TimeSeries()
+        self._by_team = {}
+        self._by_type = {}
+        self._by_team_type = {}
+    
+    def __len__(self):
+        return len(self._all.events)
+    
+    def add(self, event: MatchEvent):
+        """Indexa un evento"""
+        self._all.add(event)
+        self._series(self._by_team, event.team).add(event)
+        self._series(self._by_type, event.type).add(event)
+        self._series(self._by_team_type, (event.team, event.type)).add(event)
+    
+    @staticmethod
+    def _series(index: dict, key):
+        series = index.get(key)
+        if series is None:
+            series = index[key] = _TimeSeries()
+        return series
+    
+    def _select(self, team: str, event_type: MatchEventType):
+        """Serie más específica para los filtros dados"""
+        if team is not None and event_type is not None:
+            return self._by_team_type.get((team, event_type))
+        if team is not None:
+            return self._by_team.get(team)
+        if event_type is not None:
+            return self._by_type.get(event_type)
+        return self._all
+    
+    def between(self, start_seconds: int = 0, end_seconds: int = None,
+                team: str = None, event_type: MatchEventType = None):
+        """Eventos con start <= tiempo de juego <= end, filtrados por equipo y tipo"""
+        series = self._select(team, event_type)
+        if series is None:
+            return []
+        if end_seconds is None:
+            end_seconds = series.times[-1] if series.times else 0
+        i, j = series.bounds(start_seconds, end_seconds)
+        return series.events[i:j]
+    
+    def count_between(self, start_seconds: int = 0, end_seconds: int = None,
+                      team: str = None, event_type: MatchEventType = None):
+        """Número de eventos en el rango, sin construir la lista"""
+        series = self._select(team, event_type)
+        if series is None:
+            return 0
+        if end_seconds is None:
+            return len(series.times) - bisect_left(series.times, start_seconds)
+        i, j = series.bounds(start_seconds, end_seconds)
+        return j - i
+    
+    def all_events(self):
+        """Todos los eventos ordenados por tiempo de juego"""
+        return list(self._all.events)
+    
+    def stats(self, teams):
+        """Recuento por equipo y tipo (panel de estadísticas)"""
+        return {
+            team: {
+                event_type.value: len(self._by_team_type[(team, event_type)].events)
+                if (team, event_type) in self._by_team_type else 0
+                for event_type in MatchEventType
+            }
+            for team in teams
+        }
@@ -0,0 +1,309 @@
+"""
+Plan de periodos de un partido
+Un plan declarativo (periodos, descansos, prórroga, tiempo añadido y
+penaltis) se compila en una máquina de estados cuyas transiciones ocurren
+en instantes exactos: el controlador solo tiene que programar un
+temporizador hasta `deadline()`, sin comprobar umbrales en cada tick.
+El mismo plan sirve para cualquier deporte por periodos.
+"""
+
+
+PLAY = "play"
+BREAK = "break"
+PENALTIES = "penalties"
+PHASE_KINDS = (PLAY, BREAK, PENALTIES)
+
+
+class Phase:
+    """
+    Fase del plan: juego, descanso o penaltis (fase final sin duración).
+    Las fases `if_tied` (prórroga, penaltis) solo se juegan con empate.
+    """
+    
+    __slots__ = ('name', 'kind', 'duration', 'if_tied')
+    
+    def __init__(self, name: str, kind: str, duration: int = 0, if_tied: bool = False):
+        if kind not in PHASE_KINDS:
+            raise ValueError(f"Tipo de fase no válido: {kind}")
+        if kind != PENALTIES and duration <= 0:
+            raise ValueError(f"La fase {name} necesita una duración")
+        self.name = name
+        self.kind = kind
+        self.duration = int(duration)
+        self.if_tied = if_tied
+    
+    def __repr__(self):
+        return f"Phase({self.name!r}, {self.kind!r}, {self.duration})"
+    
+    def to_dict(self) -> dict:
+        return {'name': self.name, 'kind': self.kind, 'duration': self.duration,
+                'if_tied': self.if_tied}
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "Phase":
+        return cls(data['name'], data['kind'], data.get('duration', 0), data.get('if_tied', False))
+
+
+def _period_names(count: int):
+    if count == 2:
+        return ["First half", "Second half"]
+    return [f"Period {number}" for number in range(1, count + 1)]
+
+
+class PeriodPlan:
+    """Secuencia de fases de un partido"""
+    
+    def __init__(self, phases, name: str = ""):
+        phases = list(phases)
+        if not phases or phases[0].kind != PLAY:
+            raise ValueError("El plan debe empezar por un periodo de juego")
+        for phase in phases[:-1]:
+            if phase.kind == PENALTIES:
+                raise ValueError("Los penaltis solo pueden ser la última fase")
+        self.phases = phases
+        self.name = name
+    
+    @classmethod
+    def from_spec(cls, spec: dict, name: str = "") -> "PeriodPlan":
+        """
+        Compila una especificación declarativa, por ejemplo:
+        {"periods": 2, "period_minutes": 45, "break_seconds": 900,
+         "extra_time": {"periods": 2, "period_minutes": 15, "break_seconds": 60},
+         "penalties": True}
+        `names` permite dar nombre a los periodos ("Q1", "Q2"...).
+        """
+        periods = int(spec.get('periods', 2))
+        if periods < 1:
+            raise ValueError("Hace falta al menos un periodo")
+        period_seconds = int(float(spec['period_minutes']) * 60)
+        names = spec.get('names') or _period_names(periods)
+        phases = cls._block(names, period_seconds, spec.get('break_seconds', 0), False)
+        
+        extra = spec.get('extra_time')
+        if extra:
+            extra_periods = int(extra.get('periods', 2))
+            extra_names = extra.get('names') or [f"Extra time {number}"
+                                                 for number in range(1, extra_periods + 1)]
+            # Descanso previo a la prórroga
+            before = int(extra.get('break_before_seconds', spec.get('break_seconds', 0) or 0))
+            if before > 0:
+                phases.append(Phase("Break before extra time", BREAK, before, True))
+            phases.extend(cls._block(extra_names, int(float(extra['period_minutes']) * 60),
+                                     extra.get('break_seconds', 0), True))
+        if spec.get('penalties'):
+            phases.append(Phase("Penalties", PENALTIES, 0, True))
+        return cls(phases, name)
+    
+    @staticmethod
+    def _block(names, period_seconds: int, breaks, if_tied: bool):
+        """Periodos de juego con sus descansos intermedios"""
+        if not isinstance(breaks, (list, tuple)):
+            breaks = [breaks] * (len(names) - 1)
+        phases = []
+        for index, period_name in enumerate(names):
+            if index:
+                break_seconds = int(breaks[index - 1]) if index - 1 < len(breaks) else 0
+                if break_seconds > 0:
+                    phases.append(Phase(f"Break after {names[index - 1]}", BREAK,
+                                        break_seconds, if_tied))
+            phases.append(Phase(period_name, PLAY, period_seconds, if_tied))
+        return phases
+    
+    @classmethod
+    def football(cls, minutes: int = 90, break_seconds: int = 900,
+                 extra_time: bool = False, penalties: bool = False) -> "PeriodPlan":
+        """Dos partes; opcionalmente prórroga de 2x15 y penaltis"""
+        spec = {'periods': 2, 'period_minutes': minutes / 2, 'break_seconds': break_seconds,
+                'penalties': penalties}
+        if extra_time:
+            spec['extra_time'] = {'periods': 2, 'period_minutes': 15, 'break_seconds': 60}
+        return cls.from_spec(spec, "football")
+    
+    def half_time(self):
+        """
+        Descanso que parte en dos mitades iguales los periodos reglamentarios
+        (tras la 1.ª de 2 partes, tras el 2.º de 4 cuartos...). None si el
+        número de periodos es impar o no hay descanso entre las mitades.
+        """
+        regular = [index for index, phase in enumerate(self.phases)
+                   if phase.kind == PLAY and not phase.if_tied]
+        if len(regular) < 2 or len(regular) % 2:
+            return None
+        following = regular[len(regular) // 2 - 1] + 1
+        if following < len(self.phases) and self.phases[following].kind == BREAK:
+            return self.phases[following]
+        return None
+    
+    def to_dict(self) -> dict:
+        return {'name': self.name, 'phases': [phase.to_dict() for phase in self.phases]}
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "PeriodPlan":
+        return cls([Phase.from_dict(phase) for phase in data['phases']], data.get('name', ""))
+
+
+# Planes habituales por deporte (duraciones reglamentarias)
+PRESETS = {
+    'football': {'periods': 2, 'period_minutes': 45, 'break_seconds': 900,
+                 'extra_time': {'periods': 2, 'period_minutes': 15, 'break_seconds': 60},
+                 'penalties': True},
+    'basketball': {'periods': 4, 'period_minutes': 10, 'break_seconds': [120, 900, 120],
+                   'names': ["Q1", "Q2", "Q3", "Q4"],
+                   'extra_time': {'periods': 1, 'period_minutes': 5, 'names': ["OT"],
+                                  'break_before_seconds': 120}},
+    'ice_hockey': {'periods': 3, 'period_minutes': 20, 'break_seconds': 1020,
+                   'extra_time': {'periods': 1, 'period_minutes': 5, 'names': ["Overtime"],
+                                  'break_before_seconds': 120},
+                   'penalties': True},
+    'handball': {'periods': 2, 'period_minutes': 30, 'break_seconds': 600,
+                 'extra_time': {'periods': 2, 'period_minutes': 5, 'break_seconds': 60},
+                 'penalties': True},
+}
+
+
+class PeriodStateMachine:
+    """
+    Estado de un partido según su plan. Todos los métodos reciben la hora
+    de pared `now`; la máquina no lee relojes, así que es determinista y
+    puede reconstruirse desde una instantánea y ponerse al día.
+    """
+    
+    def __init__(self, plan: PeriodPlan):
+        self.plan = plan
+        self.index = -1             # -1 sin empezar; len(phases) terminado
+        self.phase_started = 0.0    # Inicio de la fase actual (desplazado por las pausas)
+        self.paused_at = None
+        self.stoppage = 0           # Tiempo añadido a la fase actual
+        self.played = 0.0           # Tiempo de juego de los periodos ya cerrados
+    
+    @property
+    def phase(self):
+        """Fase actual (None antes de empezar o al terminar)"""
+        if 0 <= self.index < len(self.plan.phases):
+            return self.plan.phases[self.index]
+        return None
+    
+    @property
+    def started(self):
+        return self.index >= 0
+    
+    @property
+    def finished(self):
+        return self.index >= len(self.plan.phases)
+    
+    @property
+    def on_break(self):
+        phase = self.phase
+        return phase is not None and phase.kind == BREAK
+    
+    @property
+    def in_penalties(self):
+        phase = self.phase
+        return phase is not None and phase.kind == PENALTIES
+    
+    @property
+    def paused(self):
+        return self.paused_at is not None
+    
+    def start(self, now: float):
+        """Empieza el primer periodo"""
+        self.index = 0
+        self.phase_started = now
+        self.paused_at = None
+        self.stoppage = 0
+        self.played = 0.0
+    
+    def deadline(self):
+        """Hora de pared en que termina la fase actual (None si no hay fin programado)"""
+        phase = self.phase
+        if phase is None or phase.kind == PENALTIES or self.paused_at is not None:
+            return None
+        return self.phase_started + phase.duration + self.stoppage
+    
+    def phase_elapsed(self, now: float):
+        if self.phase is None:
+            return 0.0
+        end = self.paused_at if self.paused_at is not None else now
+        return max(0.0, end - self.phase_started)
+    
+    def remaining(self, now: float):
+        """Segundos que quedan de la fase actual (tiempo añadido incluido)"""
+        phase = self.phase
+        if phase is None or phase.kind == PENALTIES:
+            return 0.0
+        return max(0.0, phase.duration + self.stoppage - self.phase_elapsed(now))
+    
+    def play_elapsed(self, now: float):
+        """Tiempo de juego total del partido (sin descansos ni pausas)"""
+        phase = self.phase
+        if phase is not None and phase.kind == PLAY:
+            return self.played + self.phase_elapsed(now)
+        return self.played
+    
+    def pause(self, now: float):
+        """Detiene la fase actual (el plazo se desplaza al reanudar)"""
+        if self.phase is not None and self.paused_at is None:
+            self.paused_at = now
+    
+    def resume(self, now: float):
+        if self.paused_at is not None:
+            self.phase_started += now - self.paused_at
+            self.paused_at = None
+    
+    def add_stoppage(self, seconds: int):
+        """Alarga el periodo de juego actual con tiempo añadido"""
+        phase = self.phase
+        if phase is None or phase.kind != PLAY:
+            raise ValueError("Solo se puede añadir tiempo a un periodo de juego")
+        self.stoppage += int(seconds)
+    
+    def advance(self, now: float, tied: bool):
+        """
+        Aplica todas las transiciones cuyo plazo ya pasó (varias si la
+        aplicación estuvo cerrada). Cada fase empieza exactamente cuando
+        terminó la anterior. `tied` decide si se juegan prórroga y penaltis.
+        Devuelve la lista de (fase que termina, fase que empieza o None).
+        """
+        transitions = []
+        deadline = self.deadline()
+        while deadline is not None and deadline <= now:
+            ended = self.phase
+            if ended.kind == PLAY:
+                self.played += ended.duration + self.stoppage
+            self.index = self._next_index(self.index + 1, tied)
+            self.phase_started = deadline
+            self.stoppage = 0
+            transitions.append((ended, self.phase))
+            deadline = self.deadline()
+        return transitions
+    
+    def _next_index(self, index: int, tied: bool):
+        phases = self.plan.phases
+        while index < len(phases) and phases[index].if_tied and not tied:
+            index += 1
+        return index
+    
+    def finish(self):
+        """Termina el partido (fin manual o tras los penaltis)"""
+        self.index = len(self.plan.phases)
+        self.paused_at = None
+    
+    def to_dict(self) -> dict:
+        return {
+            'plan': self.plan.to_dict(),
+            'index': self.index,
+            'phase_started': self.phase_started,
+            'paused_at': self.paused_at,
+            'stoppage': self.stoppage,
+            'played': self.played,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "PeriodStateMachine":
+        machine = cls(PeriodPlan.from_dict(data['plan']))
+        machine.index = data['index']
+        machine.phase_started = data['phase_started']
+        machine.paused_at = data['paused_at']
+        machine.stoppage = data['stoppage']
+        machine.played = data['played']
+        return machine
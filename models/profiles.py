@@ -0,0 +1,192 @@
+"""
+Perfiles de configuración con nombre
+Cada perfil guarda una ClockConfig y el idioma. Todos los perfiles van en
+un único archivo JSON compacto y versionado que se lee antes de construir
+las ventanas, para que se abran ya con su configuración final. Solo se
+escriben los campos que difieren de los valores por defecto.
+"""
+import json
+import logging
+import os
+from dataclasses import dataclass
+
+from models.clock_config import ClockConfig, WindowMode
+
+
+logger = logging.getLogger(__name__)
+
+PROFILE_VERSION = 1
+PROFILE_FILE = "profiles.json"
+DEFAULT_PROFILE = "default"
+DEFAULT_LANGUAGE = "es"
+
+
+class ProfileError(ValueError):
+    """Archivo de perfiles no válido o de una versión posterior"""
+
+
+# Tipo JSON de cada campo de ClockConfig en el archivo
+_CONFIG_TYPES = {
+    'mode': int,
+    'format_24h': bool,
+    'alarm_enabled': bool,
+    'alarm_hour': int,
+    'alarm_minute': int,
+    'alarm_message': str,
+    'alarm_rule': str,
+    'timer_duration': int,
+    'world_zones': list,
+}
+
+# Valores admitidos de los campos numéricos (mínimo, máximo; None = sin límite)
+_CONFIG_RANGES = {
+    'alarm_hour': (0, 23),
+    'alarm_minute': (0, 59),
+    'timer_duration': (0, None),
+}
+
+
+def _check_type(value, expected, where: str):
+    # bool es subclase de int en Python, pero en el archivo son tipos distintos
+    if not isinstance(value, expected) or (expected is int and isinstance(value, bool)):
+        raise ProfileError(f"{where}: se esperaba {expected.__name__}, no {type(value).__name__}")
+
+
+def _check_config(config, where: str):
+    """Comprueba los tipos y rangos de una configuración leída del archivo"""
+    _check_type(config, dict, where)
+    for key, value in config.items():
+        expected = _CONFIG_TYPES.get(key)
+        if expected is None:
+            continue    # Claves desconocidas: se ignoran al crear la ClockConfig
+        _check_type(value, expected, f"{where}.{key}")
+        if key == 'mode' and value not in set(WindowMode):
+            raise ProfileError(f"{where}.mode: modo desconocido {value}")
+        if key in _CONFIG_RANGES:
+            low, high = _CONFIG_RANGES[key]
+            if value < low or (high is not None and value > high):
+                limits = f"entre {low} y {high}" if high is not None else f"mayor o igual que {low}"
+                raise ProfileError(f"{where}.{key}: {value} fuera de rango (debe estar {limits})")
+        if key == 'world_zones':
+            for zone in value:
+                _check_type(zone, str, f"{where}.world_zones")
+
+
+@dataclass(frozen=True)
+class Profile:
+    """
+    Configuración del reloj e idioma guardados con un nombre.
+    Sin `config` la ventana se queda con los valores de su archivo .ui.
+    """
+    name: str
+    config: ClockConfig = None
+    language: str = DEFAULT_LANGUAGE
+    
+    def to_dict(self) -> dict:
+        if self.config is None:
+            return {'language': self.language}
+        defaults = ClockConfig().to_dict()
+        config = {key: value for key, value in self.config.to_dict().items()
+                  if defaults[key] != value}
+        return {'language': self.language, 'config': config}
+    
+    @classmethod
+    def from_dict(cls, name: str, data: dict) -> "Profile":
+        """Perfil del archivo; ProfileError si su estructura o sus tipos no son válidos"""
+        _check_type(data, dict, f"Perfil {name!r}")
+        _check_type(data.get('language', DEFAULT_LANGUAGE), str, f"Perfil {name!r}.language")
+        config = data.get('config')
+        if config is not None:
+            _check_config(config, f"Perfil {name!r}.config")
+        return cls(name, ClockConfig.from_dict(config) if config is not None else None,
+                   data.get('language', DEFAULT_LANGUAGE))
+
+
+class ProfileStore:
+    """Perfiles guardados en un archivo y el perfil activo"""
+    
+    def __init__(self, path: str = None):
+        self.path = path
+        self.profiles = {}
+        self.active = DEFAULT_PROFILE
+    
+    @classmethod
+    def load(cls, path: str) -> "ProfileStore":
+        """
+        Lee el archivo de perfiles. Si no existe o no se puede leer se
+        empieza con el perfil por defecto (el arranque nunca falla por él).
+        """
+        store = cls(path)
+        try:
+            with open(path, 'rb') as profile_file:
+                store.update_from_dict(json.loads(profile_file.read()))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError, KeyError, AttributeError) as error:
+            logger.warning("Perfiles no cargados de %s: %s", path, error)
+        return store
+    
+    def update_from_dict(self, data: dict):
+        """
+        Sustituye los perfiles por los de `data` (el contenido del archivo).
+        ProfileError si no es un objeto de esta versión con un objeto por
+        perfil; sin cambios en ese caso.
+        """
+        _check_type(data, dict, "Archivo de perfiles")
+        version = data.get('v')
+        if version != PROFILE_VERSION:
+            raise ProfileError(f"Versión de perfiles no soportada: {version}")
+        if 'profiles' not in data:
+            raise ProfileError("Archivo de perfiles sin 'profiles'")
+        profiles = data['profiles']
+        _check_type(profiles, dict, "profiles")
+        active = data.get('active', DEFAULT_PROFILE)
+        _check_type(active, str, "active")
+        self.profiles = {name: Profile.from_dict(name, profile)
+                         for name, profile in profiles.items()}
+        self.active = active
+    
+    def to_dict(self) -> dict:
+        return {
+            'v': PROFILE_VERSION,
+            'active': self.active,
+            'profiles': {name: profile.to_dict() for name, profile in self.profiles.items()},
+        }
+    
+    def save(self):
+        """Escribe el archivo de forma atómica (archivo temporal y renombrado)"""
+        if self.path is None:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = f"{self.path}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as profile_file:
+            json.dump(self.to_dict(), profile_file, separators=(',', ':'), ensure_ascii=False)
+        os.replace(temporary, self.path)
+    
+    def names(self):
+        return sorted(self.profiles)
+    
+    def get(self, name: str) -> Profile:
+        """Perfil con ese nombre (uno por defecto si no existe)"""
+        return self.profiles.get(name) or Profile(name)
+    
+    def active_profile(self) -> Profile:
+        return self.get(self.active)
+    
+    def put(self, profile: Profile):
+        """Guarda o sustituye un perfil"""
+        if not profile.name.strip():
+            raise ProfileError("El perfil necesita un nombre")
+        self.profiles[profile.name] = profile
+    
+    def remove(self, name: str):
+        self.profiles.pop(name, None)
+        if self.active == name:
+            self.active = DEFAULT_PROFILE
+    
+    def activate(self, name: str) -> Profile:
+        """Marca el perfil como activo y lo devuelve"""
+        self.active = name
+        return self.get(name)
@@ -0,0 +1,303 @@
+"""
+Reglas de repetición de alarmas
+Admite expresiones cron de cinco campos ("55 8 * * 1-5") y un subconjunto de
+RRULE (RFC 5545): "FREQ=MINUTELY;INTERVAL=15;BYHOUR=16-19". Cada regla se
+compila una sola vez en conjuntos de valores permitidos y el siguiente
+disparo se calcula saltando campo a campo, sin recorrer minuto a minuto.
+"""
+from bisect import bisect_left
+from datetime import datetime, timedelta
+
+
+class RecurrenceError(ValueError):
+    """Expresión de repetición no válida"""
+
+
+# Días de la semana con lunes = 0 (como datetime.weekday())
+WEEKDAY_NAMES = {'MON': 0, 'TUE': 1, 'WED': 2, 'THU': 3, 'FRI': 4, 'SAT': 5, 'SUN': 6}
+RRULE_WEEKDAYS = {'MO': 0, 'TU': 1, 'WE': 2, 'TH': 3, 'FR': 4, 'SA': 5, 'SU': 6}
+MONTH_NAMES = {name: index + 1 for index, name in enumerate(
+    ('JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN', 'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC'))}
+
+# Días que se exploran como máximo buscando el siguiente disparo
+# (un 29 de febrero en lunes puede tardar 28 años)
+MAX_SEARCH_DAYS = 366 * 29
+
+# Frecuencias de RRULE soportadas
+FREQUENCIES = ('MINUTELY', 'HOURLY', 'DAILY', 'WEEKLY', 'MONTHLY', 'YEARLY')
+
+
+def _parse_value(text: str, names: dict, low: int, high: int):
+    value = names.get(text.upper()) if names else None
+    if value is None:
+        try:
+            value = int(text)
+        except ValueError:
+            raise RecurrenceError(f"Valor no válido: {text}") from None
+    if not low <= value <= high:
+        raise RecurrenceError(f"Valor fuera de rango ({low}-{high}): {text}")
+    return value
+
+
+def _parse_field(text: str, low: int, high: int, names: dict = None):
+    """
+    Campo cron o lista BY*: "*", "5", "1-5", "*/15", "8-18/2", "MON,WED"
+    Devuelve el conjunto de valores permitidos
+    """
+    values = set()
+    for part in text.split(','):
+        part = part.strip()
+        if not part:
+            raise RecurrenceError(f"Campo vacío en: {text}")
+        range_text, _, step_text = part.partition('/')
+        step = 1
+        if step_text:
+            step = _parse_value(step_text, None, 1, high - low + 1)
+        if range_text == '*':
+            start, end = low, high
+        elif '-' in range_text:
+            first, _, last = range_text.partition('-')
+            start = _parse_value(first, names, low, high)
+            end = _parse_value(last, names, low, high)
+            if end < start:
+                raise RecurrenceError(f"Rango invertido: {part}")
+        else:
+            start = _parse_value(range_text, names, low, high)
+            end = high if step_text else start
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class _Period:
+    """
+    Restricción de INTERVAL de una RRULE: solo valen los periodos
+    (minutos, horas, días, semanas, meses o años) que distan del inicio un
+    múltiplo del intervalo
+    """
+    
+    __slots__ = ('freq', 'interval', 'start')
+    
+    def __init__(self, freq: str, interval: int, start: datetime):
+        self.freq = freq
+        self.interval = interval
+        self.start = start
+    
+    def _day_index(self, day):
+        return (day - self.start.date()).days
+    
+    def day_allowed(self, day):
+        """Para frecuencias de un día o más: ¿el día cae en un periodo válido?"""
+        if self.freq == 'DAILY':
+            return self._day_index(day) % self.interval == 0
+        if self.freq == 'WEEKLY':
+            start_monday = self.start.date() - timedelta(days=self.start.weekday())
+            return ((day - start_monday).days // 7) % self.interval == 0
+        if self.freq == 'MONTHLY':
+            months = (day.year - self.start.year) * 12 + day.month - self.start.month
+            return months % self.interval == 0
+        if self.freq == 'YEARLY':
+            return (day.year - self.start.year) % self.interval == 0
+        return True
+    
+    def hour_allowed(self, day, hour: int):
+        if self.freq != 'HOURLY':
+            return True
+        return (self._day_index(day) * 24 + hour - self.start.hour) % self.interval == 0
+    
+    def minute_allowed(self, day, hour: int, minute: int):
+        if self.freq != 'MINUTELY':
+            return True
+        elapsed = (self._day_index(day) * 24 + hour) * 60 + minute
+        return (elapsed - self.start.hour * 60 - self.start.minute) % self.interval == 0
+
+
+class RecurrenceRule:
+    """
+    Regla compilada: conjuntos de minutos, horas, días del mes, meses y días
+    de la semana permitidos, más el intervalo de una RRULE.
+    `next_after(moment)` da el primer disparo estrictamente posterior.
+    """
+    
+    def __init__(self, expression: str, minutes, hours, monthdays, months, weekdays,
+                 day_or: bool = False, period: _Period = None, start: datetime = None,
+                 until: datetime = None, count: int = None):
+        self.expression = expression
+        self.minutes = sorted(minutes)
+        self.hours = sorted(hours)
+        self.monthdays = frozenset(monthdays)
+        self.months = frozenset(months)
+        self.weekdays = frozenset(weekdays)
+        # En cron, con día del mes y día de la semana restringidos basta uno de los dos
+        self.day_or = day_or
+        self.period = period
+        self.start = start
+        self.until = until
+        self.count = count
+    
+    def __repr__(self):
+        return f"RecurrenceRule({self.expression!r})"
+    
+    def _day_matches(self, day):
+        if day.month not in self.months:
+            return False
+        if self.day_or:
+            if day.day not in self.monthdays and day.weekday() not in self.weekdays:
+                return False
+        elif day.day not in self.monthdays or day.weekday() not in self.weekdays:
+            return False
+        return self.period is None or self.period.day_allowed(day)
+    
+    def _first_in_day(self, day, hour: int, minute: int):
+        """Primer (hora, minuto) permitido del día a partir de hour:minute"""
+        period = self.period
+        for h in self.hours[bisect_left(self.hours, hour):]:
+            if period is not None and not period.hour_allowed(day, h):
+                continue
+            first = minute if h == hour else 0
+            for m in self.minutes[bisect_left(self.minutes, first):]:
+                if period is None or period.minute_allowed(day, h, m):
+                    return h, m
+        return None
+    
+    def next_after(self, moment: datetime):
+        """Primer disparo posterior a `moment` (o None si la regla ya no dispara)"""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        if self.start is not None and candidate < self.start:
+            candidate = self.start.replace(second=0, microsecond=0)
+        day = candidate.date()
+        hour, minute = candidate.hour, candidate.minute
+        for _ in range(MAX_SEARCH_DAYS):
+            if self._day_matches(day):
+                found = self._first_in_day(day, hour, minute)
+                if found is not None:
+                    fire = datetime(day.year, day.month, day.day, found[0], found[1])
+                    if self.until is not None and fire > self.until:
+                        return None
+                    return fire
+            day += timedelta(days=1)
+            hour = minute = 0
+            if self.until is not None and day > self.until.date():
+                return None
+        return None
+    
+    def occurrences(self, after: datetime):
+        """
+        Generador de disparos posteriores a `after`.
+        Con COUNT cuenta también los disparos anteriores desde DTSTART.
+        """
+        remaining = self.count
+        moment = after
+        if remaining is not None and self.start is not None:
+            moment = self.start - timedelta(minutes=1)
+        while remaining is None or remaining > 0:
+            fire = self.next_after(moment)
+            if fire is None:
+                return
+            if remaining is not None:
+                remaining -= 1
+            moment = fire
+            if fire > after:
+                yield fire
+
+
+def parse_cron(expression: str):
+    """Compila una expresión cron de cinco campos: minuto hora día mes día_semana"""
+    fields = expression.split()
+    if len(fields) != 5:
+        raise RecurrenceError(f"Una expresión cron necesita cinco campos: {expression}")
+    minute, hour, monthday, month, weekday = fields
+    # En cron el domingo es 0 (o 7); aquí el lunes es 0
+    cron_weekdays = _parse_field(weekday, 0, 7, {name: (value + 1) % 7
+                                                   for name, value in WEEKDAY_NAMES.items()})
+    return RecurrenceRule(
+        expression,
+        _parse_field(minute, 0, 59),
+        _parse_field(hour, 0, 23),
+        _parse_field(monthday, 1, 31),
+        _parse_field(month, 1, 12, MONTH_NAMES),
+        {(value - 1) % 7 for value in cron_weekdays},
+        day_or=monthday != '*' and weekday != '*',
+    )
+
+
+def _parse_datetime(text: str):
+    """Fecha de DTSTART/UNTIL: 20250101T080000 o 20250101"""
+    text = text.rstrip('Z')
+    for pattern in ("%Y%m%dT%H%M%S", "%Y%m%dT%H%M", "%Y%m%d"):
+        try:
+            return datetime.strptime(text, pattern)
+        except ValueError:
+            continue
+    raise RecurrenceError(f"Fecha no válida: {text}")
+
+
+def parse_rrule(expression: str, start: datetime = None):
+    """
+    Compila una RRULE con FREQ, INTERVAL, BYMONTH, BYMONTHDAY, BYDAY, BYHOUR,
+    BYMINUTE, DTSTART, UNTIL y COUNT. Los campos no indicados toman el valor
+    de DTSTART como en el RFC (o del instante `start` si no hay DTSTART).
+    """
+    text = expression.strip()
+    if text.upper().startswith("RRULE:"):
+        text = text[6:]
+    parts = {}
+    for item in text.split(';'):
+        if not item.strip():
+            continue
+        key, sep, value = item.partition('=')
+        if not sep:
+            raise RecurrenceError(f"Parte de RRULE no válida: {item}")
+        parts[key.strip().upper()] = value.strip()
+    
+    freq = parts.pop('FREQ', '').upper()
+    if freq not in FREQUENCIES:
+        raise RecurrenceError(f"FREQ no soportada: {freq or '(vacía)'}")
+    interval = _parse_value(parts.pop('INTERVAL', '1'), None, 1, 10000)
+    if 'DTSTART' in parts:
+        start = _parse_datetime(parts.pop('DTSTART'))
+    elif start is None:
+        start = datetime.now()
+    start = start.replace(second=0, microsecond=0)
+    until = _parse_datetime(parts.pop('UNTIL')) if 'UNTIL' in parts else None
+    count = _parse_value(parts.pop('COUNT'), None, 1, 1000000) if 'COUNT' in parts else None
+    if until is not None and count is not None:
+        raise RecurrenceError("UNTIL y COUNT no pueden usarse a la vez")
+    
+    by = {}
+    for key, low, high, names in (('BYMINUTE', 0, 59, None), ('BYHOUR', 0, 23, None),
+                                  ('BYMONTHDAY', 1, 31, None), ('BYMONTH', 1, 12, MONTH_NAMES),
+                                  ('BYDAY', 0, 6, RRULE_WEEKDAYS)):
+        if key in parts:
+            by[key] = _parse_field(parts.pop(key), low, high, names)
+    if parts:
+        raise RecurrenceError(f"Partes de RRULE no soportadas: {', '.join(sorted(parts))}")
+    
+    # Lo que no fija la regla se hereda de DTSTART según la frecuencia
+    all_minutes, all_hours = range(60), range(24)
+    minutes = by.get('BYMINUTE', all_minutes if freq == 'MINUTELY' else {start.minute})
+    hours = by.get('BYHOUR', all_hours if freq in ('MINUTELY', 'HOURLY') else {start.hour})
+    weekdays = by.get('BYDAY', range(7))
+    monthdays = by.get('BYMONTHDAY', range(1, 32))
+    months = by.get('BYMONTH', range(1, 13))
+    if freq == 'WEEKLY' and 'BYDAY' not in by:
+        weekdays = {start.weekday()}
+    if freq in ('MONTHLY', 'YEARLY') and 'BYDAY' not in by and 'BYMONTHDAY' not in by:
+        monthdays = {start.day}
+    if freq == 'YEARLY' and 'BYMONTH' not in by:
+        months = {start.month}
+    
+    period = _Period(freq, interval, start) if interval > 1 else None
+    return RecurrenceRule(expression, minutes, hours, monthdays, months, weekdays,
+                          period=period, start=start, until=until, count=count)
+
+
+def compile_rule(expression: str, start: datetime = None):
+    """Compila una expresión cron o RRULE (se distingue por contener FREQ=)"""
+    if 'FREQ=' in expression.upper():
+        return parse_rrule(expression, start)
+    return parse_cron(expression)
+
+
+def daily_rule(hour: int, minute: int):
+    """Regla de la alarma diaria clásica a hour:minute"""
+    return parse_cron(f"{minute} {hour} * * *")
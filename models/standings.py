@@ -0,0 +1,192 @@
+"""
+Clasificación del torneo
+Se actualiza de forma incremental con cada resultado: los agregados de
+cada equipo se modifican en O(1) y el orden se mantiene en un índice
+ordenado con bisect. Buscar la posición es O(log n), pero insertar y
+borrar en la lista desplaza elementos, así que cada resultado cuesta O(n)
+(un memmove de punteros, despreciable con los cientos de equipos de un
+torneo; no se recalcula ni se reordena la tabla entera)
+"""
+from bisect import bisect_left, insort
+
+
+POINTS_WIN = 3
+POINTS_DRAW = 1
+
+
+class TeamRecord:
+    """Agregados de un equipo en la clasificación"""
+    
+    __slots__ = ('team', 'played', 'won', 'drawn', 'lost',
+                 'goals_for', 'goals_against', 'points')
+    
+    def __init__(self, team: str):
+        self.team = team
+        self.played = 0
+        self.won = 0
+        self.drawn = 0
+        self.lost = 0
+        self.goals_for = 0
+        self.goals_against = 0
+        self.points = 0
+    
+    @property
+    def goal_difference(self):
+        return self.goals_for - self.goals_against
+    
+    def sort_key(self):
+        """Clave de orden: puntos, diferencia de goles, goles a favor, nombre"""
+        return (-self.points, -self.goal_difference, -self.goals_for, self.team)
+    
+    def add_result(self, scored: int, conceded: int):
+        """Suma un partido jugado"""
+        self.played += 1
+        self.goals_for += scored
+        self.goals_against += conceded
+        if scored > conceded:
+            self.won += 1
+            self.points += POINTS_WIN
+        elif scored == conceded:
+            self.drawn += 1
+            self.points += POINTS_DRAW
+        else:
+            self.lost += 1
+    
+    def to_dict(self):
+        """Serializa el registro"""
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+    
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Reconstruye un registro serializado con to_dict"""
+        record = cls(data['team'])
+        for slot in cls.__slots__:
+            setattr(record, slot, data[slot])
+        return record
+
+
+class StandingsTable:
+    """
+    Clasificación incremental.
+    Los empates a puntos, diferencia y goles a favor se deshacen con el
+    enfrentamiento directo al pedir la clasificación completa.
+    """
+    
+    def __init__(self):
+        self.records = {}
+        # Enfrentamientos directos: (equipo, rival) -> [puntos, diferencia de goles]
+        self._head_to_head = {}
+        # Índice ordenado de claves y clave actual de cada equipo
+        self._index = []
+        self._keys = {}
+    
+    def add_team(self, team: str):
+        """Registra un equipo sin partidos"""
+        if team in self.records:
+            return self.records[team]
+        record = TeamRecord(team)
+        self.records[team] = record
+        key = record.sort_key()
+        self._keys[team] = key
+        insort(self._index, key)
+        return record
+    
+    def record_result(self, team1: str, team2: str, score1: int, score2: int):
+        """Suma el resultado de un partido"""
+        record1 = self.add_team(team1)
+        record2 = self.add_team(team2)
+        
+        record1.add_result(score1, score2)
+        record2.add_result(score2, score1)
+        
+        points1, points2 = self._points(score1, score2), self._points(score2, score1)
+        h2h = self._head_to_head.setdefault((team1, team2), [0, 0])
+        h2h[0] += points1
+        h2h[1] += score1 - score2
+        h2h = self._head_to_head.setdefault((team2, team1), [0, 0])
+        h2h[0] += points2
+        h2h[1] += score2 - score1
+        
+        self._reindex(record1)
+        self._reindex(record2)
+    
+    @staticmethod
+    def _points(scored: int, conceded: int):
+        if scored > conceded:
+            return POINTS_WIN
+        if scored == conceded:
+            return POINTS_DRAW
+        return 0
+    
+    def _reindex(self, record: TeamRecord):
+        """Mueve el equipo a su nueva posición en el índice (O(n) por el desplazamiento)"""
+        old_key = self._keys[record.team]
+        del self._index[bisect_left(self._index, old_key)]
+        new_key = record.sort_key()
+        self._keys[record.team] = new_key
+        insort(self._index, new_key)
+    
+    def head_to_head(self, team: str, rival: str):
+        """Puntos y diferencia de goles de `team` contra `rival`"""
+        return tuple(self._head_to_head.get((team, rival), (0, 0)))
+    
+    def position(self, team: str):
+        """Posición (1..n) según el índice, sin desempate directo"""
+        return bisect_left(self._index, self._keys[team]) + 1
+    
+    def top(self, count: int):
+        """Primeros equipos según el índice (para marcadores en directo)"""
+        return [self.records[key[3]] for key in self._index[:count]]
+    
+    def ranking(self):
+        """Clasificación completa con desempate por enfrentamiento directo"""
+        ordered = []
+        group = []
+        group_key = None
+        for key in self._index:
+            if key[:3] != group_key:
+                ordered += self._break_tie(group)
+                group = []
+                group_key = key[:3]
+            group.append(key[3])
+        ordered += self._break_tie(group)
+        return [self.records[team] for team in ordered]
+    
+    def _break_tie(self, teams):
+        """Ordena un grupo empatado por sus enfrentamientos directos"""
+        if len(teams) < 2:
+            return teams
+        
+        def mini_league(team):
+            points = goal_difference = 0
+            for rival in teams:
+                if rival != team:
+                    h2h_points, h2h_difference = self.head_to_head(team, rival)
+                    points += h2h_points
+                    goal_difference += h2h_difference
+            return (-points, -goal_difference, team)
+        
+        return sorted(teams, key=mini_league)
+    
+    def to_dict(self):
+        """Serializa la clasificación"""
+        return {
+            'records': [record.to_dict() for record in self.records.values()],
+            'head_to_head': [
+                [team, rival, values[0], values[1]]
+                for (team, rival), values in self._head_to_head.items()
+            ],
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Reconstruye una clasificación serializada con to_dict"""
+        table = cls()
+        for record_data in data['records']:
+            record = TeamRecord.from_dict(record_data)
+            table.records[record.team] = record
+            table._keys[record.team] = record.sort_key()
+        table._index = sorted(table._keys.values())
+        for team, rival, points, goal_difference in data['head_to_head']:
+            table._head_to_head[(team, rival)] = [points, goal_difference]
+        return table
@@ -0,0 +1,146 @@
+"""
+Fuentes de tiempo
+Los modelos y controladores leen la hora de pared y el tiempo monótono a
+través de una TimeSource en lugar de llamar a time.time() o
+datetime.now(). RealTimeSource usa el reloj del sistema; VirtualTimeSource
+solo avanza cuando se le pide y ejecuta en orden los plazos programados,
+así un partido de 90 minutos se simula en milisegundos y siempre igual.
+"""
+import heapq
+import itertools
+import time as _time
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+
+class TimeSource(ABC):
+    """Interfaz de una fuente de tiempo"""
+    
+    # Las fuentes virtuales programan sus propios plazos (ver VirtualTimeSource.call_later)
+    virtual = False
+    
+    @abstractmethod
+    def time(self) -> float:
+        """Hora de pared en segundos epoch (puede saltar)"""
+    
+    @abstractmethod
+    def monotonic(self) -> float:
+        """Segundos que solo crecen, para medir duraciones"""
+    
+    def now(self) -> datetime:
+        """Hora de pared local como datetime"""
+        return datetime.fromtimestamp(self.time())
+
+
+class RealTimeSource(TimeSource):
+    """Reloj del sistema"""
+    
+    def time(self) -> float:
+        return _time.time()
+    
+    def monotonic(self) -> float:
+        return _time.monotonic()
+
+
+class FunctionTimeSource(RealTimeSource):
+    """
+    Hora de pared dada por una función (por ejemplo la hora del nodo
+    principal en un seguidor sincronizado) y tiempo monótono del sistema
+    """
+    
+    def __init__(self, time_function):
+        self.time_function = time_function
+    
+    def time(self) -> float:
+        return self.time_function()
+
+
+class VirtualTimeSource(TimeSource):
+    """
+    Tiempo que avanza a mano. Los plazos se programan en tiempo monótono con
+    call_later y se ejecutan dentro de advance, cada uno con el reloj puesto
+    exactamente en su instante.
+    """
+    
+    virtual = True
+    
+    def __init__(self, start: float = None, monotonic_start: float = 0.0):
+        self._wall = _time.time() if start is None else float(start)
+        self._monotonic = float(monotonic_start)
+        self._order = itertools.count()
+        self._pending = []          # (instante monótono, orden, callback)
+        self._scheduled = set()     # Ids aún en _pending y no cancelados
+        self._cancelled = set()
+        self.fired = 0
+    
+    def time(self) -> float:
+        return self._wall
+    
+    def monotonic(self) -> float:
+        return self._monotonic
+    
+    def call_later(self, delay: float, callback):
+        """Programa `callback()` dentro de `delay` segundos; devuelve el id para cancel"""
+        handle = next(self._order)
+        heapq.heappush(self._pending, (self._monotonic + max(0.0, delay), handle, callback))
+        self._scheduled.add(handle)
+        return handle
+    
+    def cancel(self, handle: int):
+        """Anula un plazo pendiente (sin efecto si ya se ejecutó)"""
+        if handle in self._scheduled:
+            self._scheduled.discard(handle)
+            self._cancelled.add(handle)
+    
+    def next_deadline(self):
+        """Instante monótono del próximo plazo pendiente (None si no hay)"""
+        self._discard_cancelled()
+        return self._pending[0][0] if self._pending else None
+    
+    def _discard_cancelled(self):
+        pending = self._pending
+        while pending and pending[0][1] in self._cancelled:
+            self._cancelled.discard(heapq.heappop(pending)[1])
+    
+    def _move_to(self, instant: float):
+        self._wall += instant - self._monotonic
+        self._monotonic = instant
+    
+    def advance(self, seconds: float):
+        """Avanza el tiempo ejecutando en orden los plazos que venzan"""
+        target = self._monotonic + seconds
+        while True:
+            deadline = self.next_deadline()
+            if deadline is None or deadline > target:
+                break
+            _, handle, callback = heapq.heappop(self._pending)
+            self._scheduled.discard(handle)
+            self._move_to(max(deadline, self._monotonic))
+            self.fired += 1
+            callback()
+        self._move_to(target)
+    
+    def advance_to_next(self):
+        """Salta directamente al próximo plazo y lo ejecuta (False si no hay)"""
+        deadline = self.next_deadline()
+        if deadline is None:
+            return False
+        self.advance(max(0.0, deadline - self._monotonic))
+        return True
+    
+    def set_time(self, wall: float):
+        """Cambia la hora de pared sin mover el tiempo monótono (salto de reloj)"""
+        self._wall = float(wall)
+
+
+# Fuente por defecto de todos los modelos y controladores
+REAL_TIME = RealTimeSource()
+
+
+def as_time_source(source):
+    """Acepta una TimeSource, una función de hora de pared o None (reloj del sistema)"""
+    if source is None:
+        return REAL_TIME
+    if isinstance(source, TimeSource):
+        return source
+    return FunctionTimeSource(source)
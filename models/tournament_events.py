@@ -0,0 +1,52 @@
+"""
+Eventos del torneo
+El estado de TournamentModel es el resultado de aplicar en orden
+estos eventos (event sourcing)
+"""
+
+
+# Tipos de evento
+MATCH_CREATED = "match_created"
+MATCH_STARTED = "match_started"
+MATCH_EVENT = "match_event"
+MATCH_ENDED = "match_ended"
+MATCH_RESTORED = "match_restored"
+FIXTURES_GENERATED = "fixtures_generated"
+GOAL_SCORED = "goal_scored"
+MATCH_INCIDENT = "match_incident"
+ROSTER_IMPORTED = "roster_imported"
+
+
+class TournamentEvent:
+    """Evento inmutable del registro del torneo"""
+    
+    __slots__ = ('seq', 'timestamp', 'kind', 'match_id', 'payload')
+    
+    def __init__(self, seq: int, timestamp: float, kind: str, match_id: int, payload: dict):
+        object.__setattr__(self, 'seq', seq)
+        object.__setattr__(self, 'timestamp', timestamp)
+        object.__setattr__(self, 'kind', kind)
+        object.__setattr__(self, 'match_id', match_id)
+        object.__setattr__(self, 'payload', payload)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("TournamentEvent es inmutable")
+    
+    def __repr__(self):
+        return f"TournamentEvent({self.seq}, {self.kind!r}, match={self.match_id})"
+    
+    def to_dict(self):
+        """Serializa el evento"""
+        return {
+            'seq': self.seq,
+            'timestamp': self.timestamp,
+            'kind': self.kind,
+            'match_id': self.match_id,
+            'payload': self.payload,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Reconstruye un evento serializado con to_dict"""
+        return cls(data['seq'], data['timestamp'], data['kind'],
+                   data['match_id'], data['payload'])
@@ -1,13 +1,34 @@
 """
 Modelo para la gestión de torneos de fútbol
+El estado del torneo se obtiene aplicando en orden un registro de eventos;
+las instantáneas periódicas acotan el coste de reconstruirlo
 """
+import logging
+from bisect import bisect_right
 from datetime import datetime
 
+from models.tournament_events import (
+    TournamentEvent, MATCH_CREATED, MATCH_STARTED, MATCH_EVENT,
+    MATCH_ENDED, MATCH_RESTORED, FIXTURES_GENERATED, GOAL_SCORED, MATCH_INCIDENT,
+    ROSTER_IMPORTED
+)
+from models.match_events import MatchEvent, MatchEventIndex, MatchEventType
+from models.standings import StandingsTable
+from models.fixtures import (
+    Fixture, generate_fixtures, swiss_pairings, assign_slots, resolve_seeds, knockout_bracket
+)
+from models.time_source import as_time_source
+
+
+logger = logging.getLogger(__name__)
+
 
 class Match:
     """Representa un partido de fútbol"""
     
-    def __init__(self, team1: str, team2: str, duration_minutes: int):
+    def __init__(self, team1: str, team2: str, duration_minutes: int, match_id: int = None,
+                 time_source=None):
+        self.match_id = match_id
         self.team1 = team1
         self.team2 = team2
         self.duration_minutes = duration_minutes
@@ -16,42 +37,232 @@ class Match:
         self.end_time = None
         self.events = []
         self.in_progress = False
+        self.score1 = 0
+        self.score2 = 0
+        # Penaltis marcados en la tanda (desempatan sin cambiar el marcador)
+        self.shootout1 = 0
+        self.shootout2 = 0
+        
+        # Eventos tipados indexados por tiempo de juego y equipo
+        self.timeline = MatchEventIndex()
+        
+        # Torneo que registra los eventos del partido (None si es independiente)
+        self._journal = None
+        # Hora de los eventos de un partido independiente (el torneo usa la suya)
+        self.time_source = as_time_source(time_source)
     
     def start(self):
         """Inicia el partido"""
-        self.start_time = datetime.now()
-        self.in_progress = True
-        self.add_event(f"El partido ha comenzado: {self.team1} vs {self.team2}")
+        self._record(MATCH_STARTED, {})
     
     def end(self):
         """Finaliza el partido"""
-        self.end_time = datetime.now()
-        self.in_progress = False
-        self.add_event(f"Match ended")
+        self._record(MATCH_ENDED, {})
     
     def add_event(self, event: str):
         """Añade un evento al registro del partido"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.events.append(f"[{timestamp}] {event}")
+        self._record(MATCH_EVENT, {'text': event})
+    
+    def score_goal(self, team: str, player: str = None, clock_seconds: int = 0):
+        """Anota un gol para uno de los dos equipos"""
+        self.add_match_event(MatchEventType.GOAL, team, player, clock_seconds)
+    
+    def add_match_event(self, event_type: MatchEventType, team: str, player: str = None,
+                        clock_seconds: int = 0, detail: str = None):
+        """Registra un evento tipado en el tiempo de juego indicado (segundos)"""
+        if team not in (self.team1, self.team2):
+            raise ValueError(f"{team} no juega este partido")
+        if not self.in_progress:
+            raise ValueError("El partido no está en curso")
+        
+        event = MatchEvent(event_type, team, player, clock_seconds, detail)
+        kind = GOAL_SCORED if event_type == MatchEventType.GOAL else MATCH_INCIDENT
+        self._record(kind, event.to_dict())
+    
+    def events_between(self, start_minute: int, end_minute: int,
+                       team: str = None, event_type: MatchEventType = None):
+        """Eventos entre dos minutos de juego (ambos incluidos)"""
+        return self.timeline.between(
+            (start_minute - 1) * 60, end_minute * 60 - 1, team, event_type
+        )
+    
+    def get_stats(self):
+        """Recuento de eventos por equipo y tipo"""
+        return self.timeline.stats((self.team1, self.team2))
+    
+    def get_report(self):
+        """Informe del partido: marcador y eventos en orden de juego"""
+        lines = [self.get_score_info()]
+        lines += [event.describe() for event in self.timeline.all_events()]
+        return lines
+    
+    def get_score(self):
+        """Marcador actual (goles equipo 1, goles equipo 2)"""
+        return self.score1, self.score2
+    
+    def get_winner(self):
+        """Equipo ganador (con empate, el de la tanda de penaltis), o None si hay empate"""
+        if self.score1 > self.score2:
+            return self.team1
+        if self.score2 > self.score1:
+            return self.team2
+        if self.shootout1 > self.shootout2:
+            return self.team1
+        if self.shootout2 > self.shootout1:
+            return self.team2
+        return None
+    
+    def _record(self, kind: str, payload: dict):
+        """Envía el evento al registro del torneo o lo aplica directamente"""
+        if self._journal is not None:
+            self._journal.record(kind, self.match_id, payload)
+        else:
+            self.apply(kind, self.time_source.time(), payload)
+    
+    def apply(self, kind: str, timestamp: float, payload: dict):
+        """Aplica un evento al estado del partido"""
+        if kind == MATCH_EVENT:
+            self._log(timestamp, payload['text'])
+        elif kind == MATCH_STARTED:
+            self.start_time = datetime.fromtimestamp(timestamp)
+            self.in_progress = True
+            self._log(timestamp, f"El partido ha comenzado: {self.team1} vs {self.team2}")
+        elif kind == GOAL_SCORED:
+            event = MatchEvent.from_dict(payload)
+            if event.team == self.team1:
+                self.score1 += 1
+            else:
+                self.score2 += 1
+            self.timeline.add(event)
+            self._log(timestamp, f"Gol de {event.team} ({self.score1}-{self.score2}) {event.minute}'")
+        elif kind == MATCH_INCIDENT:
+            event = MatchEvent.from_dict(payload)
+            if event.type == MatchEventType.SHOOTOUT:
+                if event.team == self.team1:
+                    self.shootout1 += 1
+                else:
+                    self.shootout2 += 1
+            self.timeline.add(event)
+            self._log(timestamp, event.describe())
+        elif kind == MATCH_ENDED:
+            self.end_time = datetime.fromtimestamp(timestamp)
+            self.in_progress = False
+            self._log(timestamp, "Match ended")
+    
+    def _log(self, timestamp: float, text: str):
+        """Añade una línea al registro visible del partido"""
+        stamp = datetime.fromtimestamp(timestamp).strftime("%H:%M:%S")
+        self.events.append(f"[{stamp}] {text}")
     
     def get_match_info(self):
         """Obtiene información del partido"""
         return f"{self.team1} vs {self.team2} ({self.duration_minutes} min)"
+    
+    def get_score_info(self):
+        """Obtiene el marcador como texto"""
+        text = f"{self.team1} {self.score1} - {self.score2} {self.team2}"
+        if self.shootout1 or self.shootout2:
+            text += f" ({self.shootout1}-{self.shootout2} pen.)"
+        return text
+    
+    def to_dict(self):
+        """Serializa el partido"""
+        return {
+            'match_id': self.match_id,
+            'team1': self.team1,
+            'team2': self.team2,
+            'duration_minutes': self.duration_minutes,
+            'start_time': self.start_time.isoformat() if self.start_time else None,
+            'end_time': self.end_time.isoformat() if self.end_time else None,
+            'events': list(self.events),
+            'in_progress': self.in_progress,
+            'score1': self.score1,
+            'score2': self.score2,
+            'shootout1': self.shootout1,
+            'shootout2': self.shootout2,
+            'timeline': [event.to_dict() for event in self.timeline.all_events()],
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict, time_source=None):
+        """Reconstruye un partido serializado con to_dict"""
+        match = cls(data['team1'], data['team2'], data['duration_minutes'], data.get('match_id'),
+                    time_source)
+        if data['start_time']:
+            match.start_time = datetime.fromisoformat(data['start_time'])
+        if data['end_time']:
+            match.end_time = datetime.fromisoformat(data['end_time'])
+        match.events = list(data['events'])
+        match.in_progress = data['in_progress']
+        match.score1 = data.get('score1', 0)
+        match.score2 = data.get('score2', 0)
+        match.shootout1 = data.get('shootout1', 0)
+        match.shootout2 = data.get('shootout2', 0)
+        for event_data in data.get('timeline', ()):
+            match.timeline.add(MatchEvent.from_dict(event_data))
+        return match
 
 
 class TournamentModel:
-    """Modelo para gestionar el torneo"""
+    """
+    Modelo para gestionar el torneo.
+    Toda modificación se registra como un TournamentEvent y el estado
+    (partido actual, historial) es el pliegue de ese registro.
+    """
+    
+    SNAPSHOT_INTERVAL = 256  # Eventos entre instantáneas
     
-    def __init__(self):
+    def __init__(self, snapshot_interval: int = None, time_source=None):
+        self.snapshot_interval = snapshot_interval or self.SNAPSHOT_INTERVAL
+        # Fuente de las marcas de tiempo del registro (virtual en simulaciones)
+        self.time_source = as_time_source(time_source)
+        
+        # Registro ordenado de eventos y sus marcas de tiempo (para bisect)
+        self.event_log = []
+        self._event_times = []
+        
+        # Instantáneas: (seq, estado) ordenadas por seq
+        self._snapshots = []
+        self._snapshot_seqs = []
+        # Partidos terminados ya serializados, reutilizados entre instantáneas
+        self._frozen = {}
+        
+        self._reset_state()
+    
+    def _reset_state(self):
+        """Estado inicial del pliegue"""
         self.current_match = None
         self.match_history = []
+        self.matches = {}
+        self._next_match_id = 1
+        self.standings = StandingsTable()
+        
+        # Equipos registrados y sus jugadores: equipo -> lista de jugadores.
+        # Se sustituye (no se modifica) al importar para compartirlo con las instantáneas
+        self.teams = {}
+        
+        # Calendario generado y siguiente partido pendiente
+        self.fixtures = []
+        self.fixture_info = {}
+        self._fixture_cursor = 0
     
+    # Operaciones (generan eventos)
     def create_match(self, team1: str, team2: str, duration_minutes: int):
         """Crea un nuevo partido"""
         if self.current_match and self.current_match.in_progress:
             raise ValueError("Ya hay un partido en progreso")
         
-        self.current_match = Match(team1, team2, duration_minutes)
+        payload = {
+            'team1': team1,
+            'team2': team2,
+            'duration_minutes': duration_minutes,
+        }
+        # Si es el siguiente partido del calendario, se marca como jugado
+        fixture = self.next_fixture()
+        if fixture is not None and (fixture.team1, fixture.team2) == (team1, team2):
+            payload['fixture'] = self._fixture_cursor
+        
+        self.record(MATCH_CREATED, self._next_match_id, payload)
         return self.current_match
     
     def start_current_match(self):
@@ -67,8 +278,381 @@ class TournamentModel:
             raise ValueError("No hay partido para finalizar")
         
         self.current_match.end()
-        self.match_history.append(self.current_match)
     
     def has_active_match(self):
         """Verifica si hay un partido activo"""
         return self.current_match is not None and self.current_match.in_progress
+    
+    def record_goal(self, team: str, player: str = None, clock_seconds: int = 0):
+        """Anota un gol en el partido actual"""
+        self.record_match_event(MatchEventType.GOAL, team, player, clock_seconds)
+    
+    def record_match_event(self, event_type: MatchEventType, team: str, player: str = None,
+                           clock_seconds: int = 0, detail: str = None):
+        """Registra un evento tipado en el partido actual"""
+        if not self.has_active_match():
+            raise ValueError("No hay partido en curso")
+        
+        self.current_match.add_match_event(event_type, team, player, clock_seconds, detail)
+    
+    def restore_current_match(self, data: dict):
+        """Restaura el partido actual desde una instantánea"""
+        if self.has_active_match():
+            raise ValueError("Ya hay un partido en progreso")
+        
+        self.record(MATCH_RESTORED, self._next_match_id, {'match': data})
+        return self.current_match
+    
+    # Calendario
+    def generate_fixtures(self, teams, format: str = "round_robin", **options):
+        """
+        Genera el calendario en este hilo. Para torneos grandes es preferible
+        calcularlo en otro proceso con models.fixtures.generate_fixtures y
+        cargarlo con load_fixtures.
+        """
+        return self.load_fixtures(generate_fixtures(teams, format, **options))
+    
+    def load_fixtures(self, result: dict):
+        """Carga un calendario generado por models.fixtures.generate_fixtures"""
+        if self.has_active_match():
+            raise ValueError("Ya hay un partido en progreso")
+        
+        self.record(FIXTURES_GENERATED, None, result)
+        return self.fixtures
+    
+    def import_roster(self, teams=(), players=(), fixtures: dict = None):
+        """
+        Aplica en una sola transacción (un evento) equipos, jugadores y
+        calendario ya validados, normalmente un ImportResult de models.importer
+        """
+        teams = list(teams)
+        players = list(players)
+        if fixtures is not None and self.has_active_match():
+            raise ValueError("Ya hay un partido en progreso")
+        known = set(self.teams) | set(teams)
+        for player in players:
+            if player['team'] not in known:
+                raise ValueError(f"Equipo desconocido: {player['team']}")
+        if not teams and not players and fixtures is None:
+            return None
+        
+        return self.record(ROSTER_IMPORTED, None, {
+            'teams': teams,
+            'players': players,
+            'fixtures': fixtures,
+        })
+    
+    def team_names(self):
+        """Equipos registrados, en orden de alta"""
+        return list(self.teams)
+    
+    def next_fixture(self):
+        """Siguiente partido pendiente del calendario (o None)"""
+        if self._fixture_cursor < len(self.fixtures):
+            return self.fixtures[self._fixture_cursor]
+        return None
+    
+    def pending_fixtures(self):
+        """Partidos del calendario que faltan por jugar"""
+        return self.fixtures[self._fixture_cursor:]
+    
+    def next_swiss_round(self, standings=None):
+        """
+        Empareja la siguiente ronda suiza a partir de la clasificación
+        (lista de equipos ordenada) sin repetir cruces ya programados
+        """
+        if self.fixture_info.get('format') != "swiss":
+            raise ValueError("El calendario actual no es de sistema suizo")
+        if self.next_fixture() is not None:
+            raise ValueError("Quedan partidos pendientes en la ronda actual")
+        
+        played = {frozenset((f.team1, f.team2)) for f in self.fixtures}
+        if standings is None:
+            standings = [record.team for record in self.standings.ranking()]
+        round_number = self.fixtures[-1].round + 1 if self.fixtures else 1
+        fixtures, bye = swiss_pairings(standings, played, round_number)
+        self._append_round(fixtures, [bye] if bye else [])
+        return fixtures
+    
+    def next_knockout_round(self):
+        """
+        Empareja la siguiente ronda de eliminatoria con los ganadores de la
+        anterior y, tras la primera ronda, con los exentos. Cada partido de la
+        ronda necesita un ganador (en la prórroga o en los penaltis); si no,
+        ValueError. Devuelve los partidos nuevos, o una lista vacía si ya se
+        jugó la final.
+        """
+        info = self.fixture_info
+        if info.get('format') != "groups_knockout" or not info.get('seeds_resolved'):
+            raise ValueError("El calendario actual no tiene una eliminatoria en juego")
+        if self.next_fixture() is not None or self.has_active_match():
+            raise ValueError("Quedan partidos pendientes en la ronda actual")
+        
+        knockout = [f for f in self.fixtures if f.stage.startswith("knockout")]
+        if not knockout:
+            return []
+        last_round = knockout[-1].round
+        winners = []
+        for fixture in knockout:
+            if fixture.round != last_round:
+                continue
+            match = self.match_for_fixture(fixture)
+            winner = match.get_winner() if match is not None else None
+            if winner is None:
+                raise ValueError(f"{fixture.team1} - {fixture.team2} no tiene ganador")
+            winners.append(winner)
+        
+        # Los exentos (mejores cabezas de serie) entran en la segunda ronda
+        entrants = list(info.get('byes', ())) + winners
+        if len(entrants) < 2:
+            return []
+        _, fixtures = knockout_bracket(entrants, last_round + 1)
+        self._append_round(fixtures, [])
+        return fixtures
+    
+    def match_for_fixture(self, fixture: Fixture):
+        """Último partido jugado entre los equipos de `fixture` (o None)"""
+        for match in reversed(self.match_history):
+            if (match.team1, match.team2) == (fixture.team1, fixture.team2):
+                return match
+        return None
+    
+    def is_knockout_match(self, match: Match) -> bool:
+        """Si el partido es un cruce de eliminatoria ya resuelto del calendario"""
+        if not self.fixture_info.get('seeds_resolved'):
+            return False
+        return any(fixture.stage.startswith("knockout")
+                   and (fixture.team1, fixture.team2) == (match.team1, match.team2)
+                   for fixture in self.fixtures[:self._fixture_cursor])
+    
+    def _append_round(self, fixtures, byes):
+        """Programa una ronda nueva tras la última franja ocupada y la registra"""
+        assign_slots(fixtures, self.fixture_info['pitches'], self.fixture_info['min_rest_slots'])
+        last_slot = max((f.slot for f in self.fixtures), default=-1)
+        offset = last_slot + 1 + self.fixture_info['min_rest_slots']
+        for fixture in fixtures:
+            fixture.slot += offset
+        
+        result = dict(self.fixture_info)
+        result['byes'] = byes
+        result['fixtures'] = [f.to_dict() for f in fixtures]
+        result['append'] = True
+        self.record(FIXTURES_GENERATED, None, result)
+    
+    def resolve_knockout_seeds(self):
+        """
+        Al terminar la fase de grupos, sustituye las plazas simbólicas de la
+        eliminatoria ("1A", "2B"...) por los equipos según la clasificación
+        de cada grupo. Devuelve los partidos pendientes ya resueltos, o una
+        lista vacía si no hay nada que resolver todavía.
+        """
+        info = self.fixture_info
+        if info.get('format') != "groups_knockout" or info.get('seeds_resolved'):
+            return []
+        pending = self.pending_fixtures()
+        if (not pending or self.has_active_match()
+                or any(not fixture.stage.startswith("knockout") for fixture in pending)):
+            return []
+        
+        ranking = [record.team for record in self.standings.ranking()]
+        group_rankings = []
+        for group in info['groups']:
+            members = set(group)
+            group_rankings.append([team for team in ranking if team in members])
+        fixtures, byes = resolve_seeds(pending, info['byes'], group_rankings)
+        
+        result = dict(info)
+        result['byes'] = byes
+        result['fixtures'] = [fixture.to_dict() for fixture in fixtures]
+        result['seeds_resolved'] = True
+        result['resolve'] = True
+        self.record(FIXTURES_GENERATED, None, result)
+        return self.pending_fixtures()
+    
+    # Registro de eventos
+    def record(self, kind: str, match_id: int, payload: dict):
+        """Añade un evento al registro y lo aplica al estado"""
+        timestamp = self.time_source.time()
+        if self._event_times and timestamp < self._event_times[-1]:
+            # Mantener el registro ordenado aunque el reloj del sistema retroceda
+            logger.warning("Reloj retrasado al registrar", extra={
+                'kind': kind, 'behind': self._event_times[-1] - timestamp,
+            })
+            timestamp = self._event_times[-1]
+        
+        event = TournamentEvent(len(self.event_log) + 1, timestamp, kind, match_id, payload)
+        self._append(event)
+        logger.debug("Evento registrado", extra={'seq': event.seq, 'kind': kind, 'match_id': match_id})
+        return event
+    
+    def _append(self, event: TournamentEvent):
+        """Añade un evento ya construido, lo aplica y toma instantánea si toca"""
+        self.event_log.append(event)
+        self._event_times.append(event.timestamp)
+        self._apply(event)
+        if event.seq % self.snapshot_interval == 0:
+            self._take_snapshot(event.seq)
+    
+    def _apply(self, event: TournamentEvent):
+        """Función de pliegue: aplica un evento al estado"""
+        kind = event.kind
+        if kind == MATCH_CREATED:
+            payload = event.payload
+            match = Match(payload['team1'], payload['team2'],
+                          payload['duration_minutes'], event.match_id, self.time_source)
+            self._register_match(match)
+            if 'fixture' in payload:
+                self._fixture_cursor = payload['fixture'] + 1
+        elif kind == FIXTURES_GENERATED:
+            self._apply_fixtures(event.payload)
+        elif kind == ROSTER_IMPORTED:
+            self._apply_roster(event.payload)
+        elif kind == MATCH_RESTORED:
+            match = Match.from_dict(event.payload['match'], self.time_source)
+            match.match_id = event.match_id
+            self._register_match(match)
+        else:
+            match = self.matches[event.match_id]
+            match.apply(kind, event.timestamp, event.payload)
+            if kind == MATCH_ENDED:
+                self.match_history.append(match)
+                self.standings.record_result(match.team1, match.team2, match.score1, match.score2)
+            else:
+                self._frozen.pop(match.match_id, None)
+    
+    def _apply_fixtures(self, result: dict):
+        """Aplica un calendario generado (nuevo o ronda añadida)"""
+        fixtures = [Fixture.from_dict(data) for data in result['fixtures']]
+        if result.get('append'):
+            self.fixtures = self.fixtures + fixtures
+        elif result.get('resolve'):
+            # Partidos pendientes con las plazas de la eliminatoria resueltas
+            self.fixtures = self.fixtures[:self._fixture_cursor] + fixtures
+        else:
+            self.fixtures = fixtures
+            self._fixture_cursor = 0
+        self.fixture_info = {
+            key: value for key, value in result.items()
+            if key not in ('fixtures', 'append', 'resolve')
+        }
+        self._add_teams(self.fixture_info.get('teams', ()))
+    
+    def _apply_roster(self, payload: dict):
+        """Aplica una importación de equipos, jugadores y calendario"""
+        self._add_teams(payload['teams'])
+        if payload['players']:
+            teams = dict(self.teams)
+            for player in payload['players']:
+                team = player['team']
+                if teams[team] is self.teams[team]:
+                    teams[team] = list(teams[team])
+                teams[team].append({'name': player['name'], 'number': player['number']})
+            self.teams = teams
+        if payload['fixtures'] is not None:
+            self._apply_fixtures(payload['fixtures'])
+    
+    def _add_teams(self, names):
+        """Registra equipos nuevos en el registro y en la clasificación"""
+        new = [name for name in names if name not in self.teams]
+        if new:
+            teams = dict(self.teams)
+            for name in new:
+                teams[name] = []
+                self.standings.add_team(name)
+            self.teams = teams
+    
+    def _register_match(self, match: Match):
+        """Registra un partido nuevo como partido actual"""
+        self._add_teams((match.team1, match.team2))
+        match._journal = self
+        self.matches[match.match_id] = match
+        self.current_match = match
+        self._next_match_id = max(self._next_match_id, match.match_id + 1)
+    
+    # Instantáneas y reconstrucción
+    def _take_snapshot(self, seq: int):
+        """Guarda una instantánea del estado tras el evento `seq`"""
+        matches = {}
+        for match_id, match in self.matches.items():
+            data = self._frozen.get(match_id)
+            if data is None:
+                data = match.to_dict()
+                if match.end_time is not None and not match.in_progress:
+                    self._frozen[match_id] = data
+            matches[match_id] = data
+        
+        self._snapshots.append((seq, {
+            'current': self.current_match.match_id if self.current_match else None,
+            'history': [match.match_id for match in self.match_history],
+            'matches': matches,
+            'next_match_id': self._next_match_id,
+            'fixtures': self.fixtures,
+            'fixture_info': self.fixture_info,
+            'fixture_cursor': self._fixture_cursor,
+            'standings': self.standings.to_dict(),
+            'teams': self.teams,
+        }))
+        self._snapshot_seqs.append(seq)
+        logger.debug("Instantánea del torneo", extra={'seq': seq, 'matches': len(matches)})
+    
+    def _load_snapshot(self, state: dict):
+        """Carga el estado de una instantánea"""
+        self._reset_state()
+        for match_id, data in state['matches'].items():
+            match = Match.from_dict(data, self.time_source)
+            match._journal = self
+            self.matches[match_id] = match
+        self.match_history = [self.matches[match_id] for match_id in state['history']]
+        if state['current'] is not None:
+            self.current_match = self.matches[state['current']]
+        self._next_match_id = state['next_match_id']
+        self.fixtures = state['fixtures']
+        self.fixture_info = state['fixture_info']
+        self._fixture_cursor = state['fixture_cursor']
+        self.standings = StandingsTable.from_dict(state['standings'])
+        self.teams = state['teams']
+    
+    def replay_until(self, seq: int):
+        """
+        Reconstruye el torneo tal como estaba tras el evento `seq`,
+        partiendo de la instantánea más cercana anterior
+        """
+        seq = max(0, min(seq, len(self.event_log)))
+        replica = TournamentModel(self.snapshot_interval, time_source=self.time_source)
+        
+        index = bisect_right(self._snapshot_seqs, seq)
+        start = 0
+        if index:
+            start, state = self._snapshots[index - 1]
+            replica._load_snapshot(state)
+        replica._snapshots = self._snapshots[:index]
+        replica._snapshot_seqs = self._snapshot_seqs[:index]
+        replica.event_log = self.event_log[:start]
+        replica._event_times = self._event_times[:start]
+        
+        for event in self.event_log[start:seq]:
+            replica.event_log.append(event)
+            replica._event_times.append(event.timestamp)
+            replica._apply(event)
+        logger.debug("Torneo reconstruido", extra={'seq': seq, 'from_snapshot': start,
+                                                   'replayed': seq - start})
+        return replica
+    
+    def state_at(self, timestamp: float):
+        """Reconstruye el torneo en el instante `timestamp` (epoch)"""
+        return self.replay_until(bisect_right(self._event_times, timestamp))
+    
+    def events_for_match(self, match_id: int):
+        """Eventos del registro que afectan a un partido (para auditoría)"""
+        return [event for event in self.event_log if event.match_id == match_id]
+    
+    @classmethod
+    def from_events(cls, events, snapshot_interval: int = None, time_source=None):
+        """Reconstruye un torneo a partir de un registro de eventos"""
+        model = cls(snapshot_interval, time_source)
+        for event in events:
+            if isinstance(event, dict):
+                event = TournamentEvent.from_dict(event)
+            model._append(event)
+        logger.info("Torneo cargado de un registro", extra={'events': len(model.event_log)})
+        return model
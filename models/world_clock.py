@@ -0,0 +1,157 @@
+"""
+Reloj mundial
+Muestra la hora de varias zonas IANA a la vez. El desfase UTC de cada zona
+se calcula con zoneinfo una sola vez y se guarda hasta su siguiente cambio
+(horario de verano); mientras tanto, mostrar una zona es sumar un entero y
+formatear con una tabla, sin conversiones por tick.
+"""
+import time
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+
+# Textos "00".."99" para formatear sin f-strings por campo
+_TWO_DIGITS = tuple(f"{n:02d}" for n in range(100))
+
+DAY = 86400
+# Paso con el que se busca el siguiente cambio de desfase y horizonte de la
+# búsqueda (las zonas sin cambios se vuelven a comprobar pasado el horizonte)
+SEARCH_STEP = DAY
+SEARCH_HORIZON = 400 * DAY
+
+
+def _zone_lookup(zone: ZoneInfo):
+    def lookup(seconds: int):
+        moment = datetime.fromtimestamp(seconds, timezone.utc).astimezone(zone)
+        return int(moment.utcoffset().total_seconds()), moment.tzname() or ""
+    return lookup
+
+
+def _local_lookup(seconds: int):
+    local = time.localtime(seconds)
+    return local.tm_gmtoff, local.tm_zone or ""
+
+
+class ZoneOffset:
+    """
+    Desfase UTC de una zona válido hasta su siguiente transición.
+    `lookup(segundos)` devuelve (desfase, abreviatura) y solo se llama al
+    pasar una transición o al saltar la hora hacia atrás.
+    """
+    
+    __slots__ = ('lookup', 'offset', 'abbreviation', 'valid_from', 'valid_until', 'recomputes')
+    
+    def __init__(self, lookup):
+        self.lookup = lookup
+        self.offset = 0
+        self.abbreviation = ""
+        self.valid_from = 0
+        self.valid_until = -1
+        self.recomputes = 0
+    
+    def offset_at(self, seconds: int):
+        """Desfase en segundos en el instante UTC dado"""
+        if not self.valid_from <= seconds < self.valid_until:
+            self._recompute(seconds)
+        return self.offset
+    
+    def _recompute(self, seconds: int):
+        self.recomputes += 1
+        self.offset, self.abbreviation = self.lookup(seconds)
+        self.valid_from = seconds
+        self.valid_until = self._next_transition(seconds)
+    
+    def _next_transition(self, seconds: int):
+        """Primer segundo posterior con otro desfase (o el horizonte de búsqueda)"""
+        current = self.offset
+        low = seconds
+        for high in range(seconds + SEARCH_STEP, seconds + SEARCH_HORIZON + 1, SEARCH_STEP):
+            if self.lookup(high)[0] != current:
+                # Bisección hasta el segundo exacto del cambio
+                while high - low > 1:
+                    middle = (low + high) // 2
+                    if self.lookup(middle)[0] == current:
+                        low = middle
+                    else:
+                        high = middle
+                return high
+            low = high
+        return seconds + SEARCH_HORIZON
+
+
+class ZoneClock:
+    """Una zona del reloj mundial"""
+    
+    __slots__ = ('name', 'label', 'offset')
+    
+    def __init__(self, name: str, label: str = None):
+        try:
+            zone = ZoneInfo(name)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"Zona horaria desconocida: {name}") from None
+        self.name = name
+        self.label = label or name.rsplit('/', 1)[-1].replace('_', ' ')
+        self.offset = ZoneOffset(_zone_lookup(zone))
+
+
+def format_seconds(local_seconds: int, format_24h: bool = True):
+    """HH:MM:SS (o hh:MM:SS AM/PM) de unos segundos locales desde epoch"""
+    minutes, second = divmod(local_seconds % DAY, 60)
+    hour, minute = divmod(minutes, 60)
+    if format_24h:
+        return f"{_TWO_DIGITS[hour]}:{_TWO_DIGITS[minute]}:{_TWO_DIGITS[second]}"
+    suffix = "AM" if hour < 12 else "PM"
+    return f"{_TWO_DIGITS[hour % 12 or 12]}:{_TWO_DIGITS[minute]}:{_TWO_DIGITS[second]} {suffix}"
+
+
+class WorldClock:
+    """Conjunto de zonas horarias que se muestran a la vez"""
+    
+    def __init__(self):
+        self.zones = []
+        # Zona del sistema: referencia para marcar el día anterior o siguiente
+        self.local = ZoneOffset(_local_lookup)
+    
+    def set_zones(self, names):
+        """
+        Sustituye las zonas mostradas. Las zonas que ya estaban conservan su
+        desfase calculado. Lanza ValueError si alguna no existe.
+        """
+        existing = {zone.name: zone for zone in self.zones}
+        zones = []
+        seen = set()
+        for name in names:
+            name = name.strip()
+            if not name or name in seen:
+                continue
+            seen.add(name)
+            zones.append(existing.get(name) or ZoneClock(name))
+        self.zones = zones
+    
+    def zone_names(self):
+        return [zone.name for zone in self.zones]
+    
+    def rows(self, now: float, format_24h: bool = True):
+        """
+        Lista de (etiqueta, hora, abreviatura, días respecto a la zona local)
+        en el instante `now` (segundos epoch)
+        """
+        seconds = int(now)
+        local_day = (seconds + self.local.offset_at(seconds)) // DAY
+        rows = []
+        for zone in self.zones:
+            offset = zone.offset
+            local_seconds = seconds + offset.offset_at(seconds)
+            rows.append((zone.label, format_seconds(local_seconds, format_24h),
+                         offset.abbreviation, local_seconds // DAY - local_day))
+        return rows
+    
+    def lines(self, now: float, format_24h: bool = True):
+        """Filas del reloj mundial como texto para mostrar"""
+        lines = []
+        for label, time_str, abbreviation, days in self.rows(now, format_24h):
+            line = f"{label}  {time_str}  {abbreviation}"
+            if days:
+                line += f"  ({days:+d})"
+            lines.append(line)
+        return lines
@@ -0,0 +1,125 @@
+"""
+Comprobación de la lectura de perfiles
+Escribe en una carpeta temporal archivos de perfiles mal formados (JSON que
+no es un objeto, perfiles que no son objetos, campos con tipos que no
+corresponden, horas o duraciones fuera de rango...) y comprueba que
+ProfileStore.load no falla con ninguno: se queda con el perfil por defecto
+y registra un aviso. update_from_dict tiene que rechazarlos con
+ProfileError. También guarda y vuelve a leer un archivo válido.
+
+    python profile_check.py
+
+Devuelve 1 si algún caso no se comporta así.
+"""
+import json
+import logging
+import os
+import sys
+import tempfile
+
+# Añadir el directorio raíz al path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from models.clock_config import ClockConfig, WindowMode
+from models.profiles import DEFAULT_PROFILE, Profile, ProfileError, ProfileStore
+
+
+# (descripción, contenido del archivo); los que son JSON válido se pasan
+# también a update_from_dict
+MALFORMED = [
+    ("no es JSON", "{"),
+    ("lista", "[]"),
+    ("texto", '"x"'),
+    ("null", "null"),
+    ("otra versión", '{"v":2,"profiles":{}}'),
+    ("sin perfiles", '{"v":1}'),
+    ("perfiles en lista", '{"v":1,"profiles":[]}'),
+    ("perfil de texto", '{"v":1,"profiles":{"a":"x"}}'),
+    ("activo en lista", '{"v":1,"active":[],"profiles":{}}'),
+    ("idioma numérico", '{"v":1,"profiles":{"a":{"language":3}}}'),
+    ("config en lista", '{"v":1,"profiles":{"a":{"config":[]}}}'),
+    ("regla nula", '{"v":1,"profiles":{"a":{"config":{"alarm_rule":null}}}}'),
+    ("modo booleano", '{"v":1,"profiles":{"a":{"config":{"mode":true}}}}'),
+    ("modo desconocido", '{"v":1,"profiles":{"a":{"config":{"mode":9}}}}'),
+    ("hora de texto", '{"v":1,"profiles":{"a":{"config":{"alarm_hour":"7"}}}}'),
+    ("hora 24", '{"v":1,"profiles":{"a":{"config":{"alarm_hour":24}}}}'),
+    ("hora negativa", '{"v":1,"profiles":{"a":{"config":{"alarm_hour":-1}}}}'),
+    ("minuto 60", '{"v":1,"profiles":{"a":{"config":{"alarm_minute":60}}}}'),
+    ("duración negativa", '{"v":1,"profiles":{"a":{"config":{"timer_duration":-5}}}}'),
+    ("zonas de texto", '{"v":1,"profiles":{"a":{"config":{"world_zones":"UTC"}}}}'),
+    ("zona numérica", '{"v":1,"profiles":{"a":{"config":{"world_zones":[1]}}}}'),
+]
+
+
+class _Warnings(logging.Handler):
+    """Cuenta los avisos del módulo de perfiles"""
+    
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.count = 0
+    
+    def emit(self, record):
+        self.count += 1
+
+
+def main():
+    profile_logger = logging.getLogger("models.profiles")
+    warnings = _Warnings()
+    profile_logger.addHandler(warnings)
+    profile_logger.propagate = False
+    
+    failures = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "profiles.json")
+        
+        for description, content in MALFORMED:
+            with open(path, 'w', encoding='utf-8') as profile_file:
+                profile_file.write(content)
+            before = warnings.count
+            try:
+                store = ProfileStore.load(path)
+            except Exception as error:
+                failures.append(f"{description}: load lanza {type(error).__name__}: {error}")
+                continue
+            if store.profiles or store.active != DEFAULT_PROFILE:
+                failures.append(f"{description}: no se queda con el perfil por defecto")
+            if warnings.count == before:
+                failures.append(f"{description}: no registra ningún aviso")
+            
+            try:
+                data = json.loads(content)
+            except ValueError:
+                continue
+            try:
+                ProfileStore().update_from_dict(data)
+            except ProfileError:
+                pass
+            except Exception as error:
+                failures.append(f"{description}: update_from_dict lanza "
+                                f"{type(error).__name__} en vez de ProfileError")
+            else:
+                failures.append(f"{description}: update_from_dict lo acepta")
+        
+        # Un archivo válido se lee igual que se guardó
+        store = ProfileStore(path)
+        config = ClockConfig(mode=WindowMode.WORLD, alarm_rule="FREQ=DAILY",
+                             world_zones=("UTC", "Europe/Madrid"))
+        store.put(Profile("partido", config, "en"))
+        store.put(Profile("vacío"))
+        store.activate("partido")
+        store.save()
+        loaded = ProfileStore.load(path)
+        if loaded.profiles != store.profiles or loaded.active != "partido":
+            failures.append("archivo válido: no se lee igual que se guardó")
+    
+    print(f"{len(MALFORMED)} archivos mal formados, {warnings.count} avisos")
+    if failures:
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    print("Perfiles correctos")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+"""
+Banco de pruebas del repintado de los relojes sin pantalla
+Coloca rejillas de 1 a 500 DigitalClockWidget, cada uno con su modelo y su
+controlador, en Qt sin pantalla (QT_QPA_PLATFORM=offscreen), y los hace
+avanzar con una secuencia de ticks en tiempo virtual. Para cada fotograma
+mide por separado:
+
+- update: los ticks de todos los relojes (on_timer_tick y update_display)
+- layout: las peticiones de recolocación que dejan los cambios de texto
+- paint: el repintado de las zonas sucias en el almacén de la ventana
+
+además de la construcción, el primer fotograma y la memoria residente
+máxima. Cada configuración se ejecuta en un proceso propio para que la
+memoria máxima sea solo suya.
+
+    python render_benchmark.py --output render_baseline.json
+    python render_benchmark.py --counts 1,100 --sequences clock --compare render_baseline.json
+
+Con --compare devuelve 1 si algún fotograma medio empeora más que la
+tolerancia respecto al archivo de referencia.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+# Añadir el directorio raíz al path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+BASELINE_VERSION = 1
+
+# Secuencias de ticks: modo del reloj en que avanzan los fotogramas
+SEQUENCES = ('clock', 'timer', 'world')
+WORLD_ZONES = ["Europe/Madrid", "America/New_York", "Asia/Tokyo"]
+
+
+def peak_memory_mb():
+    """Memoria residente máxima del proceso"""
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux da KiB y macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def summarize(samples):
+    """Media, percentiles y máximo de una lista de milisegundos"""
+    ordered = sorted(samples)
+    
+    def percentile(fraction):
+        return ordered[min(len(ordered) - 1, int(math.ceil(fraction * len(ordered))) - 1)]
+    
+    return {
+        'mean': statistics.fmean(ordered),
+        'p50': percentile(0.50),
+        'p95': percentile(0.95),
+        'max': ordered[-1],
+    }
+
+
+def run_configuration(count: int, size: str, sequence: str, frames: int, warmup: int):
+    """Mide una rejilla de `count` relojes (se ejecuta en el proceso hijo)"""
+    from PySide6.QtCore import QCoreApplication, QEvent
+    from PySide6.QtWidgets import QApplication, QGridLayout, QWidget
+    from models.clock_model import ClockModel, ClockMode, TimerMode
+    from models.time_source import VirtualTimeSource
+    from views.digital_clock_widget import DigitalClockWidget
+    from controllers.clock_controller import DigitalClockController
+    from window_leak_check import resident_memory_mb
+    
+    app = QApplication([sys.argv[0]])
+    source = VirtualTimeSource(start=0.0)
+    memory_before = resident_memory_mb()
+    
+    started = time.perf_counter()
+    container = QWidget()
+    layout = QGridLayout(container)
+    layout.setContentsMargins(0, 0, 0, 0)
+    layout.setSpacing(0)
+    columns = max(1, int(math.ceil(math.sqrt(count))))
+    controllers = []
+    for index in range(count):
+        clock_widget = DigitalClockWidget()
+        if size != "hint":
+            width, height = (int(value) for value in size.split("x"))
+            clock_widget.setFixedSize(width, height)
+        model = ClockModel()
+        model.set_time_source(source)
+        controller = DigitalClockController(model, clock_widget)
+        if sequence == 'timer':
+            controller.set_mode(ClockMode.TIMER)
+            controller.set_timer_mode(TimerMode.REGRESSIVE)
+            controller.set_timer_duration(frames + warmup + 60)
+            controller.on_reset()
+            controller.on_start()
+        elif sequence == 'world':
+            controller.set_world_zones(WORLD_ZONES)
+            controller.set_mode(ClockMode.WORLD)
+        else:
+            controller.set_mode(ClockMode.CLOCK)
+        layout.addWidget(clock_widget, index // columns, index % columns)
+        controllers.append(controller)
+    build_ms = (time.perf_counter() - started) * 1000
+    
+    # Primer fotograma: mostrar, colocar y pintar toda la rejilla
+    started = time.perf_counter()
+    container.show()
+    layout.activate()
+    app.processEvents()
+    first_frame_ms = (time.perf_counter() - started) * 1000
+    
+    update, relayout, paint, total = [], [], [], []
+    for frame in range(warmup + frames):
+        started = time.perf_counter()
+        source.advance(1.0)
+        ticked = time.perf_counter()
+        QCoreApplication.sendPostedEvents(None, QEvent.LayoutRequest)
+        laid_out = time.perf_counter()
+        app.processEvents()
+        painted = time.perf_counter()
+        if frame >= warmup:
+            update.append((ticked - started) * 1000)
+            relayout.append((laid_out - ticked) * 1000)
+            paint.append((painted - laid_out) * 1000)
+            total.append((painted - started) * 1000)
+    
+    window_size = container.size()
+    result = {
+        'count': count,
+        'size': size,
+        'sequence': sequence,
+        'frames': frames,
+        'window': f"{window_size.width()}x{window_size.height()}",
+        'build_ms': build_ms,
+        'first_frame_ms': first_frame_ms,
+        'update_ms': summarize(update),
+        'layout_ms': summarize(relayout),
+        'paint_ms': summarize(paint),
+        'frame_ms': summarize(total),
+        'frame_us_per_clock': statistics.fmean(total) * 1000 / count,
+        'rss_growth_mb': resident_memory_mb() - memory_before,
+        'peak_rss_mb': peak_memory_mb(),
+    }
+    
+    for controller in controllers:
+        controller.shutdown()
+    container.close()
+    return result
+
+
+def environment():
+    """Datos de la máquina y de Qt que condicionan la comparación"""
+    from PySide6 import __version__ as pyside_version
+    from PySide6.QtCore import qVersion
+    return {
+        'python': platform.python_version(),
+        'pyside': pyside_version,
+        'qt': qVersion(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'qpa': os.environ.get("QT_QPA_PLATFORM"),
+    }
+
+
+def key_of(result):
+    return f"{result['sequence']}/{result['size']}/{result['count']}"
+
+
+def compare(results, path: str, tolerance: float):
+    """Compara con una referencia; devuelve las configuraciones que empeoran"""
+    with open(path, encoding='utf-8') as baseline_file:
+        baseline = json.load(baseline_file)
+    if baseline.get('v') != BASELINE_VERSION:
+        raise SystemExit(f"Versión de referencia no soportada: {baseline.get('v')}")
+    
+    current_env = environment()
+    for name in ('qt', 'platform', 'cpus'):
+        if baseline['environment'].get(name) != current_env[name]:
+            print(f"Aviso: la referencia es de otro entorno ({name}: "
+                  f"{baseline['environment'].get(name)} frente a {current_env[name]})")
+    
+    reference = {key_of(result): result for result in baseline['results']}
+    regressions = []
+    print(f"{'configuración':<24} {'frame ref':>10} {'frame':>10} {'ratio':>7} {'paint':>7}")
+    for result in results:
+        key = key_of(result)
+        old = reference.get(key)
+        if old is None:
+            print(f"{key:<24} sin referencia")
+            continue
+        ratio = result['frame_ms']['mean'] / old['frame_ms']['mean']
+        paint_ratio = result['paint_ms']['mean'] / old['paint_ms']['mean'] if old['paint_ms']['mean'] else 1.0
+        flag = "  EMPEORA" if ratio > tolerance else ""
+        print(f"{key:<24} {old['frame_ms']['mean']:>9.2f}  {result['frame_ms']['mean']:>9.2f} "
+              f"{ratio:>7.2f} {paint_ratio:>7.2f}{flag}")
+        if ratio > tolerance:
+            regressions.append(key)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Banco de pruebas del repintado de los relojes")
+    parser.add_argument('--counts', default="1,10,50,100,250,500", help="relojes por rejilla")
+    parser.add_argument('--sizes', default="hint,480x270",
+                        help="tamaño de cada reloj: ANCHOxALTO o hint (el del .ui)")
+    parser.add_argument('--sequences', default=",".join(SEQUENCES),
+                        help="secuencias de ticks: " + ", ".join(SEQUENCES))
+    parser.add_argument('--frames', type=int, default=120, help="fotogramas medidos")
+    parser.add_argument('--warmup', type=int, default=10, help="fotogramas sin medir")
+    parser.add_argument('--output', help="guarda los resultados como referencia")
+    parser.add_argument('--compare', help="referencia con la que comparar")
+    parser.add_argument('--tolerance', type=float, default=1.25,
+                        help="empeoramiento admitido del fotograma medio (1.25 = 25%%)")
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.worker:
+        # Proceso hijo: una sola configuración, resultado en JSON por stdout
+        config = json.loads(args.worker)
+        print(json.dumps(run_configuration(**config)))
+        return 0
+    
+    counts = [int(value) for value in args.counts.split(",")]
+    sizes = args.sizes.split(",")
+    sequences = args.sequences.split(",")
+    for sequence in sequences:
+        if sequence not in SEQUENCES:
+            parser.error(f"secuencia desconocida: {sequence}")
+    
+    results = []
+    print(f"{'configuración':<24} {'ventana':>11} {'update':>8} {'layout':>8} {'paint':>8} "
+          f"{'frame':>8} {'p95':>8} {'µs/reloj':>9} {'pico MB':>8}")
+    for sequence in sequences:
+        for size in sizes:
+            for count in counts:
+                config = {'count': count, 'size': size, 'sequence': sequence,
+                          'frames': args.frames, 'warmup': args.warmup}
+                completed = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), '--worker', json.dumps(config)],
+                    capture_output=True, text=True
+                )
+                if completed.returncode != 0:
+                    print(completed.stderr, file=sys.stderr)
+                    return 1
+                result = json.loads(completed.stdout.strip().splitlines()[-1])
+                results.append(result)
+                print(f"{key_of(result):<24} {result['window']:>11} "
+                      f"{result['update_ms']['mean']:>8.2f} {result['layout_ms']['mean']:>8.2f} "
+                      f"{result['paint_ms']['mean']:>8.2f} {result['frame_ms']['mean']:>8.2f} "
+                      f"{result['frame_ms']['p95']:>8.2f} {result['frame_us_per_clock']:>9.1f} "
+                      f"{result['peak_rss_mb']:>8.1f}")
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as baseline_file:
+            json.dump({'v': BASELINE_VERSION, 'environment': environment(),
+                       'frames': args.frames, 'results': results},
+                      baseline_file, indent=2, ensure_ascii=False)
+        print(f"Referencia guardada en {args.output}")
+    
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} configuraciones empeoran más de un "
+                  f"{(args.tolerance - 1) * 100:.0f}%")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
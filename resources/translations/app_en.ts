@@ -134,6 +134,14 @@
         <source>The timer has finished!</source>
         <translation>The timer has finished!</translation>
     </message>
+    <message>
+        <source>Broadcast disabled</source>
+        <translation>Broadcast disabled</translation>
+    </message>
+    <message>
+        <source>Shared memory disabled</source>
+        <translation>Shared memory disabled</translation>
+    </message>
 </context>
 <context>
     <name>TournamentWindow</name>
@@ -201,5 +209,33 @@
         <source>⏱️ Full time! Match duration completed</source>
         <translation>⏱️ Full time! Match duration completed</translation>
     </message>
+    <message>
+        <source>⏸️ Half-time break</source>
+        <translation>⏸️ Half-time break</translation>
+    </message>
+    <message>
+        <source>⏸️ Break: {name}</source>
+        <translation>⏸️ Break: {name}</translation>
+    </message>
+    <message>
+        <source>▶️ {name} started</source>
+        <translation>▶️ {name} started</translation>
+    </message>
+    <message>
+        <source>🥅 Penalty shoot-out</source>
+        <translation>🥅 Penalty shoot-out</translation>
+    </message>
+    <message>
+        <source>A knockout match needs a winner: play extra time or penalties</source>
+        <translation>A knockout match needs a winner: play extra time or penalties</translation>
+    </message>
+    <message>
+        <source>Broadcast disabled</source>
+        <translation>Broadcast disabled</translation>
+    </message>
+    <message>
+        <source>Shared memory disabled</source>
+        <translation>Shared memory disabled</translation>
+    </message>
 </context>
 </TS>
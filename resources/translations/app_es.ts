@@ -134,6 +134,14 @@
         <source>The timer has finished!</source>
         <translation>¡El temporizador ha finalizado!</translation>
     </message>
+    <message>
+        <source>Broadcast disabled</source>
+        <translation>Difusión desactivada</translation>
+    </message>
+    <message>
+        <source>Shared memory disabled</source>
+        <translation>Memoria compartida desactivada</translation>
+    </message>
 </context>
 <context>
     <name>TournamentWindow</name>
@@ -237,5 +245,33 @@
         <source> has ended!</source>
         <translation> ¡ha finalizado!</translation>
     </message>
+    <message>
+        <source>⏸️ Half-time break</source>
+        <translation>⏸️ Descanso del medio tiempo</translation>
+    </message>
+    <message>
+        <source>⏸️ Break: {name}</source>
+        <translation>⏸️ Descanso: {name}</translation>
+    </message>
+    <message>
+        <source>▶️ {name} started</source>
+        <translation>▶️ Comienza: {name}</translation>
+    </message>
+    <message>
+        <source>🥅 Penalty shoot-out</source>
+        <translation>🥅 Tanda de penaltis</translation>
+    </message>
+    <message>
+        <source>A knockout match needs a winner: play extra time or penalties</source>
+        <translation>Una eliminatoria necesita un ganador: hay que jugar la prórroga o los penaltis</translation>
+    </message>
+    <message>
+        <source>Broadcast disabled</source>
+        <translation>Difusión desactivada</translation>
+    </message>
+    <message>
+        <source>Shared memory disabled</source>
+        <translation>Memoria compartida desactivada</translation>
+    </message>
 </context>
 </TS>
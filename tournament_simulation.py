@@ -0,0 +1,551 @@
+"""
+Simulación acelerada de torneos sin pantalla
+Conduce TournamentController y TournamentModel reales, con sus ventanas
+en Qt sin pantalla, sobre una VirtualTimeSource: el tiempo salta de un
+plazo al siguiente y un partido de 90 minutos se juega en milisegundos.
+Las acciones se hacen como un usuario, pulsando los botones de la ventana
+(inicio, goles, tarjetas, tiempo añadido, pausas, idioma, final manual).
+
+Los partidos salen de un guion JSON o se generan al azar a partir del
+calendario de un torneo, repartidos entre varios campos que juegan a la
+vez. Tras cada partido se comprueban los invariantes y al final se informa
+del rendimiento, la CPU por hora de partido simulada y el crecimiento de
+memoria.
+
+    python tournament_simulation.py --teams 16 --pitches 4
+    python tournament_simulation.py --matches 5000 --seed 7 --json informe.json
+    python tournament_simulation.py --script guion.json --repeat 10
+
+Formato del guion (tiempos en segundos desde el saque inicial):
+
+    {"matches": [{"team1": "A", "team2": "B", "duration": 90, "plan": null,
+                  "pitch": 0, "gap": 600,
+                  "actions": [[600, "goal", 1], [1300, "card", 2],
+                              [2690, "stoppage", 2], [3000, "pause", 45],
+                              [3500, "language", "en"], [5000, "end"]]}]}
+
+Devuelve 1 si se viola algún invariante.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import deque
+from functools import partial
+
+# Añadir el directorio raíz al path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QSettings
+from PySide6.QtWidgets import QApplication
+from models.clock_model import ClockMode
+from models.fixtures import generate_fixtures
+from models.match_events import MatchEventType
+from models.period_plan import PeriodPlan, PRESETS, PLAY, PENALTIES
+from models.time_source import VirtualTimeSource
+from models.tournament_events import GOAL_SCORED, MATCH_INCIDENT
+from models.tournament_model import TournamentModel
+from views.tournament_window import TournamentWindow
+from views.digital_clock_widget import DigitalClockWidget
+from controllers.tournament_controller import TournamentController
+from controllers.snapshot_service import SNAPSHOT_GROUP
+from translations import translate
+from window_leak_check import counters, settle
+
+
+# Cada cuánto se comprueban los plazos del plan de periodos (segundos)
+SAMPLE_SECONDS = 30
+# Duración de una tanda de penaltis antes de cerrar el partido a mano
+PENALTY_SECONDS = 600
+# Margen sobre la duración prevista antes de dar un partido por colgado
+STUCK_SECONDS = 4 * 3600
+
+
+def plan_for(script):
+    """Plan de periodos que usará el controlador para el partido"""
+    if script.get('plan'):
+        return PeriodPlan.from_spec(PRESETS[script['plan']], script['plan'])
+    return PeriodPlan.football(script['duration'], break_seconds=TournamentController.BREAK_DURATION)
+
+
+def regulation_seconds(plan: PeriodPlan):
+    """Duración del plan sin las fases que solo se juegan con empate"""
+    return sum(phase.duration for phase in plan.phases if not phase.if_tied)
+
+
+def random_scenario(rng: random.Random, teams: int, pitches: int, matches: int = None,
+                    knockout_rate: float = 0.1):
+    """
+    Partidos al azar sobre el calendario de ida y vuelta de `teams` equipos,
+    repetido hasta llegar a `matches` (todo el calendario si es None)
+    """
+    names = [f"Equipo {number:02d}" for number in range(1, teams + 1)]
+    calendar = generate_fixtures(names, "round_robin", pitches=pitches, double=True)['fixtures']
+    calendar.sort(key=lambda fixture: (fixture['slot'], fixture['pitch']))
+    count = len(calendar) if matches is None else matches
+    
+    scenario = []
+    for index in range(count):
+        fixture = calendar[index % len(calendar)]
+        script = {
+            'team1': fixture['team1'],
+            'team2': fixture['team2'],
+            'duration': rng.choice((90, 90, 90, 60, 40)),
+            'plan': "football" if rng.random() < knockout_rate else None,
+            'pitch': fixture['pitch'] if matches is None else index % pitches,
+            'gap': rng.randint(300, 900),
+        }
+        plan = plan_for(script)
+        span = regulation_seconds(plan)
+        half = plan.phases[0].duration
+        
+        actions = []
+        for _ in range(rng.randint(0, 5)):
+            actions.append([rng.uniform(0, span), "goal", rng.choice((1, 2))])
+        for _ in range(rng.randint(0, 4)):
+            actions.append([rng.uniform(0, span), "card", rng.choice((1, 2))])
+        if rng.random() < 0.6:
+            actions.append([half - rng.randint(10, 90), "stoppage", rng.randint(1, 3)])
+        if rng.random() < 0.6:
+            actions.append([span - rng.randint(10, 90), "stoppage", rng.randint(1, 5)])
+        if rng.random() < 0.2:
+            for _ in range(rng.randint(1, 3)):
+                actions.append([rng.uniform(0, span), "pause", rng.uniform(5, 180)])
+        if rng.random() < 0.1:
+            actions.append([rng.uniform(0, span), "language", rng.choice(("en", "es"))])
+        if rng.random() < 0.05:
+            actions.append([rng.uniform(60, span), "end"])
+        script['actions'] = sorted(actions, key=lambda action: action[0])
+        scenario.append(script)
+    return scenario
+
+
+def load_scenario(path: str, repeat: int = 1):
+    """Partidos de un guion JSON, repetido `repeat` veces"""
+    with open(path, encoding='utf-8') as script_file:
+        data = json.load(script_file)
+    matches = data['matches'] if isinstance(data, dict) else data
+    for script in matches:
+        script.setdefault('duration', 90)
+        script.setdefault('plan', None)
+        script.setdefault('pitch', 0)
+        script.setdefault('gap', 600)
+        script.setdefault('actions', [])
+        if script['plan'] and script['plan'] not in PRESETS:
+            raise ValueError(f"Plan desconocido: {script['plan']}")
+    return [dict(script) for _ in range(repeat) for script in matches]
+
+
+class Pitch:
+    """
+    Un campo: ventana de torneo, reloj y controlador propios que juegan en
+    orden su cola de partidos sobre la fuente de tiempo compartida
+    """
+    
+    def __init__(self, number: int, app: QApplication, source: VirtualTimeSource, report):
+        self.number = number
+        self.source = source
+        self.report = report
+        
+        self.window = TournamentWindow()
+        self.clock_widget = DigitalClockWidget()
+        self.window.add_clock_widget(self.clock_widget)
+        self.controller = TournamentController(self.window, self.clock_widget, app, source)
+        self.window.show()
+        
+        # Comprobar el plan cada vez que vence una fase y tras cada tic del
+        # reloj (conectados después del controlador, se ejecutan tras él)
+        self.controller.phase_timer.timeout.connect(self.check_phase)
+        self.clock_widget.internal_timer.timeout.connect(self.check_clock)
+        
+        self.queue = deque()
+        self.script = None
+        self.match = None
+        self.handles = []
+        self._log_checked = 0
+    
+    @property
+    def busy(self):
+        return self.script is not None or bool(self.queue)
+    
+    @property
+    def model(self):
+        return self.controller.tournament_model
+    
+    def violation(self, text: str):
+        match_id = self.match.match_id if self.match is not None else "-"
+        self.report.violation(f"campo {self.number}, partido {match_id}: {text}")
+    
+    def later(self, seconds: float, callback):
+        self.handles.append(self.source.call_later(max(0.0, seconds), callback))
+    
+    # Partidos
+    def next_match(self):
+        """Empieza el siguiente partido de la cola"""
+        if not self.queue:
+            return
+        script = self.queue.popleft()
+        window = self.window
+        
+        self.controller.set_period_plan(script['plan'])
+        window.set_match_teams(script['team1'], script['team2'])
+        window.spinMatchDuration.setValue(script['duration'])
+        played = {team: self._played(team) for team in (script['team1'], script['team2'])}
+        window.btnStartMatch.click()
+        if not self.model.has_active_match():
+            self.violation("el partido no empezó")
+            self.later(script['gap'], self.next_match)
+            return
+        
+        plan = plan_for(script)
+        self.script = script
+        self.match = self.model.current_match
+        self.kickoff = self.source.time()
+        self.played_before = played
+        self.goals = [0, 0]
+        self.added = 0
+        self.paused_total = 0.0
+        self.paused_at = None
+        self.manual_end = None
+        self.shootout = False
+        self.has_tied_phases = any(phase.if_tied for phase in plan.phases)
+        self.expected = regulation_seconds(plan)
+        
+        for offset, *action in script['actions']:
+            self.later(offset, partial(self.act, *action))
+        self.later(SAMPLE_SECONDS, self.sample)
+        self.later(self.expected + STUCK_SECONDS, self.stuck)
+    
+    def act(self, kind: str, value=None):
+        """Ejecuta una acción del guion pulsando la ventana"""
+        if not self.model.has_active_match():
+            return
+        window = self.window
+        machine = self.controller.period_machine
+        if kind == "goal":
+            self.goals[value - 1] += 1
+            (window.btnGoalTeam1 if value == 1 else window.btnGoalTeam2).click()
+        elif kind == "card":
+            (window.btnCardTeam1 if value == 1 else window.btnCardTeam2).click()
+        elif kind == "stoppage":
+            for _ in range(int(value)):
+                if machine.phase is not None and machine.phase.kind == PLAY:
+                    self.added += 60
+                window.btnAddedTime.click()
+        elif kind == "pause":
+            if self.clock_widget.btnPause.isEnabled() and not machine.paused:
+                self.clock_widget.btnPause.click()
+                if machine.paused:
+                    self.paused_at = self.source.time()
+                    self.later(value, self.resume)
+        elif kind == "language":
+            (window.actionEnglish if value == "en" else window.actionSpanish).trigger()
+            if (self.controller.current_language != value
+                    or window.windowTitle() != translate('Football Tournament Manager', value)):
+                self.violation(f"el idioma no cambió a {value}")
+        elif kind == "end":
+            self.manual_end = self.source.time()
+            window.btnEndMatch.click()
+        else:
+            self.violation(f"acción desconocida: {kind}")
+    
+    def resume(self):
+        machine = self.controller.period_machine
+        if machine is None or not machine.paused:
+            return
+        self.clock_widget.btnPause.click()
+        if machine.paused:
+            self.violation("el reloj no se reanudó")
+            return
+        self.paused_total += self.source.time() - self.paused_at
+        self.paused_at = None
+    
+    def sample(self):
+        """Comprobación periódica de los plazos del plan de periodos"""
+        machine = self.controller.period_machine
+        if machine is None or not self.model.has_active_match():
+            return
+        self.check_deadline(machine, self.source.time())
+        self.check_penalties(machine)
+        self.later(SAMPLE_SECONDS, self.sample)
+    
+    def check_clock(self):
+        """La cuenta atrás mostrada coincide con lo que queda de la fase"""
+        machine = self.controller.period_machine
+        clock = self.controller.clock_model
+        if (machine is None or machine.phase is None or machine.phase.kind == PENALTIES
+                or not clock.timer_running or clock.timer_paused):
+            return
+        expected = math.ceil(machine.remaining(self.source.time()))
+        if abs(clock.timer_current - expected) > 1:
+            self.violation(f"el reloj marca {clock.timer_current} s y el plan {expected} s")
+    
+    def check_phase(self):
+        """Tras vencer una fase no debe quedar ningún plazo atrasado"""
+        machine = self.controller.period_machine
+        if machine is None or not self.model.has_active_match():
+            return
+        self.check_deadline(machine, self.source.time())
+        self.check_penalties(machine)
+    
+    def check_deadline(self, machine, now: float):
+        deadline = machine.deadline()
+        if deadline is None:
+            return
+        if deadline < now - 0.002:
+            self.violation(f"fase {machine.phase.name} vencida hace {now - deadline:.3f} s")
+        elif not self.controller.phase_timer.isActive():
+            self.violation(f"fase {machine.phase.name} sin temporizador")
+    
+    def check_penalties(self, machine):
+        # Los penaltis no tienen plazo: el partido se cierra a mano tras la tanda
+        if machine.in_penalties and not self.shootout:
+            self.shootout = True
+            self.later(PENALTY_SECONDS, partial(self.act, "end"))
+    
+    def stuck(self):
+        if self.model.has_active_match():
+            self.violation("el partido no terminó")
+            self.manual_end = self.source.time()
+            self.window.btnEndMatch.click()
+    
+    def poll(self):
+        """Cierra el partido si el controlador lo acaba de terminar"""
+        if self.script is not None and not self.model.has_active_match():
+            self.finish_match()
+    
+    def finish_match(self):
+        script = self.script
+        ended = self.source.time()
+        for handle in self.handles:
+            self.source.cancel(handle)
+        self.handles = []
+        self.script = None
+        
+        self.check_match(ended)
+        self.report.match_finished(ended - self.kickoff)
+        self.later(script['gap'], self.next_match)
+    
+    # Invariantes
+    def check_match(self, ended: float):
+        match = self.match
+        controller = self.controller
+        model = self.model
+        
+        if not model.match_history or model.match_history[-1] is not match:
+            self.violation("el partido no está al final del historial")
+        if match.in_progress or match.end_time is None:
+            self.violation("el partido sigue en curso")
+        if controller.period_machine is not None or controller.phase_timer.isActive():
+            self.violation("quedan periodos activos")
+        if controller.clock_model.mode != ClockMode.CLOCK:
+            self.violation("el reloj no volvió al modo reloj")
+        
+        # Marcador: goles pulsados, goles en la línea de tiempo y clasificación
+        timeline = [sum(1 for event in match.timeline.all_events()
+                        if event.type == MatchEventType.GOAL and event.team == team)
+                    for team in (match.team1, match.team2)]
+        if [match.score1, match.score2] != self.goals or timeline != self.goals:
+            self.violation(f"marcador {match.score1}-{match.score2}, línea de tiempo "
+                           f"{timeline[0]}-{timeline[1]}, goles pulsados {self.goals[0]}-{self.goals[1]}")
+        for team, before in self.played_before.items():
+            if self._played(team) != before + 1:
+                self.violation(f"la clasificación de {team} no sumó el partido")
+        
+        # El tiempo de juego de los eventos nunca retrocede
+        clock_seconds = [event.payload['clock'] for event in model.events_for_match(match.match_id)
+                         if event.kind in (GOAL_SCORED, MATCH_INCIDENT)]
+        if any(later < earlier for earlier, later in zip(clock_seconds, clock_seconds[1:])):
+            self.violation("el tiempo de juego de los eventos retrocede")
+        
+        # Duración: exacta al final manual, y al final del plan si no hubo prórroga posible
+        elapsed = ended - self.kickoff
+        if self.manual_end is not None:
+            if abs(ended - self.manual_end) > 1e-6:
+                self.violation("el final manual no cerró el partido en su instante")
+        else:
+            expected = self.expected + self.added + self.paused_total
+            # El temporizador de fase trabaja en milisegundos enteros
+            if elapsed < expected - 0.002 or (not self.has_tied_phases and elapsed > expected + 0.002):
+                self.violation(f"duró {elapsed:.3f} s y el plan {expected:.3f} s")
+        
+        # Registro de eventos: secuencia continua y marcas de tiempo ordenadas
+        log = model.event_log
+        start = max(1, self._log_checked)
+        for index in range(start, len(log)):
+            if log[index].seq != log[index - 1].seq + 1:
+                self.violation(f"hueco en el registro tras el evento {log[index - 1].seq}")
+            if log[index].timestamp < log[index - 1].timestamp:
+                self.violation(f"el registro retrocede en el evento {log[index].seq}")
+        self._log_checked = len(log)
+    
+    def check_replay(self):
+        """El torneo reconstruido desde su registro coincide con el vivo"""
+        replica = TournamentModel.from_events(self.model.event_log)
+        if replica.standings.to_dict() != self.model.standings.to_dict():
+            self.report.violation(f"campo {self.number}: la clasificación reconstruida no coincide")
+        if [m.match_id for m in replica.match_history] != [m.match_id for m in self.model.match_history]:
+            self.report.violation(f"campo {self.number}: el historial reconstruido no coincide")
+    
+    def _played(self, team: str):
+        record = self.model.standings.records.get(team)
+        return record.played if record is not None else 0
+    
+    def close(self):
+        self.controller.shutdown()
+        self.window.close()
+        self.window.deleteLater()
+
+
+class Report:
+    """Contadores y violaciones de la simulación"""
+    
+    def __init__(self, max_shown: int = 20):
+        self.max_shown = max_shown
+        self.violations = []
+        self.finished = 0
+        self.simulated = 0.0        # Segundos de partido simulados (con descansos)
+    
+    def violation(self, text: str):
+        if len(self.violations) < self.max_shown:
+            print(f"  VIOLACIÓN {text}")
+        self.violations.append(text)
+    
+    def match_finished(self, seconds: float):
+        self.finished += 1
+        self.simulated += seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulación acelerada de torneos sin pantalla")
+    parser.add_argument('--script', help="guion JSON de partidos (sin él se generan al azar)")
+    parser.add_argument('--repeat', type=int, default=1, help="veces que se repite el guion")
+    parser.add_argument('--teams', type=int, default=16, help="equipos del calendario aleatorio")
+    parser.add_argument('--matches', type=int, default=None,
+                        help="partidos aleatorios (por defecto el calendario de ida y vuelta)")
+    parser.add_argument('--pitches', type=int, default=4, help="campos que juegan a la vez")
+    parser.add_argument('--seed', type=int, default=1, help="semilla del escenario aleatorio")
+    parser.add_argument('--warmup', type=int, default=20, help="partidos antes de medir la memoria")
+    parser.add_argument('--json', help="guarda el informe en este archivo")
+    args = parser.parse_args()
+    
+    if args.script:
+        scenario = load_scenario(args.script, args.repeat)
+    else:
+        scenario = random_scenario(random.Random(args.seed), args.teams, args.pitches, args.matches)
+    pitch_count = max([args.pitches] + [script['pitch'] + 1 for script in scenario])
+    
+    app = QApplication([sys.argv[0]])
+    # Instantáneas en un espacio de QSettings propio, vacío al empezar
+    app.setOrganizationName("DigitalClockSimulation")
+    app.setApplicationName("TournamentSimulation")
+    QSettings().remove(SNAPSHOT_GROUP)
+    
+    source = VirtualTimeSource()
+    report = Report()
+    pitches = [Pitch(number, app, source, report) for number in range(pitch_count)]
+    for script in scenario:
+        pitches[script['pitch']].queue.append(script)
+    print(f"{len(scenario)} partidos en {pitch_count} campos")
+    
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    virtual_started = source.monotonic()
+    for pitch in pitches:
+        pitch.next_match()
+    
+    baseline = None
+    measured_from = (started, cpu_started, 0.0, 0)
+    steps = 0
+    while any(pitch.busy for pitch in pitches):
+        if not source.advance_to_next():
+            break
+        steps += 1
+        finished = report.finished
+        for pitch in pitches:
+            pitch.poll()
+        if report.finished != finished:
+            # Avisos, borrados diferidos y demás trabajo del bucle de eventos
+            app.processEvents()
+            if baseline is None and report.finished >= args.warmup:
+                settle(app)
+                baseline = counters(app)
+                measured_from = (time.perf_counter(), time.process_time(),
+                                 report.simulated, report.finished)
+            if report.finished % 500 == 0:
+                print(f"{report.finished:6d} partidos, {source.fired} plazos, "
+                      f"{time.perf_counter() - started:.1f} s")
+    elapsed = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+    virtual = source.monotonic() - virtual_started
+    
+    settle(app)
+    final = counters(app)
+    for pitch in pitches:
+        pitch.check_replay()
+    if report.finished != len(scenario):
+        report.violation(f"se jugaron {report.finished} de {len(scenario)} partidos")
+    
+    match_hours = report.simulated / 3600
+    results = {
+        'matches': report.finished,
+        'pitches': pitch_count,
+        'wall_seconds': elapsed,
+        'cpu_seconds': cpu,
+        'matches_per_second': report.finished / elapsed if elapsed else 0.0,
+        'simulated_hours': virtual / 3600,
+        'speedup': virtual / elapsed if elapsed else 0.0,
+        'match_hours': match_hours,
+        'cpu_ms_per_match_hour': cpu * 1000 / match_hours if match_hours else 0.0,
+        'deadlines': source.fired,
+        'violations': report.violations,
+    }
+    if baseline is not None:
+        wall_from, cpu_from, simulated_from, finished_from = measured_from
+        matches = report.finished - finished_from
+        hours = (report.simulated - simulated_from) / 3600
+        results['steady_cpu_ms_per_match_hour'] = (
+            (time.process_time() - cpu_from) * 1000 / hours if hours else 0.0
+        )
+        results['memory'] = {
+            'baseline': baseline,
+            'final': final,
+            'rss_mb_per_1000_matches': (
+                (final['rss_mb'] - baseline['rss_mb']) * 1000 / matches if matches else 0.0
+            ),
+        }
+    
+    print(f"{report.finished} partidos ({match_hours:.0f} h de partido, "
+          f"{virtual / 3600:.1f} h simuladas) en {elapsed:.1f} s: "
+          f"{results['matches_per_second']:.1f} partidos/s, {results['speedup']:.0f} veces el tiempo real")
+    print(f"CPU: {cpu:.1f} s, {results['cpu_ms_per_match_hour']:.1f} ms por hora de partido; "
+          f"{source.fired} plazos virtuales en {steps} pasos")
+    if baseline is not None:
+        print(f"Memoria tras {args.warmup} partidos: {baseline['rss_mb']:.1f} MB, "
+              f"{baseline['widgets']} widgets, {baseline['qobjects']} QObject")
+        print(f"Memoria final:            {final['rss_mb']:.1f} MB, "
+              f"{final['widgets']} widgets, {final['qobjects']} QObject "
+              f"({results['memory']['rss_mb_per_1000_matches']:+.1f} MB cada 1000 partidos)")
+    
+    for pitch in pitches:
+        pitch.close()
+    settle(app)
+    QSettings().remove(SNAPSHOT_GROUP)
+    
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as report_file:
+            json.dump(results, report_file, indent=2, ensure_ascii=False)
+    
+    if report.violations:
+        print(f"{len(report.violations)} violaciones de invariantes")
+        return 1
+    print("Sin violaciones de invariantes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
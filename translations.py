@@ -27,12 +27,27 @@ TRANSLATIONS = {
         'Exit': 'Salir',
         'English': 'English',
         'Español': 'Español',
+        'Goal Team 1': 'Gol Equipo 1',
+        'Goal Team 2': 'Gol Equipo 2',
+        'Card Team 1': 'Tarjeta Equipo 1',
+        'Card Team 2': 'Tarjeta Equipo 2',
+        '+1 min Added Time': '+1 min de descuento',
+        'Penalties': 'Penaltis',
+        'Last minute': 'Último minuto',
+        'Player (optional)': 'Jugador (opcional)',
+        'Import...': 'Importar...',
+        'Import teams, players and fixtures': 'Importar equipos, jugadores y calendario',
         
         # Clock Widget
         'Start': 'Iniciar',
         'Pause': 'Pausar',
         'Resume': 'Reanudar',
         'Reset': 'Reiniciar',
+        'Lap': 'Vuelta',
+        'Laps': 'Vueltas',
+        'Best': 'Mejor',
+        'Worst': 'Peor',
+        'Mean': 'Media',
         'Ready': 'Listo',
         'Running...': 'En ejecución...',
         'Paused': 'Pausado',
@@ -43,6 +58,14 @@ TRANSLATIONS = {
         'Clock Configuration': 'Configuración del Reloj',
         'Mode:': 'Modo:',
         'Clock': 'Reloj',
+        'World Clock': 'Reloj mundial',
+        'Language': 'Idioma',
+        'Profile': 'Perfil',
+        'Save Profile...': 'Guardar perfil...',
+        'Delete Profile': 'Borrar perfil',
+        'Profile name:': 'Nombre del perfil:',
+        'Profile saved': 'Perfil guardado',
+        'Time Zones:': 'Zonas horarias:',
         'Timer': 'Temporizador',
         'Format:': 'Formato:',
         '24 Hours': '24 Horas',
@@ -51,6 +74,9 @@ TRANSLATIONS = {
         'Enable Alarm': 'Activar Alarma',
         'Alarm Time:': 'Hora de Alarma:',
         'Alarm Message:': 'Mensaje de Alarma:',
+        'Repeat:': 'Repetir:',
+        'Every day (or cron / RRULE, e.g. 55 8 * * 1-5)': 'Todos los días (o cron / RRULE, p. ej. 55 8 * * 1-5)',
+        'Invalid repeat rule': 'Regla de repetición no válida',
         'Timer Duration (sec):': 'Duración del Temporizador (seg):',
         'Apply Configuration': 'Aplicar Configuración',
         'Notifications will appear here': 'Las notificaciones aparecerán aquí',
@@ -58,6 +84,10 @@ TRANSLATIONS = {
         'Alarm': 'Alarma',
         'Timer finished!': '¡Temporizador finalizado!',
         'The timer has finished!': '¡El temporizador ha finalizado!',
+        
+        # Notification Center
+        'Notifications': 'Notificaciones',
+        'more notifications': 'notificaciones más',
     },
     'en': {
         # Tournament Window
@@ -83,12 +113,27 @@ TRANSLATIONS = {
         'Exit': 'Exit',
         'English': 'English',
         'Español': 'Español',
+        'Goal Team 1': 'Goal Team 1',
+        'Goal Team 2': 'Goal Team 2',
+        'Card Team 1': 'Card Team 1',
+        'Card Team 2': 'Card Team 2',
+        '+1 min Added Time': '+1 min Added Time',
+        'Penalties': 'Penalties',
+        'Last minute': 'Last minute',
+        'Player (optional)': 'Player (optional)',
+        'Import...': 'Import...',
+        'Import teams, players and fixtures': 'Import teams, players and fixtures',
         
         # Clock Widget
         'Start': 'Start',
         'Pause': 'Pause',
         'Resume': 'Resume',
         'Reset': 'Reset',
+        'Lap': 'Lap',
+        'Laps': 'Laps',
+        'Best': 'Best',
+        'Worst': 'Worst',
+        'Mean': 'Mean',
         'Ready': 'Ready',
         'Running...': 'Running...',
         'Paused': 'Paused',
@@ -99,6 +144,14 @@ TRANSLATIONS = {
         'Clock Configuration': 'Clock Configuration',
         'Mode:': 'Mode:',
         'Clock': 'Clock',
+        'World Clock': 'World Clock',
+        'Language': 'Language',
+        'Profile': 'Profile',
+        'Save Profile...': 'Save Profile...',
+        'Delete Profile': 'Delete Profile',
+        'Profile name:': 'Profile name:',
+        'Profile saved': 'Profile saved',
+        'Time Zones:': 'Time Zones:',
         'Timer': 'Timer',
         'Format:': 'Format:',
         '24 Hours': '24 Hours',
@@ -107,6 +160,9 @@ TRANSLATIONS = {
         'Enable Alarm': 'Enable Alarm',
         'Alarm Time:': 'Alarm Time:',
         'Alarm Message:': 'Alarm Message:',
+        'Repeat:': 'Repeat:',
+        'Every day (or cron / RRULE, e.g. 55 8 * * 1-5)': 'Every day (or cron / RRULE, e.g. 55 8 * * 1-5)',
+        'Invalid repeat rule': 'Invalid repeat rule',
         'Timer Duration (sec):': 'Timer Duration (sec):',
         'Apply Configuration': 'Apply Configuration',
         'Notifications will appear here': 'Notifications will appear here',
@@ -114,6 +170,10 @@ TRANSLATIONS = {
         'Alarm': 'Alarm',
         'Timer finished!': 'Timer finished!',
         'The timer has finished!': 'The timer has finished!',
+        
+        # Notification Center
+        'Notifications': 'Notifications',
+        'more notifications': 'more notifications',
     }
 }
 
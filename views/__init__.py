@@ -4,5 +4,7 @@ Views module
 from .digital_clock_widget import DigitalClockWidget
 from .main_window import MainWindow
 from .tournament_window import TournamentWindow
+from .notification_center import NotificationCenter
+from .lap_list_model import LapListModel
 
-__all__ = ['DigitalClockWidget', 'MainWindow', 'TournamentWindow']
+__all__ = ['DigitalClockWidget', 'MainWindow', 'TournamentWindow', 'NotificationCenter', 'LapListModel']
@@ -3,7 +3,7 @@ Vista del componente de Reloj Digital
 Widget reutilizable que carga su interfaz desde un archivo .ui
 """
 from PySide6.QtWidgets import QWidget, QVBoxLayout
-from PySide6.QtCore import Signal, QTimer, QTime
+from PySide6.QtCore import Signal, QTimer, QTime, Qt, QObject, SIGNAL
 from PySide6.QtUiTools import QUiLoader
 from PySide6.QtCore import QFile, QIODevice
 from translations import translate
@@ -21,9 +21,12 @@ class DigitalClockWidget(QWidget):
     timerFinished = Signal()       # Emite cuando el temporizador termina
     timeUpdated = Signal(str)      # Emite cada vez que se actualiza el tiempo
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, language: str = None):
         super().__init__(parent)
         
+        # Controlador que atiende los botones y los ticks (set_controller)
+        self.controller = None
+        
         # Cargar la interfaz desde el archivo .ui
         self.load_ui()
         
@@ -31,12 +34,19 @@ class DigitalClockWidget(QWidget):
         self.internal_timer = QTimer(self)
         self.internal_timer.timeout.connect(self._on_timer_tick)
         
+        # Fuente de hora a cuyos segundos se alinean los ticks (None: sin alinear)
+        self._tick_alignment = None
+        
         # Referencias a los widgets del UI
         self.setup_widget_references()
         
         # Conectar señales de los botones
         self.connect_signals()
         
+        # Textos en el idioma del perfil (sin él se quedan los del .ui)
+        if language is not None:
+            self.retranslateUi(language)
+        
     def load_ui(self):
         """Carga la interfaz desde el archivo .ui"""
         ui_file_path = os.path.join(
@@ -64,19 +74,28 @@ class DigitalClockWidget(QWidget):
         self.btnStart = self.ui_widget.findChild(QWidget, "btnStart")
         self.btnPause = self.ui_widget.findChild(QWidget, "btnPause")
         self.btnReset = self.ui_widget.findChild(QWidget, "btnReset")
+        self.btnLap = self.ui_widget.findChild(QWidget, "btnLap")
         self.lblStatus = self.ui_widget.findChild(QWidget, "lblStatus")
+        self.lblWorldClocks = self.ui_widget.findChild(QWidget, "lblWorldClocks")
         
     def connect_signals(self):
-        """Conecta las señales de los botones"""
+        """
+        Conecta las señales de los botones.
+        Los botones los crea QUiLoader en C++: leer `boton.clicked` desde
+        Python deja vivo su envoltorio después de destruir el widget (PySide6
+        6.8), así que se conectan por firma, sin tocar el atributo de señal.
+        """
         if self.btnStart:
-            self.btnStart.clicked.connect(self.on_start_clicked)
+            QObject.connect(self.btnStart, SIGNAL("clicked()"), self.on_start_clicked)
         if self.btnPause:
-            self.btnPause.clicked.connect(self.on_pause_clicked)
+            QObject.connect(self.btnPause, SIGNAL("clicked()"), self.on_pause_clicked)
         if self.btnReset:
-            self.btnReset.clicked.connect(self.on_reset_clicked)
+            QObject.connect(self.btnReset, SIGNAL("clicked()"), self.on_reset_clicked)
+        if self.btnLap:
+            QObject.connect(self.btnLap, SIGNAL("clicked()"), self.on_lap_clicked)
     
     def set_controller(self, controller):
-        """Establece el controlador para este widget"""
+        """Establece el controlador para este widget (None al desmontarlo)"""
         self.controller = controller
         
     def update_display(self, text: str):
@@ -84,6 +103,12 @@ class DigitalClockWidget(QWidget):
         if self.lcdDisplay:
             self.lcdDisplay.display(text)
     
+    def update_world_clocks(self, lines):
+        """Muestra la hora de las zonas del reloj mundial (lista vacía para ocultarlas)"""
+        if self.lblWorldClocks:
+            self.lblWorldClocks.setText("\n".join(lines))
+            self.lblWorldClocks.setVisible(bool(lines))
+    
     def update_status(self, text: str):
         """Actualiza el label de estado"""
         if self.lblStatus:
@@ -98,10 +123,51 @@ class DigitalClockWidget(QWidget):
         if self.btnReset:
             self.btnReset.setEnabled(reset)
     
+    def set_lap_button(self, visible: bool, enabled: bool):
+        """Muestra el botón de vuelta (solo en modo cronómetro)"""
+        if self.btnLap:
+            self.btnLap.setVisible(visible)
+            self.btnLap.setEnabled(enabled)
+    
     def start_internal_timer(self):
         """Inicia el timer interno (actualización cada segundo)"""
         if not self.internal_timer.isActive():
-            self.internal_timer.start(1000)  # 1 segundo
+            if self._tick_alignment is not None:
+                self.internal_timer.start(self._ms_to_next_second())
+            else:
+                self.internal_timer.start(1000)  # 1 segundo
+    
+    def set_tick_timer(self, timer):
+        """
+        Sustituye el timer interno (por ejemplo por uno de tiempo virtual);
+        si estaba en marcha, el nuevo sigue en marcha
+        """
+        active = self.internal_timer.isActive()
+        self.internal_timer.stop()
+        self.internal_timer.deleteLater()
+        self.internal_timer = timer
+        self.internal_timer.timeout.connect(self._on_timer_tick)
+        if active:
+            self.start_internal_timer()
+    
+    def set_tick_alignment(self, time_function):
+        """
+        Hace coincidir los ticks con el cambio de segundo de `time_function`
+        (segundos epoch), para que varias pantallas sincronizadas cambien a la
+        vez. None vuelve al timer libre de 1 segundo.
+        """
+        self._tick_alignment = time_function
+        self.internal_timer.setTimerType(
+            Qt.PreciseTimer if time_function is not None else Qt.CoarseTimer
+        )
+        if self.internal_timer.isActive():
+            self.internal_timer.stop()
+            self.start_internal_timer()
+    
+    def _ms_to_next_second(self):
+        # Unos milisegundos de margen para que el tick caiga ya en el segundo nuevo
+        fraction = self._tick_alignment() % 1.0
+        return int((1.0 - fraction) * 1000) + 2
     
     def stop_internal_timer(self):
         """Detiene el timer interno"""
@@ -110,25 +176,33 @@ class DigitalClockWidget(QWidget):
     
     def _on_timer_tick(self):
         """Callback interno cuando el timer hace tick"""
-        if hasattr(self, 'controller'):
+        if self._tick_alignment is not None:
+            # Reajustar el intervalo para absorber el retraso de cada tick
+            self.internal_timer.setInterval(self._ms_to_next_second())
+        if self.controller is not None:
             self.controller.on_timer_tick()
     
     # Métodos de control que delegan al controlador
     def on_start_clicked(self):
         """Maneja el clic en el botón Start"""
-        if hasattr(self, 'controller'):
+        if self.controller is not None:
             self.controller.on_start()
     
     def on_pause_clicked(self):
         """Maneja el clic en el botón Pause"""
-        if hasattr(self, 'controller'):
+        if self.controller is not None:
             self.controller.on_pause()
     
     def on_reset_clicked(self):
         """Maneja el clic en el botón Reset"""
-        if hasattr(self, 'controller'):
+        if self.controller is not None:
             self.controller.on_reset()
     
+    def on_lap_clicked(self):
+        """Maneja el clic en el botón Lap"""
+        if self.controller is not None:
+            self.controller.on_lap()
+    
     def emit_alarm(self, message: str):
         """Emite la señal de alarma"""
         self.alarmTriggered.emit(message)
@@ -150,3 +224,5 @@ class DigitalClockWidget(QWidget):
             self.btnPause.setText(translate("Pause", language))
         if self.btnReset:
             self.btnReset.setText(translate("Reset", language))
+        if self.btnLap:
+            self.btnLap.setText(translate("Lap", language))
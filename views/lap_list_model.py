@@ -0,0 +1,89 @@
+"""
+Modelo Qt de la lista de vueltas
+Lee directamente del LapRecorder: la vista solo pide las filas visibles,
+así que el coste de pintar no depende del número de vueltas. Las vueltas
+nuevas se notifican en bloque como mucho cada FLUSH_MS.
+"""
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, QTimer, Signal
+from models.laps import LapRecorder, format_lap
+
+
+class LapListModel(QAbstractListModel):
+    """Lista de vueltas, la más reciente arriba"""
+    
+    # Se emite tras incorporar un bloque de vueltas nuevas
+    flushed = Signal()
+    
+    FLUSH_MS = 50
+    
+    def __init__(self, recorder: LapRecorder, parent=None):
+        super().__init__(parent)
+        self.recorder = recorder
+        # Vueltas que la vista ya conoce (número de la primera y de la última)
+        self._first = recorder.first_number
+        self._last = recorder.count
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self.flush)
+    
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._last - self._first + 1
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        number = self._last - index.row()
+        if role == Qt.DisplayRole:
+            try:
+                lap, split = self.recorder.lap(number)
+            except IndexError:
+                return None
+            text = f"#{number}  {format_lap(lap)}  ({format_lap(split)})"
+            if number == self.recorder.stats.best_number:
+                text += "  ▲"
+            elif number == self.recorder.stats.worst_number:
+                text += "  ▼"
+            return text
+        return None
+    
+    def notify_added(self):
+        """Avisa de una vuelta nueva; las filas se insertan en el siguiente bloque"""
+        if not self._flush_timer.isActive():
+            self._flush_timer.start(self.FLUSH_MS)
+    
+    def flush(self):
+        """Inserta las vueltas nuevas y quita las que el búfer ya sobrescribió"""
+        self._flush_timer.stop()
+        recorder = self.recorder
+        if recorder.count < self._last:
+            # El registro se reinició
+            self.reset()
+            return
+        added = recorder.count - self._last
+        if added:
+            self.beginInsertRows(QModelIndex(), 0, added - 1)
+            self._last = recorder.count
+            self.endInsertRows()
+        dropped = recorder.first_number - self._first
+        if dropped > 0:
+            rows = self.rowCount()
+            self.beginRemoveRows(QModelIndex(), rows - dropped, rows - 1)
+            self._first = recorder.first_number
+            self.endRemoveRows()
+        if added:
+            # Las marcas de mejor y peor vuelta pueden haber cambiado de fila
+            top = self.index(0)
+            bottom = self.index(self.rowCount() - 1)
+            self.dataChanged.emit(top, bottom, [Qt.DisplayRole])
+            self.flushed.emit()
+    
+    def reset(self):
+        """Vuelve a leer el registro completo"""
+        self._flush_timer.stop()
+        self.beginResetModel()
+        self._first = self.recorder.first_number
+        self._last = self.recorder.count
+        self.endResetModel()
+        self.flushed.emit()
@@ -2,10 +2,11 @@
 Vista de la ventana principal de prueba
 Carga su interfaz desde un archivo .ui
 """
-from PySide6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QMessageBox
-from PySide6.QtGui import QAction
+from PySide6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QMenu, QInputDialog
+from PySide6.QtGui import QAction, QActionGroup
 from PySide6.QtUiTools import QUiLoader
-from PySide6.QtCore import QFile, QIODevice
+from PySide6.QtCore import QFile, QIODevice, QTime
+from views.notification_center import NotificationCenter
 from translations import translate
 import os
 
@@ -13,7 +14,11 @@ import os
 class MainWindow(QMainWindow):
     """Ventana principal para probar el componente de reloj"""
     
-    def __init__(self):
+    def __init__(self, config=None, language: str = 'es'):
+        """
+        `config` (ClockConfig) y `language` vienen del perfil activo: la
+        ventana se construye directamente en su estado final
+        """
         super().__init__()
         
         # Cargar la interfaz desde el archivo .ui
@@ -25,8 +30,18 @@ class MainWindow(QMainWindow):
         # Placeholder para el reloj digital
         self.clock_widget = None
         
-        # Aplicar traducciones iniciales (en español por defecto)
-        self.retranslateUi('es')
+        # Avisos no modales
+        self.notifications = NotificationCenter(self)
+        
+        # Acciones de los perfiles guardados (set_profiles)
+        self.profile_actions = QActionGroup(self)
+        self.profile_actions.setExclusive(True)
+        
+        # Aplicar traducciones y configuración iniciales
+        self.language = language
+        self.retranslateUi(language)
+        if config is not None:
+            self.set_configuration(config)
         
     def load_ui(self):
         """Carga la interfaz desde el archivo .ui"""
@@ -65,17 +80,27 @@ class MainWindow(QMainWindow):
         self.checkAlarmActive = self.findChild(QWidget, "checkAlarmActive")
         self.timeAlarm = self.findChild(QWidget, "timeAlarm")
         self.txtAlarmMessage = self.findChild(QWidget, "txtAlarmMessage")
+        self.txtAlarmRepeat = self.findChild(QWidget, "txtAlarmRepeat")
+        self.txtWorldZones = self.findChild(QWidget, "txtWorldZones")
         self.spinTimerDuration = self.findChild(QWidget, "spinTimerDuration")
         self.btnApplyConfig = self.findChild(QWidget, "btnApplyConfig")
         self.lblNotification = self.findChild(QWidget, "lblNotification")
+        self.listLaps = self.findChild(QWidget, "listLaps")
+        self.lblLapStats = self.findChild(QWidget, "lblLapStats")
         
         # Acciones del menú - buscar en self.ui como QAction
         if self.ui:
             self.actionEnglish = self.ui.findChild(QAction, "actionEnglish")
             self.actionSpanish = self.ui.findChild(QAction, "actionSpanish")
+            self.actionSaveProfile = self.ui.findChild(QAction, "actionSaveProfile")
+            self.actionDeleteProfile = self.ui.findChild(QAction, "actionDeleteProfile")
         else:
             self.actionEnglish = None
             self.actionSpanish = None
+            self.actionSaveProfile = None
+            self.actionDeleteProfile = None
+        self.menuLanguage = self.findChild(QMenu, "menuLanguage")
+        self.menuProfile = self.findChild(QMenu, "menuProfile")
     
     def add_clock_widget(self, clock_widget):
         """Añade el widget del reloj a la interfaz"""
@@ -98,10 +123,63 @@ class MainWindow(QMainWindow):
         if self.actionSpanish:
             self.actionSpanish.triggered.connect(lambda: controller.change_language('es'))
         
+        if self.actionSaveProfile:
+            self.actionSaveProfile.triggered.connect(controller.save_profile)
+        if self.actionDeleteProfile:
+            self.actionDeleteProfile.triggered.connect(controller.delete_profile)
+        self.profile_actions.triggered.connect(lambda action: controller.load_profile(action.data()))
+        
         # Conectar cambio de modo para aplicar automáticamente
         if self.comboMode:
             self.comboMode.currentIndexChanged.connect(controller.apply_configuration)
     
+    def set_configuration(self, config):
+        """Pone los controles con los valores de una ClockConfig sin aplicarla"""
+        if self.comboMode:
+            # Sin disparar apply_configuration: quien llama decide cuándo aplicar
+            self.comboMode.blockSignals(True)
+            self.comboMode.setCurrentIndex(int(config.mode))
+            self.comboMode.blockSignals(False)
+        if self.comboFormat:
+            self.comboFormat.setCurrentIndex(0 if config.format_24h else 1)
+        if self.checkAlarmActive:
+            self.checkAlarmActive.setChecked(config.alarm_enabled)
+        if self.timeAlarm:
+            self.timeAlarm.setTime(QTime(config.alarm_hour, config.alarm_minute))
+        if self.txtAlarmMessage:
+            self.txtAlarmMessage.setText(config.alarm_message)
+        if self.txtAlarmRepeat:
+            self.txtAlarmRepeat.setText(config.alarm_rule)
+        if self.txtWorldZones:
+            self.txtWorldZones.setText(", ".join(config.world_zones))
+        if self.spinTimerDuration:
+            self.spinTimerDuration.setValue(config.timer_duration)
+    
+    def set_profiles(self, names, active: str):
+        """Lista los perfiles guardados en el menú, marcando el activo"""
+        for action in self.profile_actions.actions():
+            self.profile_actions.removeAction(action)
+            if self.menuProfile:
+                self.menuProfile.removeAction(action)
+            action.deleteLater()
+        for name in names:
+            action = QAction(name, self)
+            action.setData(name)
+            action.setCheckable(True)
+            action.setChecked(name == active)
+            self.profile_actions.addAction(action)
+            if self.menuProfile:
+                self.menuProfile.addAction(action)
+    
+    def ask_profile_name(self, current: str):
+        """Pide el nombre con que guardar el perfil (None si se cancela)"""
+        name, accepted = QInputDialog.getText(
+            self, translate('Save Profile...', self.language),
+            translate('Profile name:', self.language), text=current
+        )
+        name = name.strip()
+        return name if accepted and name else None
+    
     def get_configuration(self):
         """Obtiene la configuración actual de los controles"""
         config = {
@@ -110,18 +188,36 @@ class MainWindow(QMainWindow):
             'alarm_enabled': self.checkAlarmActive.isChecked(),
             'alarm_time': self.timeAlarm.time(),
             'alarm_message': self.txtAlarmMessage.text(),
+            'alarm_rule': self.txtAlarmRepeat.text() if self.txtAlarmRepeat else "",
+            'world_zones': self.txtWorldZones.text().split(",") if self.txtWorldZones else [],
             'timer_duration': self.spinTimerDuration.value()
         }
         return config
     
+    def set_lap_model(self, model):
+        """Asigna el modelo de la lista de vueltas"""
+        if self.listLaps:
+            self.listLaps.setModel(model)
+    
+    def show_laps(self, visible: bool):
+        """Muestra la lista de vueltas (modo cronómetro)"""
+        if self.listLaps:
+            self.listLaps.setVisible(visible)
+        if self.lblLapStats:
+            self.lblLapStats.setVisible(visible)
+    
+    def update_lap_stats(self, text: str):
+        if self.lblLapStats:
+            self.lblLapStats.setText(text)
+    
     def show_notification(self, message: str):
         """Muestra una notificación en la etiqueta"""
         if self.lblNotification:
             self.lblNotification.setText(message)
     
     def show_message_box(self, title: str, message: str):
-        """Muestra un cuadro de mensaje"""
-        QMessageBox.information(self, title, message)
+        """Muestra un aviso no modal"""
+        self.notifications.notify(title, message)
     
     def retranslateUi(self):
         """Retraduce los textos del UI"""
@@ -171,6 +267,8 @@ class MainWindow(QMainWindow):
     def retranslateUi(self, language: str = 'es'):
         """Retraduce los textos del UI"""
         self.setWindowTitle(translate('Digital Clock Test Application', language))
+        self.language = language
+        self.notifications.language = language
         
         if self.groupBoxConfig:
             self.groupBoxConfig.setTitle(translate('Clock Configuration', language))
@@ -185,6 +283,8 @@ class MainWindow(QMainWindow):
             "lblAlarm": "Alarm Active:",
             "lblAlarmTime": "Alarm Time:",
             "lblAlarmMessage": "Alarm Message:",
+            "lblAlarmRepeat": "Repeat:",
+            "lblWorldZones": "Time Zones:",
             "lblTimerDuration": "Timer Duration (sec):",
             "lblNotification": "Notifications will appear here",
         }
@@ -195,20 +295,31 @@ class MainWindow(QMainWindow):
                 label.setText(translate(text, language))
         
         # Retranslate combo box options
+        # Solo se cambian los textos: la opción elegida se conserva y no se
+        # vuelve a aplicar la configuración
         if self.comboMode:
-            self.comboMode.clear()
-            self.comboMode.addItem(translate('Clock', language))
-            self.comboMode.addItem(translate('Timer', language))
-            self.comboMode.addItem(translate('Fútbol', language))
-            self.comboMode.addItem(translate('Cronómetro', language))
+            for index, text in enumerate(('Clock', 'Timer', 'Fútbol', 'Cronómetro', 'World Clock')):
+                self.comboMode.setItemText(index, translate(text, language))
         
         if self.comboFormat:
-            self.comboFormat.clear()
-            self.comboFormat.addItem(translate('24 Hours', language))
-            self.comboFormat.addItem(translate('12 Hours', language))
+            self.comboFormat.setItemText(0, translate('24 Hours', language))
+            self.comboFormat.setItemText(1, translate('12 Hours', language))
+        
+        if self.menuLanguage:
+            self.menuLanguage.setTitle(translate('Language', language))
+        if self.menuProfile:
+            self.menuProfile.setTitle(translate('Profile', language))
+        if self.actionSaveProfile:
+            self.actionSaveProfile.setText(translate('Save Profile...', language))
+        if self.actionDeleteProfile:
+            self.actionDeleteProfile.setText(translate('Delete Profile', language))
         
         if self.checkAlarmActive:
             self.checkAlarmActive.setText(translate('Enable Alarm', language))
         
+        if self.txtAlarmRepeat:
+            self.txtAlarmRepeat.setPlaceholderText(
+                translate('Every day (or cron / RRULE, e.g. 55 8 * * 1-5)', language))
+        
         # Forzar actualización visual
         self.update()
@@ -0,0 +1,258 @@
+"""
+Centro de notificaciones no modal
+Muestra avisos tipo "toast" sin bloquear el bucle de eventos, con cola
+acotada, eliminación de duplicados y limitación de frecuencia
+"""
+import time
+from collections import OrderedDict
+
+from PySide6.QtWidgets import QFrame, QLabel, QVBoxLayout
+from PySide6.QtCore import QObject, QTimer, Qt, Signal, QPoint
+from PySide6.QtGui import QKeySequence, QShortcut
+from translations import translate
+
+
+TOAST_STYLES = {
+    'info': "background-color: #2b2b2b; color: white; border-radius: 6px;",
+    'error': "background-color: #8b1e1e; color: white; border-radius: 6px;",
+    'summary': "background-color: #444444; color: #dddddd; border-radius: 6px;",
+}
+
+
+class ToastPopup(QFrame):
+    """Aviso emergente no modal que se cierra solo"""
+    
+    dismissed = Signal(object)
+    
+    def __init__(self, parent, title: str, message: str, level: str = 'info',
+                 timeout_ms: int = 5000):
+        super().__init__(parent, Qt.Tool | Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
+        self.setAttribute(Qt.WA_ShowWithoutActivating)
+        self.setStyleSheet(TOAST_STYLES.get(level, TOAST_STYLES['info']))
+        self.setFixedWidth(280)
+        
+        self.title = title
+        self.message = message
+        self.count = 1
+        
+        self.lblTitle = QLabel(self)
+        self.lblTitle.setStyleSheet("font-weight: bold;")
+        self.lblMessage = QLabel(message, self)
+        self.lblMessage.setWordWrap(True)
+        
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(10, 8, 10, 8)
+        layout.addWidget(self.lblTitle)
+        layout.addWidget(self.lblMessage)
+        self._update_title()
+        
+        # Cierre automático
+        self.close_timer = QTimer(self)
+        self.close_timer.setSingleShot(True)
+        self.close_timer.timeout.connect(self.dismiss)
+        self.timeout_ms = timeout_ms
+        if timeout_ms > 0:
+            self.close_timer.start(timeout_ms)
+    
+    def _update_title(self):
+        """Actualiza el título con el contador de repeticiones"""
+        if self.count > 1:
+            self.lblTitle.setText(f"{self.title} (x{self.count})")
+        else:
+            self.lblTitle.setText(self.title)
+    
+    def set_message(self, message: str):
+        """Cambia el texto del aviso"""
+        self.message = message
+        self.lblMessage.setText(message)
+    
+    def increment(self, amount: int = 1):
+        """Agrupa un aviso repetido y reinicia el cierre automático"""
+        self.count += amount
+        self._update_title()
+        if self.timeout_ms > 0:
+            self.close_timer.start(self.timeout_ms)
+    
+    def mousePressEvent(self, event):
+        """Un clic sobre el aviso lo descarta"""
+        self.dismiss()
+    
+    def dismiss(self):
+        """Cierra el aviso"""
+        self.close_timer.stop()
+        self.hide()
+        self.dismissed.emit(self)
+        self.deleteLater()
+
+
+class NotificationCenter(QObject):
+    """
+    Gestiona los avisos de una ventana sin abrir bucles de eventos anidados.
+    Las ráfagas se agrupan: se muestran como mucho `max_visible` avisos y el
+    resto se resume en un único aviso con el número de pendientes.
+    """
+    
+    def __init__(self, window, max_visible: int = 3, max_queue: int = 20,
+                 rate_limit: int = 5, rate_interval_ms: int = 1000,
+                 timeout_ms: int = 5000):
+        super().__init__(window)
+        self.window = window
+        self.max_visible = max_visible
+        self.max_queue = max_queue
+        self.rate_limit = rate_limit
+        self.rate_interval = rate_interval_ms / 1000.0
+        self.timeout_ms = timeout_ms
+        self.language = 'es'
+        
+        # Avisos visibles por clave (título, mensaje), en orden de llegada
+        self._visible = OrderedDict()
+        # Avisos pendientes por clave: [título, mensaje, nivel, repeticiones]
+        self._pending = OrderedDict()
+        self._dropped = 0
+        self._summary = None
+        
+        # Cubo de fichas para limitar la frecuencia
+        self._tokens = float(rate_limit)
+        self._last_refill = time.monotonic()
+        
+        # Las notificaciones se vuelcan en la siguiente vuelta del bucle
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self._flush)
+        
+        # Confirmación por teclado
+        self.shortcut_ack = QShortcut(QKeySequence(Qt.Key_Escape), window)
+        self.shortcut_ack.activated.connect(self.acknowledge)
+        self.shortcut_ack_all = QShortcut(QKeySequence("Shift+Escape"), window)
+        self.shortcut_ack_all.activated.connect(self.acknowledge_all)
+    
+    def notify(self, title: str, message: str, level: str = 'info'):
+        """Encola un aviso; nunca bloquea"""
+        key = (title, message)
+        
+        toast = self._visible.get(key)
+        if toast is not None:
+            toast.increment()
+            return
+        
+        pending = self._pending.get(key)
+        if pending is not None:
+            pending[3] += 1
+        else:
+            self._pending[key] = [title, message, level, 1]
+            if len(self._pending) > self.max_queue:
+                _, dropped = self._pending.popitem(last=False)
+                self._dropped += dropped[3]
+        
+        self._schedule_flush(0)
+    
+    def pending_count(self) -> int:
+        """Número de avisos que esperan a mostrarse"""
+        return sum(item[3] for item in self._pending.values()) + self._dropped
+    
+    def acknowledge(self):
+        """Descarta el aviso visible más antiguo"""
+        if self._visible:
+            toast = next(iter(self._visible.values()))
+            toast.dismiss()
+        elif self._summary is not None:
+            self.acknowledge_all()
+    
+    def acknowledge_all(self):
+        """Descarta todos los avisos, visibles y pendientes"""
+        self._pending.clear()
+        self._dropped = 0
+        for toast in list(self._visible.values()):
+            toast.dismiss()
+        self._update_summary()
+    
+    def _schedule_flush(self, delay_ms: int):
+        """Programa el volcado de la cola si no lo está ya"""
+        if not self._flush_timer.isActive():
+            self._flush_timer.start(delay_ms)
+    
+    def _refill_tokens(self):
+        """Repone fichas según el tiempo transcurrido"""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(
+            float(self.rate_limit),
+            self._tokens + elapsed * self.rate_limit / self.rate_interval
+        )
+    
+    def _flush(self):
+        """Muestra los avisos pendientes respetando los límites"""
+        self._refill_tokens()
+        
+        while self._pending and len(self._visible) < self.max_visible and self._tokens >= 1:
+            key, (title, message, level, count) = self._pending.popitem(last=False)
+            self._tokens -= 1
+            toast = ToastPopup(self.window, title, message, level, self.timeout_ms)
+            if count > 1:
+                toast.increment(count - 1)
+            toast.dismissed.connect(self._on_toast_dismissed)
+            self._visible[key] = toast
+            toast.show()
+        
+        # Los descartados por la cola llena ya se anunciaron en el resumen:
+        # vaciada la cola, el resumen se retira
+        if not self._pending and self._summary is not None:
+            self._dropped = 0
+        self._update_summary()
+        self._reposition()
+        
+        # Si quedan pendientes por falta de fichas, reintentar más tarde
+        if self._pending and len(self._visible) < self.max_visible:
+            self._schedule_flush(int(self.rate_interval * 1000 / self.rate_limit))
+    
+    def _update_summary(self):
+        """Muestra, actualiza u oculta el aviso resumen"""
+        remaining = self.pending_count()
+        if remaining == 0:
+            if self._summary is not None:
+                summary = self._summary
+                self._summary = None
+                summary.dismiss()
+            return
+        
+        text = f"+{remaining} {translate('more notifications', self.language)}"
+        if self._summary is None:
+            self._summary = ToastPopup(
+                self.window, translate('Notifications', self.language), text, 'summary', 0
+            )
+            self._summary.dismissed.connect(self._on_summary_dismissed)
+            self._summary.show()
+        else:
+            self._summary.set_message(text)
+    
+    def _on_toast_dismissed(self, toast):
+        """Libera el hueco del aviso cerrado y muestra el siguiente"""
+        for key, visible in list(self._visible.items()):
+            if visible is toast:
+                del self._visible[key]
+                break
+        self._reposition()
+        if self._pending or self._summary is not None:
+            self._schedule_flush(0)
+    
+    def _on_summary_dismissed(self, toast):
+        """El usuario descartó el resumen: se descartan los pendientes"""
+        if toast is self._summary:
+            self._summary = None
+            self._pending.clear()
+            self._dropped = 0
+    
+    def _reposition(self):
+        """Apila los avisos en la esquina inferior derecha de la ventana"""
+        toasts = list(self._visible.values())
+        if self._summary is not None:
+            toasts.append(self._summary)
+        
+        corner = self.window.mapToGlobal(QPoint(self.window.width(), self.window.height()))
+        y = corner.y() - 12
+        for toast in reversed(toasts):
+            toast.adjustSize()
+            y -= toast.height()
+            toast.move(corner.x() - toast.width() - 12, y)
+            y -= 6
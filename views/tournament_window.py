@@ -2,10 +2,11 @@
 Vista de la ventana de gestión de torneos
 Carga su interfaz desde un archivo .ui
 """
-from PySide6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QMessageBox
+from PySide6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QFileDialog, QCompleter
 from PySide6.QtGui import QAction
 from PySide6.QtUiTools import QUiLoader
-from PySide6.QtCore import QFile, QIODevice
+from PySide6.QtCore import QFile, QIODevice, Qt, Signal, QObject, SIGNAL
+from views.notification_center import NotificationCenter
 from translations import translate
 import os
 
@@ -13,6 +14,9 @@ import os
 class TournamentWindow(QMainWindow):
     """Ventana principal de gestión de torneos de fútbol"""
     
+    # Se emite al cerrar la ventana (quien la abrió la desmonta)
+    closed = Signal()
+    
     def __init__(self):
         super().__init__()
         
@@ -25,6 +29,9 @@ class TournamentWindow(QMainWindow):
         # Placeholder para el reloj digital
         self.clock_widget = None
         
+        # Avisos no modales
+        self.notifications = NotificationCenter(self)
+        
         # Aplicar traducciones iniciales (en español por defecto)
         self.retranslateUi('es')
         
@@ -56,6 +63,10 @@ class TournamentWindow(QMainWindow):
                 self.setStatusBar(statusbar)
             self.setWindowTitle(self.ui.windowTitle())
             self.resize(self.ui.size())
+            # La ventana cargada conserva las acciones del menú: se hace hija
+            # (oculta) de esta para que se destruya con ella al cerrar
+            self.ui.setParent(self)
+            self.ui.hide()
         
     def setup_widget_references(self):
         """Configura referencias a los widgets del UI"""
@@ -64,6 +75,7 @@ class TournamentWindow(QMainWindow):
         if self.ui:
             # Buscar acciones en self.ui (están asociadas al QMainWindow cargado)
             self.actionExit = self.ui.findChild(QAction, "actionExit")
+            self.actionImport = self.ui.findChild(QAction, "actionImport")
             self.actionEnglish = self.ui.findChild(QAction, "actionEnglish")
             self.actionSpanish = self.ui.findChild(QAction, "actionSpanish")
         
@@ -78,6 +90,12 @@ class TournamentWindow(QMainWindow):
         self.lblMatchStatus = self.findChild(QWidget, "lblMatchStatus")
         self.txtMatchLog = self.findChild(QWidget, "txtMatchLog")
         self.lblNotification = self.findChild(QWidget, "lblNotification")
+        self.txtPlayer = self.findChild(QWidget, "txtPlayer")
+        self.btnGoalTeam1 = self.findChild(QWidget, "btnGoalTeam1")
+        self.btnGoalTeam2 = self.findChild(QWidget, "btnGoalTeam2")
+        self.btnCardTeam1 = self.findChild(QWidget, "btnCardTeam1")
+        self.btnCardTeam2 = self.findChild(QWidget, "btnCardTeam2")
+        self.btnAddedTime = self.findChild(QWidget, "btnAddedTime")
     
     def add_clock_widget(self, clock_widget):
         """Añade el widget del reloj a la interfaz"""
@@ -88,21 +106,41 @@ class TournamentWindow(QMainWindow):
         layout = central_widget.layout()
         layout.insertWidget(2, clock_widget)  # Después del groupBoxMatch y lblMatchStatus
     
+    def closeEvent(self, event):
+        """Avisa del cierre para liberar la ventana y su controlador"""
+        super().closeEvent(event)
+        if event.isAccepted():
+            self.closed.emit()
+    
     def set_controller(self, controller):
         """Establece el controlador"""
         self.controller = controller
         
-        # Conectar señales
+        # Conectar señales por firma: leer `.clicked` o `.triggered` de un hijo
+        # creado por QUiLoader deja vivo su envoltorio tras cerrar la ventana
+        # (ver DigitalClockWidget.connect_signals)
         if self.btnStartMatch:
-            self.btnStartMatch.clicked.connect(controller.start_match)
+            QObject.connect(self.btnStartMatch, SIGNAL("clicked()"), controller.start_match)
         if self.btnEndMatch:
-            self.btnEndMatch.clicked.connect(controller.end_match)
+            QObject.connect(self.btnEndMatch, SIGNAL("clicked()"), controller.end_match)
+        if self.btnGoalTeam1:
+            QObject.connect(self.btnGoalTeam1, SIGNAL("clicked()"), lambda: controller.on_goal(1))
+        if self.btnGoalTeam2:
+            QObject.connect(self.btnGoalTeam2, SIGNAL("clicked()"), lambda: controller.on_goal(2))
+        if self.btnCardTeam1:
+            QObject.connect(self.btnCardTeam1, SIGNAL("clicked()"), lambda: controller.on_card(1))
+        if self.btnCardTeam2:
+            QObject.connect(self.btnCardTeam2, SIGNAL("clicked()"), lambda: controller.on_card(2))
+        if self.btnAddedTime:
+            QObject.connect(self.btnAddedTime, SIGNAL("clicked()"), lambda: controller.add_stoppage(60))
         if self.actionExit:
-            self.actionExit.triggered.connect(self.close)
+            QObject.connect(self.actionExit, SIGNAL("triggered()"), self.close)
+        if self.actionImport:
+            QObject.connect(self.actionImport, SIGNAL("triggered()"), self.on_import_triggered)
         if self.actionEnglish:
-            self.actionEnglish.triggered.connect(lambda: controller.change_language('en'))
+            QObject.connect(self.actionEnglish, SIGNAL("triggered()"), lambda: controller.change_language('en'))
         if self.actionSpanish:
-            self.actionSpanish.triggered.connect(lambda: controller.change_language('es'))
+            QObject.connect(self.actionSpanish, SIGNAL("triggered()"), lambda: controller.change_language('es'))
     
     def get_match_data(self):
         """Obtiene los datos del partido de los controles"""
@@ -112,6 +150,13 @@ class TournamentWindow(QMainWindow):
             'duration': self.spinMatchDuration.value()
         }
     
+    def set_match_teams(self, team1: str, team2: str):
+        """Rellena los nombres de los equipos (p. ej. desde el calendario)"""
+        if self.txtTeam1:
+            self.txtTeam1.setText(team1)
+        if self.txtTeam2:
+            self.txtTeam2.setText(team2)
+    
     def set_match_controls_enabled(self, start_enabled: bool, end_enabled: bool):
         """Habilita/deshabilita los controles del partido"""
         if self.btnStartMatch:
@@ -124,6 +169,47 @@ class TournamentWindow(QMainWindow):
             self.txtTeam2.setEnabled(start_enabled)
         if self.spinMatchDuration:
             self.spinMatchDuration.setEnabled(start_enabled)
+        
+        # Los eventos solo se registran con el partido en curso
+        for button in (self.btnGoalTeam1, self.btnGoalTeam2,
+                       self.btnCardTeam1, self.btnCardTeam2, self.btnAddedTime):
+            if button:
+                button.setEnabled(end_enabled)
+    
+    def set_team_suggestions(self, teams):
+        """Autocompleta los nombres de equipo con los equipos registrados"""
+        for field in (self.txtTeam1, self.txtTeam2):
+            if field:
+                completer = QCompleter(list(teams), field)
+                completer.setCaseSensitivity(Qt.CaseInsensitive)
+                field.setCompleter(completer)
+    
+    def on_import_triggered(self):
+        """Pide el fichero de equipos, jugadores o calendario a importar"""
+        path, _ = QFileDialog.getOpenFileName(
+            self,
+            translate('Import teams, players and fixtures', self.notifications.language),
+            "",
+            "CSV / JSON (*.csv *.json *.jsonl *.ndjson)"
+        )
+        if path:
+            self.controller.import_file(path)
+    
+    def get_player_name(self):
+        """Obtiene el jugador indicado para el próximo evento"""
+        if self.txtPlayer:
+            return self.txtPlayer.text().strip()
+        return ""
+    
+    def update_match_stats(self, stats: dict):
+        """Muestra el recuento de eventos por equipo en la barra de estado"""
+        parts = []
+        for team, counts in stats.items():
+            parts.append(
+                f"{team}: " + ", ".join(f"{kind} {count}" for kind, count in counts.items() if count)
+            )
+        if self.statusBar():
+            self.statusBar().showMessage(" | ".join(parts))
     
     def update_match_status(self, status: str):
         """Actualiza el estado del partido"""
@@ -141,12 +227,12 @@ class TournamentWindow(QMainWindow):
             self.txtMatchLog.clear()
     
     def show_message(self, title: str, message: str):
-        """Muestra un cuadro de mensaje"""
-        QMessageBox.information(self, title, message)
+        """Muestra un aviso no modal"""
+        self.notifications.notify(title, message)
     
     def show_error(self, title: str, message: str):
-        """Muestra un cuadro de error"""
-        QMessageBox.critical(self, title, message)
+        """Muestra un aviso de error no modal"""
+        self.notifications.notify(title, message, 'error')
     
     def show_notification(self, message: str):
         """Muestra una notificación en la etiqueta"""
@@ -156,6 +242,7 @@ class TournamentWindow(QMainWindow):
     def retranslateUi(self, language: str = 'es'):
         """Retraduce los textos del UI"""
         self.setWindowTitle(translate('Football Tournament Manager', language))
+        self.notifications.language = language
         
         if self.lblTitle:
             self.lblTitle.setText(translate('Football Tournament Manager', language))
@@ -169,6 +256,20 @@ class TournamentWindow(QMainWindow):
         if self.btnEndMatch:
             self.btnEndMatch.setText(translate('End Match', language))
         
+        event_buttons = {
+            self.btnGoalTeam1: 'Goal Team 1',
+            self.btnGoalTeam2: 'Goal Team 2',
+            self.btnCardTeam1: 'Card Team 1',
+            self.btnCardTeam2: 'Card Team 2',
+            self.btnAddedTime: '+1 min Added Time',
+        }
+        for button, text in event_buttons.items():
+            if button:
+                button.setText(translate(text, language))
+        
+        if self.txtPlayer:
+            self.txtPlayer.setPlaceholderText(translate('Player (optional)', language))
+        
         # Retranslate labels
         label_translations = {
             "lblTeam1": "Team 1:",
@@ -190,6 +291,8 @@ class TournamentWindow(QMainWindow):
         # Retranslate menu items
         if self.actionExit:
             self.actionExit.setText(translate('Exit', language))
+        if self.actionImport:
+            self.actionImport.setText(translate('Import...', language))
         if self.actionEnglish:
             self.actionEnglish.setText(translate('English', language))
         if self.actionSpanish:
@@ -0,0 +1,164 @@
+"""
+Comprobación de fugas al abrir y cerrar la ventana de torneos
+Abre y cierra la ventana de torneos muchas veces desde el controlador
+principal, con Qt sin pantalla, y comprueba que los widgets vivos, los
+QObject de Python (vivos y envoltorios de objetos ya destruidos), los hilos
+y la memoria residente no crecen. De la memoria se mira además la pendiente
+tras el calentamiento (recta de mínimos cuadrados sobre una muestra cada
+pocos ciclos): una fuga de unos KB por ciclo queda por debajo de cualquier
+tolerancia absoluta razonable, pero no de la pendiente.
+
+    python window_leak_check.py --cycles 1000
+
+Devuelve 1 si algún contador crece por encima de la tolerancia.
+"""
+import argparse
+import gc
+import os
+import sys
+import threading
+import time
+
+import shiboken6
+# Añadir el directorio raíz al path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QCoreApplication, QEvent, QObject
+from PySide6.QtWidgets import QApplication
+from views.main_window import MainWindow
+from views.digital_clock_widget import DigitalClockWidget
+from controllers.main_controller import MainWindowController
+from controllers.tournament_pool import TournamentWindowPool
+
+
+def resident_memory_mb():
+    """Memoria residente actual (pico del proceso si no hay /proc)"""
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux da KiB y macOS bytes
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def settle(app: QApplication):
+    """Procesa los borrados diferidos y recoge los ciclos de Python"""
+    for _ in range(3):
+        app.processEvents()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    gc.collect()
+
+
+def slope(samples):
+    """Pendiente de mínimos cuadrados de una lista de puntos (x, y)"""
+    count = len(samples)
+    if count < 2:
+        return 0.0
+    mean_x = sum(x for x, _ in samples) / count
+    mean_y = sum(y for _, y in samples) / count
+    variance = sum((x - mean_x) ** 2 for x, _ in samples)
+    if not variance:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in samples) / variance
+
+
+def counters(app: QApplication):
+    qobjects = [obj for obj in gc.get_objects() if isinstance(obj, QObject)]
+    return {
+        'widgets': len(app.allWidgets()),
+        'qobjects': sum(1 for obj in qobjects if shiboken6.isValid(obj)),
+        # Envoltorios Python que sobreviven a su objeto C++ (p. ej. los hijos
+        # de un .ui cuya señal se leyó desde Python)
+        'wrappers': len(qobjects),
+        'threads': threading.active_count(),
+        'rss_mb': resident_memory_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comprobación de fugas de la ventana de torneos")
+    parser.add_argument('--cycles', type=int, default=1000, help="aperturas y cierres")
+    parser.add_argument('--warmup', type=int, default=20, help="ciclos antes de tomar la referencia")
+    parser.add_argument('--prewarm', type=int, default=1, help="tamaño de la reserva (0 sin reserva)")
+    parser.add_argument('--rss-tolerance-mb', type=float, default=8.0,
+                        help="crecimiento de memoria residente admitido")
+    parser.add_argument('--rss-slope-kb', type=float, default=2.0,
+                        help="pendiente de memoria residente admitida (KB por ciclo)")
+    parser.add_argument('--sample-every', type=int, default=10,
+                        help="ciclos entre muestras de memoria para la pendiente")
+    parser.add_argument('--object-tolerance', type=int, default=10,
+                        help="crecimiento de widgets y QObject admitido")
+    args = parser.parse_args()
+    
+    app = QApplication([sys.argv[0]])
+    # Instantáneas en un espacio de QSettings propio, sin tocar el de la aplicación
+    app.setOrganizationName("DigitalClockLeakCheck")
+    app.setApplicationName("WindowLeakCheck")
+    
+    main_window = MainWindow()
+    clock_widget = DigitalClockWidget()
+    main_window.add_clock_widget(clock_widget)
+    controller = MainWindowController(main_window, clock_widget, app)
+    controller.set_tournament_pool(TournamentWindowPool(args.prewarm))
+    main_window.show()
+    
+    def cycle():
+        controller.open_tournament()
+        app.processEvents()
+        controller.tournament_window.close()
+        settle(app)
+    
+    for _ in range(args.warmup):
+        cycle()
+    baseline = counters(app)
+    rss_samples = [(0, baseline['rss_mb'] * 1024)]
+    
+    started = time.perf_counter()
+    for number in range(1, args.cycles + 1):
+        cycle()
+        if number % args.sample_every == 0:
+            rss_samples.append((number, resident_memory_mb() * 1024))
+        if number % 100 == 0:
+            current = counters(app)
+            print(f"{number:5d} ciclos: {current['widgets']} widgets, {current['qobjects']} QObject, "
+                  f"{current['wrappers']} envoltorios, {current['threads']} hilos, "
+                  f"{current['rss_mb']:.1f} MB")
+    elapsed = time.perf_counter() - started
+    final = counters(app)
+    rss_slope_kb = slope(rss_samples)
+    
+    print(f"Referencia: {baseline['widgets']} widgets, {baseline['qobjects']} QObject, "
+          f"{baseline['wrappers']} envoltorios, {baseline['threads']} hilos, "
+          f"{baseline['rss_mb']:.1f} MB")
+    print(f"Final:      {final['widgets']} widgets, {final['qobjects']} QObject, "
+          f"{final['wrappers']} envoltorios, {final['threads']} hilos, "
+          f"{final['rss_mb']:.1f} MB")
+    print(f"{args.cycles} ciclos en {elapsed:.1f} s ({elapsed / args.cycles * 1000:.1f} ms por ciclo), "
+          f"memoria {rss_slope_kb:+.2f} KB por ciclo")
+    
+    failures = []
+    for key in ('widgets', 'qobjects', 'wrappers', 'threads'):
+        if final[key] - baseline[key] > args.object_tolerance:
+            failures.append(f"{key}: {baseline[key]} -> {final[key]}")
+    if final['rss_mb'] - baseline['rss_mb'] > args.rss_tolerance_mb:
+        failures.append(f"rss_mb: {baseline['rss_mb']:.1f} -> {final['rss_mb']:.1f}")
+    if rss_slope_kb > args.rss_slope_kb:
+        failures.append(f"rss: {rss_slope_kb:.2f} KB por ciclo")
+    
+    controller.set_tournament_pool(None)
+    main_window.close()
+    controller.snapshot_writer.stop()
+    
+    if failures:
+        print("Crecimiento por encima de la tolerancia: " + "; ".join(failures))
+        return 1
+    print("Sin fugas")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())